@@ -0,0 +1,53 @@
+"""add_spatial_indexes_for_product_location
+
+Revision ID: 7d2e9b41c6a3
+Revises: 4c7deda25b55
+Create Date: 2026-10-17 09:12:44.318205
+
+Radius queries filter on geography(location) (ST_DWithin / ST_Distance) and
+prefilter with a geometry bounding box (&&). A plain GiST index on the
+geometry column serves the bbox test; the geography predicates can only use
+an index built on the same expression, so the index below uses exactly what
+app.utils.geospatial.to_geography() emits.
+
+Indexes are built CONCURRENTLY so the products table stays writable.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e9b41c6a3'
+down_revision = '4c7deda25b55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add GiST indexes on products.location (geometry and geography)."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        # Geometry index for the && bounding-box prefilter (may already exist
+        # if GeoAlchemy2 created it with the table)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_location
+            ON products
+            USING GIST (location)
+        """)
+
+        # Expression index matching geography(products.location)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_location_geog
+            ON products
+            USING GIST (geography(location))
+        """)
+
+
+def downgrade() -> None:
+    """Remove the geography expression index.
+
+    idx_products_location is the standard GeoAlchemy2 spatial index and is kept.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_products_location_geog")
@@ -30,8 +30,8 @@ from app.schemas import (
 from app.utils.jwt import (
     create_access_token,
     create_refresh_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password_async,
     verify_token,
 )
 from app.utils.otp import generate_otp, send_otp_email, send_otp_sms, store_otp, verify_otp
@@ -134,7 +134,7 @@ async def register_user(
         email=payload.email,
         username=payload.username,
         phone=payload.phone,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         full_name=payload.full_name,
         role=role,
     )
@@ -154,15 +154,10 @@ async def register_user(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)) from exc
 
-    # Send OTP via email (SMS integration will be added later)
-    email_sent = await send_otp_email(payload.email, otp, payload.full_name)
-    if not email_sent:
-        logger.warning(
-            "Registration completed but OTP email failed to send",
-            extra={"user_id": str(user.id), "email": payload.email}
-        )
-        # Note: We still allow registration to succeed since user is created and OTP is stored
-        # User can resend OTP from verification screen
+    # Send OTP via email (SMS integration will be added later) without
+    # blocking the response. Registration succeeds even if the send fails
+    # (send_otp_email logs it); the user can resend from the verification screen.
+    email_service.send_in_background(send_otp_email(payload.email, otp, payload.full_name))
 
     access_token = create_access_token({"sub": str(user.id), "role": user.role.value})
     refresh_token = create_refresh_token(str(user.id), user.role.value)
@@ -192,9 +187,14 @@ async def login_user(
     )
     result = await session.execute(query)
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    verified, new_hash = await verify_and_update_password_async(payload.password, user.password_hash)
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    if new_hash:
+        user.password_hash = new_hash
     user.last_login_at = datetime.now(timezone.utc)
     await session.commit()
 
@@ -226,7 +226,7 @@ async def send_otp(
     if payload.phone:
         await send_otp_sms(payload.phone, otp)
     elif payload.email:
-        await send_otp_email(payload.email, otp)
+        email_service.send_in_background(send_otp_email(payload.email, otp))
 
     return {"success": True, "message": "OTP sent"}
 
@@ -264,7 +264,7 @@ async def verify_user_otp(
 
     # Send welcome email after successful verification
     if payload.email:
-        await email_service.send_welcome_email(user.email, user.full_name)
+        email_service.send_in_background(email_service.send_welcome_email(user.email, user.full_name))
 
     return {"success": True}
 
@@ -312,7 +312,9 @@ async def forgot_password(
     await redis.set(key, str(user.id), ex=PASSWORD_RESET_TTL_SECONDS)
 
     # Send password reset email with secure link
-    await email_service.send_password_reset_email(payload.email, token, user.full_name)
+    email_service.send_in_background(
+        email_service.send_password_reset_email(payload.email, token, user.full_name)
+    )
 
     return {"success": True, "message": "Password reset instructions sent"}
 
@@ -333,7 +335,7 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.password_hash = hash_password(payload.new_password)
+    user.password_hash = await hash_password_async(payload.new_password)
     await session.commit()
     await redis.delete(key)
 
@@ -409,7 +411,7 @@ async def verify_email_link(
     await session.commit()
 
     # Send welcome email
-    await email_service.send_welcome_email(user.email, user.full_name)
+    email_service.send_in_background(email_service.send_welcome_email(user.email, user.full_name))
 
     # Return success with deep link redirect for mobile app
     return {
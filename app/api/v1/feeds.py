@@ -7,9 +7,8 @@ This module provides the dual-feed architecture:
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
-from geoalchemy2 import Geography
 from geoalchemy2.shape import to_shape
-from sqlalchemy import and_, cast, func, or_, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -19,26 +18,28 @@ from app.models.stream import Stream, StreamStatus
 from app.models.user import User
 from app.schemas.product import ProductLocation, ProductResponse
 from app.services.cache.feed_cache_service import FeedCacheService
-from app.utils.geospatial import calculate_distance, get_distance_label
+from app.utils.geospatial import bbox_filter, calculate_distance, get_distance_label, to_geography
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 
 
 def _convert_product_to_feed_response(
-    product: Product, requester_location: ProductLocation | None = None
+    product: Product,
+    requester_location: ProductLocation | None = None,
+    distance_km: float | None = None,
 ) -> dict:
     """Convert Product to feed response with seller and distance info.
 
     Args:
         product: Product model
         requester_location: Optional requester location for distance
+        distance_km: Distance already computed by the query (skips Haversine)
 
     Returns:
         Product data dict with seller info and distance
     """
     # Convert location
     location_data = None
-    distance_km = None
     distance_label = None
 
     if product.location:
@@ -51,13 +52,14 @@ def _convert_product_to_feed_response(
         }
 
         # Calculate distance if requester location provided
-        if requester_location:
+        if distance_km is None and requester_location:
             distance_km = calculate_distance(
                 requester_location.latitude,
                 requester_location.longitude,
                 point.y,
                 point.x,
             )
+        if distance_km is not None:
             distance_label = get_distance_label(distance_km)
             location_data["distance_km"] = round(distance_km, 2)
             location_data["distance_label"] = distance_label
@@ -181,6 +183,10 @@ async def get_discover_feed(
     elif sort == "popular":
         query = query.order_by(Product.view_count.desc(), Product.like_count.desc())
 
+    # Unique tie-breaker: without it, rows with equal sort values can repeat
+    # or be skipped between OFFSET pages
+    query = query.order_by(Product.id)
+
     # Calculate total count
     count_query = select(func.count()).select_from(query.subquery())
     total_result = await session.execute(count_query)
@@ -303,39 +309,36 @@ async def get_community_feed(
     radius_m = radius_km * 1000
 
     # Build base query with spatial filter
-    # Using proper Geography type from geoalchemy2 instead of string cast
-    distance_expr = func.ST_Distance(
-        cast(Product.location, Geography),
-        cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography),
-    )
-
-    query = (
-        select(Product, (distance_expr / 1000).label("distance_km"))
-        .options(selectinload(Product.seller))
-        .where(
-            and_(
-                Product.feed_type == FeedType.COMMUNITY,
-                Product.is_available == True,  # noqa: E712
-                func.ST_DWithin(
-                    cast(Product.location, Geography),
-                    cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography),
-                    radius_m,
-                ),
-            )
-        )
-    )
+    # geography(location) matches the idx_products_location_geog expression
+    location_geog = to_geography(Product.location)
+    user_geog = to_geography(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326))
+    distance_expr = func.ST_Distance(location_geog, user_geog)
+
+    conditions = [
+        Product.feed_type == FeedType.COMMUNITY,
+        Product.is_available == True,  # noqa: E712
+        # Index-backed bbox prefilter first, exact ST_DWithin on the survivors
+        bbox_filter(Product.location, latitude, longitude, radius_km),
+        func.ST_DWithin(location_geog, user_geog, radius_m),
+    ]
 
     # Apply filters
     if category:
-        query = query.where(Product.category == category)
+        conditions.append(Product.category == category)
     if neighborhood:
-        query = query.where(Product.neighborhood == neighborhood)
+        conditions.append(Product.neighborhood == neighborhood)
     if min_price is not None:
-        query = query.where(Product.price >= min_price)
+        conditions.append(Product.price >= min_price)
     if max_price is not None:
-        query = query.where(Product.price <= max_price)
+        conditions.append(Product.price <= max_price)
     if condition:
-        query = query.where(Product.condition == condition)
+        conditions.append(Product.condition == condition)
+
+    query = (
+        select(Product, (distance_expr / 1000).label("distance_km"))
+        .options(selectinload(Product.seller))
+        .where(and_(*conditions))
+    )
 
     # Sort
     if sort == "nearest":
@@ -347,21 +350,20 @@ async def get_community_feed(
     elif sort == "price_high":
         query = query.order_by(Product.price.desc())
 
-    # Execute query to get all results (then we'll paginate in Python)
-    # Note: We fetch all results due to SQLAlchemy caching issues with geography casts
-    # For production, consider using raw SQL or limiting radius to keep result set manageable
-    result = await session.execute(query)
-    all_rows = result.all()
-    total = len(all_rows)
+    # Unique tie-breaker so OFFSET pages neither repeat nor skip equal rows
+    query = query.order_by(Product.id)
+
+    # Paginate in the database: only the requested page is transferred and
+    # converted, and the total is a separate COUNT over the same filter
+    total = await session.scalar(select(func.count(Product.id)).where(and_(*conditions)))
 
-    # Apply pagination in Python
     offset = (page - 1) * per_page
-    paginated_rows = all_rows[offset : offset + per_page]
+    result = await session.execute(query.offset(offset).limit(per_page))
 
-    # Build response with distance labels
+    # Build response with distance labels (distance comes from PostGIS)
     items = []
-    for product, distance_km in paginated_rows:
-        item = _convert_product_to_feed_response(product, requester_location)
+    for product, distance_km in result.all():
+        item = _convert_product_to_feed_response(product, requester_location, distance_km)
         item["distance_km"] = round(distance_km, 2)
         item["distance_label"] = get_distance_label(distance_km)
         items.append(item)
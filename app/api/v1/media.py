@@ -365,7 +365,7 @@ async def upload_photo(
     - file_key: S3 object key for deletion/management
     - file_size: Size in bytes
     - content_type: MIME type
-    - sha1: SHA1 hash for integrity verification
+    - blake3: BLAKE3 hash for integrity verification
     """
     # Validate file type
     allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp', 'image/heic']
@@ -446,6 +446,152 @@ async def upload_video(
     }
 
 
+class DirectUploadInitiateRequest(BaseModel):
+    """Schema for starting a direct-to-B2 video upload"""
+    filename: str = Field(..., description="Original filename")
+    file_size: int = Field(..., gt=0, description="File size in bytes")
+    content_type: Literal["video/mp4", "video/quicktime", "video/x-msvideo", "video/x-m4v"] = "video/mp4"
+    video_type: Literal["recorded", "live"] = "recorded"
+
+
+class DirectUploadPart(BaseModel):
+    """One uploaded part of a direct-to-B2 video upload"""
+    PartNumber: int = Field(..., ge=1, le=10000, description="Part number from the initiate response")
+    ETag: str = Field(..., min_length=1, description="ETag header returned by the part upload")
+
+
+class DirectUploadCompleteRequest(BaseModel):
+    """Schema for completing a direct-to-B2 video upload"""
+    file_key: str = Field(..., description="File key from the initiate response")
+    upload_id: str = Field(..., description="Multipart upload ID")
+    parts: list[DirectUploadPart] = Field(
+        ..., min_length=1, max_length=10000, description="Uploaded parts with PartNumber and ETag"
+    )
+    video_type: Literal["recorded", "live"] = "recorded"
+
+
+class DirectUploadAbortRequest(BaseModel):
+    """Schema for aborting a direct-to-B2 video upload"""
+    file_key: str = Field(..., description="File key from the initiate response")
+    upload_id: str = Field(..., description="Multipart upload ID")
+    video_type: Literal["recorded", "live"] = "recorded"
+
+
+@router.post(
+    "/videos/upload/initiate",
+    summary="Start a direct video upload to B2"
+)
+async def initiate_video_upload(
+    request: DirectUploadInitiateRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Start a multipart upload that the client sends directly to B2
+
+    The video bytes skip the API server entirely. PUT each part_size slice
+    of the file to its upload_url, keep the ETag response header of each,
+    then call /videos/upload/complete. Prefer /videos/upload for small files.
+
+    Args:
+    - filename: Original filename
+    - file_size: Size in bytes (max 2GB)
+    - content_type: Video MIME type
+    - video_type: 'recorded' or 'live'
+
+    Returns:
+    - upload_id: Multipart upload ID
+    - file_key: S3 object key
+    - part_size: Bytes per part (last part may be smaller)
+    - expires_in: Seconds the part URLs stay valid
+    - parts: List of {part_number, upload_url}
+    """
+    video_service = VideoService()
+    result = await video_service.initiate_direct_upload(
+        user_id=str(current_user.id),
+        filename=request.filename,
+        file_size=request.file_size,
+        content_type=request.content_type,
+        video_type=request.video_type
+    )
+
+    return {
+        'success': True,
+        'data': result
+    }
+
+
+@router.post(
+    "/videos/upload/complete",
+    summary="Complete a direct video upload to B2"
+)
+async def complete_video_upload(
+    request: DirectUploadCompleteRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Complete a direct-to-B2 multipart upload
+
+    Args:
+    - file_key: S3 object key from the initiate response
+    - upload_id: Multipart upload ID
+    - parts: List of parts with PartNumber and ETag
+    - video_type: 'recorded' or 'live'
+
+    Returns:
+    - file_url: Public URL to access the video
+    - file_key: S3 object key
+    - file_size: Size in bytes
+    - upload_method: 'direct'
+    - parts_count: Number of parts
+    """
+    video_service = VideoService()
+    result = await video_service.complete_direct_upload(
+        user_id=str(current_user.id),
+        file_key=request.file_key,
+        upload_id=request.upload_id,
+        parts=[part.model_dump() for part in request.parts],
+        video_type=request.video_type
+    )
+
+    return {
+        'success': True,
+        'data': result
+    }
+
+
+@router.post(
+    "/videos/upload/abort",
+    summary="Abort a direct video upload to B2"
+)
+async def abort_video_upload(
+    request: DirectUploadAbortRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Abort a direct-to-B2 upload and discard any uploaded parts
+
+    Args:
+    - file_key: S3 object key from the initiate response
+    - upload_id: Multipart upload ID
+    - video_type: 'recorded' or 'live'
+
+    Returns:
+    - success: True if aborted
+    """
+    video_service = VideoService()
+    success = await video_service.abort_direct_upload(
+        user_id=str(current_user.id),
+        file_key=request.file_key,
+        upload_id=request.upload_id,
+        video_type=request.video_type
+    )
+
+    return {
+        'success': success,
+        'message': 'Upload aborted successfully'
+    }
+
+
 @router.delete(
     "/photos/{file_key:path}",
     summary="Delete photo from B2"
@@ -548,11 +694,11 @@ async def get_photo_metadata(
     - content_type: MIME type
     - content_length: File size in bytes
     - last_modified: Last modification timestamp
-    - metadata: Custom metadata (user_id, sha1, etc.)
+    - metadata: Custom metadata (user_id, blake3 or sha1 for older photos, etc.)
     - etag: ETag for caching
     """
     photo_service = PhotoService()
-    metadata = photo_service.get_photo_metadata(file_key)
+    metadata = await photo_service.get_photo_metadata(file_key)
 
     return {
         'success': True,
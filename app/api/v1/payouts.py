@@ -11,6 +11,7 @@ from decimal import Decimal
 from typing import Annotated
 from uuid import UUID
 
+import stripe
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,7 +22,7 @@ from app.models.transaction import Transaction, TransactionStatus
 from app.models.user import User
 from app.schemas.base import SuccessResponse
 from app.schemas.payout import PayoutBalanceResponse, PayoutRequestSchema, PayoutResponse, PayoutSettingsUpdate
-from app.services.payment_service import PaymentService
+from app.services.payment_service import STRIPE_OUTAGE_ERRORS, PaymentService
 
 router = APIRouter(prefix="/payouts", tags=["payouts"])
 
@@ -176,52 +177,82 @@ async def request_payout(
             detail="Stripe Connect account not set up",
         )
 
-    # Get available balance
-    balance = await PaymentService.get_account_balance(current_user.stripe_connect_account_id)
-    available_balance = balance["available_balance"]
-
-    # Check minimum payout amount
-    min_payout = Decimal("50.0")
-    if available_balance < min_payout:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Minimum payout amount is AED {min_payout}",
-        )
-
-    # Calculate instant payout fee (2%)
-    instant_fee = available_balance * Decimal("0.02")
-    payout_amount = available_balance - instant_fee
-
-    # Get completed transactions for this payout
+    # A pending payout committed by an earlier attempt (client retry after a
+    # timeout or 5xx) is replayed with its own id and amount, so Stripe sees
+    # the same idempotency key instead of a new payout
     result = await session.execute(
-        select(Transaction)
-        .where(Transaction.seller_id == current_user.id)
-        .where(Transaction.status == TransactionStatus.COMPLETED)
-        .where(Transaction.stripe_transfer_id.is_not(None))  # Only transferred funds
+        select(Payout)
+        .where(Payout.seller_id == current_user.id)
+        .where(Payout.status == PayoutStatus.PENDING)
+        .where(Payout.stripe_payout_id.is_(None))
+        .order_by(Payout.created_at)
+        .limit(1)
     )
-    transactions = result.scalars().all()
+    payout = result.scalar_one_or_none()
+
+    if payout is None:
+        # Get available balance (fresh read; the payout amount depends on it)
+        balance = await PaymentService.get_account_balance(current_user.stripe_connect_account_id, use_cache=False)
+        available_balance = balance["available_balance"]
+
+        # Check minimum payout amount
+        min_payout = Decimal("50.0")
+        if available_balance < min_payout:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Minimum payout amount is AED {min_payout}",
+            )
+
+        # Calculate instant payout fee (2%)
+        instant_fee = available_balance * Decimal("0.02")
+        payout_amount = available_balance - instant_fee
+
+        # Get completed transactions for this payout
+        result = await session.execute(
+            select(Transaction)
+            .where(Transaction.seller_id == current_user.id)
+            .where(Transaction.status == TransactionStatus.COMPLETED)
+            .where(Transaction.stripe_transfer_id.is_not(None))  # Only transferred funds
+        )
+        transactions = result.scalars().all()
 
-    # Calculate total platform fees
-    total_platform_fee = sum(t.platform_fee for t in transactions)
+        # Calculate total platform fees
+        total_platform_fee = sum(t.platform_fee for t in transactions)
 
-    # Create payout via Stripe
-    stripe_payout = await PaymentService.create_payout(
-        seller_account_id=current_user.stripe_connect_account_id,
-        amount=payout_amount,
-        currency="AED",
-    )
+        # Commit the payout record before calling Stripe; its id is the
+        # idempotency key
+        payout = Payout(
+            seller_id=current_user.id,
+            amount=payout_amount,
+            currency="AED",
+            platform_fee_total=total_platform_fee,
+            transaction_count=len(transactions),
+            status=PayoutStatus.PENDING,
+        )
+        session.add(payout)
+        await session.commit()
+        await session.refresh(payout)
 
-    # Create payout record
-    payout = Payout(
-        seller_id=current_user.id,
-        amount=payout_amount,
-        currency="AED",
-        platform_fee_total=total_platform_fee,
-        transaction_count=len(transactions),
-        status=PayoutStatus.PROCESSING,
-        stripe_payout_id=stripe_payout["payout_id"],
-    )
-    session.add(payout)
+    # Create payout via Stripe
+    try:
+        stripe_payout = await PaymentService.create_payout(
+            seller_account_id=current_user.stripe_connect_account_id,
+            amount=payout.amount,
+            payout_id=str(payout.id),
+            currency=payout.currency,
+        )
+    except STRIPE_OUTAGE_ERRORS:
+        # Outcome unknown: keep the row pending so a retry replays the key
+        raise
+    except stripe.error.StripeError as e:
+        # Stripe answered with a definite rejection; don't replay it
+        payout.status = PayoutStatus.FAILED
+        payout.failure_reason = str(e)
+        await session.commit()
+        raise
+
+    payout.status = PayoutStatus.PROCESSING
+    payout.stripe_payout_id = stripe_payout["payout_id"]
     await session.commit()
     await session.refresh(payout)
 
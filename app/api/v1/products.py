@@ -17,7 +17,7 @@ from geoalchemy2.shape import from_shape, to_shape
 from shapely.geometry import Point
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.dependencies import get_current_active_user, get_db, require_admin_role, require_seller_role
 from app.models.product import Product
@@ -31,7 +31,7 @@ from app.schemas.product import (
     ProductUpdate,
 )
 from app.schemas.user import UserResponse
-from app.utils.geospatial import calculate_distance, point_from_coordinates
+from app.utils.geospatial import calculate_distance, point_from_coordinates, to_geography
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -39,6 +39,17 @@ router = APIRouter(prefix="/products", tags=["products"])
 MAX_PRODUCTS_PER_USER = 50
 
 
+def _location_geography(product_id: UUID):
+    """Geography of a stored product's location, read in SQL.
+
+    Used as the far side of similar-item ST_DWithin filters, so the value
+    never round-trips through Python (the driver returns it as hex EWKB,
+    which ST_GeogFromText would reject).
+    """
+    origin = aliased(Product)
+    return select(to_geography(origin.location)).where(origin.id == product_id).scalar_subquery()
+
+
 def _convert_product_to_response(product: Product, requester_location: ProductLocation | None = None) -> dict:
     """Convert Product model to response dict with seller info and location.
 
@@ -228,8 +239,8 @@ async def get_product(
         # Find products within 5km
         similar_query = similar_query.where(
             func.ST_DWithin(
-                func.cast(Product.location, "geography"),
-                func.cast(product.location, "geography"),
+                to_geography(Product.location),
+                _location_geography(product.id),
                 5000,  # 5km in meters
             )
         )
@@ -412,8 +423,8 @@ async def get_similar_products(
     if product.location:
         query = query.where(
             func.ST_DWithin(
-                func.cast(Product.location, "geography"),
-                func.cast(product.location, "geography"),
+                to_geography(Product.location),
+                _location_geography(product.id),
                 5000,  # 5km
             )
         )
@@ -21,6 +21,7 @@ from app.dependencies import get_current_active_user, get_db
 from app.models.product import FeedType, Product, ProductCategory, ProductCondition
 from app.models.user import User
 from app.schemas.product import ProductLocation
+from app.utils.geospatial import bbox_filter, to_geography
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -130,14 +131,14 @@ async def search_products(
         radius_m = radius_km * 1000
         user_point = func.ST_SetSRID(func.ST_MakePoint(location_lng, location_lat), 4326)
         query = query.where(
-            func.ST_DWithin(func.cast(Product.location, "geography"), func.cast(user_point, "geography"), radius_m)
+            # Index-backed bbox prefilter first, exact ST_DWithin on the survivors
+            bbox_filter(Product.location, location_lat, location_lng, radius_km),
+            func.ST_DWithin(to_geography(Product.location), to_geography(user_point), radius_m),
         )
 
         # Add distance for sorting if "nearest"
         if sort == "nearest":
-            distance_expr = func.ST_Distance(
-                func.cast(Product.location, "geography"), func.cast(user_point, "geography")
-            )
+            distance_expr = func.ST_Distance(to_geography(Product.location), to_geography(user_point))
             query = query.add_columns((distance_expr / 1000).label("distance_km"))
 
     # Sorting
@@ -177,11 +178,13 @@ async def search_products(
         if location_lat and location_lng:
             requester_location = ProductLocation(latitude=location_lat, longitude=location_lng)
 
-        item = _convert_product_to_feed_response(product, requester_location)
+        # Use the PostGIS distance when the query selected it
+        distance_km = row[2] if len(row) > 2 else None
+        item = _convert_product_to_feed_response(product, requester_location, distance_km)
 
         # Add distance if available
-        if sort == "nearest" and len(row) > 2:
-            item["distance_km"] = round(row[2], 2)
+        if distance_km is not None:
+            item["distance_km"] = round(distance_km, 2)
 
         items.append(item)
 
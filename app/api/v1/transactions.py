@@ -12,6 +12,7 @@ from decimal import Decimal
 from typing import Annotated
 from uuid import UUID
 
+import stripe
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,7 +32,7 @@ from app.schemas.transaction import (
     TransactionRefundRequest,
     TransactionResponse,
 )
-from app.services.payment_service import PaymentService
+from app.services.payment_service import STRIPE_OUTAGE_ERRORS, PaymentService
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
@@ -75,7 +76,7 @@ async def create_transaction(
         amount = offer.offered_price
 
     # Calculate platform fee
-    platform_fee = await PaymentService.calculate_platform_fee(amount, product.feed_type)
+    platform_fee = PaymentService.calculate_platform_fee(amount, product.feed_type)
     seller_payout = amount - platform_fee
 
     # Ensure buyer has Stripe customer ID
@@ -94,41 +95,70 @@ async def create_transaction(
             detail="Seller has not set up payment account",
         )
 
-    # Create payment intent
-    payment_intent = await PaymentService.create_payment_intent(
-        amount=amount,
-        currency="AED",
-        customer_id=customer_id,
-        product_id=str(product.id),
-        seller_account_id=seller.stripe_connect_account_id,
-        platform_fee=platform_fee,
+    # A retried request finds the pending transaction its first attempt
+    # committed, so it replays the same Stripe idempotency key
+    result = await session.execute(
+        select(Transaction)
+        .where(Transaction.buyer_id == current_user.id)
+        .where(Transaction.product_id == product.id)
+        .where(Transaction.amount == amount)
+        .where(Transaction.status == TransactionStatus.PENDING)
+        .order_by(Transaction.created_at.desc())
+        .limit(1)
     )
+    transaction = result.scalar_one_or_none()
+
+    if transaction is None:
+        # Commit the row before calling Stripe; its id is the idempotency key
+        transaction = Transaction(
+            buyer_id=current_user.id,
+            seller_id=seller.id,
+            product_id=product.id,
+            amount=amount,
+            currency="AED",
+            platform_fee=platform_fee,
+            seller_payout=seller_payout,
+            feed_type=product.feed_type,
+            status=TransactionStatus.PENDING,
+            payment_method="card",
+        )
+        session.add(transaction)
+        await session.commit()
+        await session.refresh(transaction)
 
-    # Create transaction record
-    transaction = Transaction(
-        buyer_id=current_user.id,
-        seller_id=seller.id,
-        product_id=product.id,
-        amount=amount,
-        currency="AED",
-        platform_fee=platform_fee,
-        seller_payout=seller_payout,
-        feed_type=product.feed_type,
-        status=TransactionStatus.PENDING,
-        stripe_payment_intent_id=payment_intent["payment_intent_id"],
-        payment_method="card",
-    )
-    session.add(transaction)
-    await session.commit()
-    await session.refresh(transaction)
+    try:
+        if transaction.stripe_payment_intent_id:
+            payment_intent = await PaymentService.retrieve_payment_intent(transaction.stripe_payment_intent_id)
+        else:
+            payment_intent = await PaymentService.create_payment_intent(
+                amount=amount,
+                currency="AED",
+                customer_id=customer_id,
+                product_id=str(product.id),
+                seller_account_id=seller.stripe_connect_account_id,
+                platform_fee=platform_fee,
+                transaction_id=str(transaction.id),
+            )
+    except STRIPE_OUTAGE_ERRORS:
+        # Outcome unknown: keep the row pending so a retry replays the key
+        raise
+    except stripe.error.StripeError:
+        # Stripe answered with a definite rejection; don't replay it
+        transaction.status = TransactionStatus.FAILED
+        await session.commit()
+        raise
+
+    if transaction.stripe_payment_intent_id != payment_intent["payment_intent_id"]:
+        transaction.stripe_payment_intent_id = payment_intent["payment_intent_id"]
+        await session.commit()
 
     return SuccessResponse(
         data=TransactionInitiateResponse(
             transaction_id=transaction.id,
             client_secret=payment_intent["client_secret"],
-            amount=amount,
-            platform_fee=platform_fee,
-            seller_payout=seller_payout,
+            amount=transaction.amount,
+            platform_fee=transaction.platform_fee,
+            seller_payout=transaction.seller_payout,
             currency="AED",
         )
     )
@@ -355,7 +385,7 @@ async def calculate_fees(
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid feed_type") from None
 
-    platform_fee = await PaymentService.calculate_platform_fee(amount, feed_type_enum)
+    platform_fee = PaymentService.calculate_platform_fee(amount, feed_type_enum)
     seller_payout = amount - platform_fee
 
     # Calculate percentage
@@ -8,6 +8,7 @@ This module handles Stripe webhook events for:
 """
 from datetime import datetime
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from sqlalchemy import select
@@ -22,6 +23,56 @@ from app.services.payment_service import PaymentService
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
+def _metadata_uuid(data: dict, key: str) -> UUID | None:
+    """Read a row id our create calls put in the Stripe object's metadata."""
+    value = (data.get("metadata") or {}).get(key)
+    try:
+        return UUID(value) if value else None
+    except ValueError:
+        return None
+
+
+async def _find_transaction(data: dict, session: AsyncSession) -> Transaction | None:
+    """Find the transaction for a payment intent event.
+
+    If the create call timed out after Stripe made the intent, the pending
+    row never got its intent id; it is matched via metadata and the id is
+    recorded so later events find it directly.
+    """
+    result = await session.execute(
+        select(Transaction).where(Transaction.stripe_payment_intent_id == data["id"])
+    )
+    transaction = result.scalar_one_or_none()
+    if transaction:
+        return transaction
+
+    transaction_id = _metadata_uuid(data, "transaction_id")
+    transaction = await session.get(Transaction, transaction_id) if transaction_id else None
+    if transaction and transaction.stripe_payment_intent_id is None:
+        transaction.stripe_payment_intent_id = data["id"]
+        return transaction
+    return None
+
+
+async def _find_payout(data: dict, session: AsyncSession) -> Payout | None:
+    """Find the payout record for a payout event.
+
+    Falls back to the payout_id metadata for a pending row whose create call
+    timed out before the Stripe payout id was recorded (see _find_transaction).
+    """
+    result = await session.execute(select(Payout).where(Payout.stripe_payout_id == data["id"]))
+    payout = result.scalar_one_or_none()
+    if payout:
+        return payout
+
+    payout_id = _metadata_uuid(data, "payout_id")
+    payout = await session.get(Payout, payout_id) if payout_id else None
+    if payout and payout.stripe_payout_id is None:
+        payout.stripe_payout_id = data["id"]
+        return payout
+    return None
+
+
 @router.post("/stripe")
 async def stripe_webhook(
     request: Request,
@@ -57,6 +108,11 @@ async def stripe_webhook(
     event_type = event["type"]
     event_data = event["data"]["object"]
 
+    # Balance-changing events on a Connect account invalidate its cached balance
+    account_id = event.get("account")
+    if account_id and (event_type == "balance.available" or event_type.startswith("payout.")):
+        await PaymentService.invalidate_balance_cache(account_id)
+
     if event_type == "payment_intent.succeeded":
         await handle_payment_intent_succeeded(event_data, session)
     elif event_type == "payment_intent.payment_failed":
@@ -82,13 +138,8 @@ async def handle_payment_intent_succeeded(data: dict, session: AsyncSession) ->
         data: Payment intent data from webhook
         session: Database session
     """
-    payment_intent_id = data["id"]
-
     # Find transaction
-    result = await session.execute(
-        select(Transaction).where(Transaction.stripe_payment_intent_id == payment_intent_id)
-    )
-    transaction = result.scalar_one_or_none()
+    transaction = await _find_transaction(data, session)
 
     if transaction and transaction.status == TransactionStatus.PENDING:
         transaction.status = TransactionStatus.COMPLETED
@@ -114,13 +165,8 @@ async def handle_payment_intent_failed(data: dict, session: AsyncSession) -> Non
         data: Payment intent data from webhook
         session: Database session
     """
-    payment_intent_id = data["id"]
-
     # Find transaction
-    result = await session.execute(
-        select(Transaction).where(Transaction.stripe_payment_intent_id == payment_intent_id)
-    )
-    transaction = result.scalar_one_or_none()
+    transaction = await _find_transaction(data, session)
 
     if transaction and transaction.status == TransactionStatus.PENDING:
         transaction.status = TransactionStatus.FAILED
@@ -177,11 +223,8 @@ async def handle_payout_paid(data: dict, session: AsyncSession) -> None:
         data: Payout data from webhook
         session: Database session
     """
-    payout_id = data["id"]
-
     # Find payout record
-    result = await session.execute(select(Payout).where(Payout.stripe_payout_id == payout_id))
-    payout = result.scalar_one_or_none()
+    payout = await _find_payout(data, session)
 
     if payout and payout.status in {PayoutStatus.PENDING, PayoutStatus.PROCESSING}:
         payout.status = PayoutStatus.PAID
@@ -198,11 +241,8 @@ async def handle_payout_failed(data: dict, session: AsyncSession) -> None:
         data: Payout data from webhook
         session: Database session
     """
-    payout_id = data["id"]
-
     # Find payout record
-    result = await session.execute(select(Payout).where(Payout.stripe_payout_id == payout_id))
-    payout = result.scalar_one_or_none()
+    payout = await _find_payout(data, session)
 
     if payout and payout.status in {PayoutStatus.PENDING, PayoutStatus.PROCESSING}:
         payout.status = PayoutStatus.FAILED
@@ -28,6 +28,9 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 120  # 2 hours for better UX during video uploads
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     JWT_ALGORITHM: str = "HS256"
+    # PEM keys for asymmetric algorithms (EdDSA, ES256, RS256); HS* uses SECRET_KEY
+    JWT_PRIVATE_KEY: str | None = None
+    JWT_PUBLIC_KEY: str | None = None
 
     SENTRY_DSN: str | None = None
     LOG_LEVEL: str = "INFO"
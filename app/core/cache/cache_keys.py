@@ -325,6 +325,15 @@ class CacheKeys:
         """
         return f"payment:session:{session_id}"
 
+    @staticmethod
+    def stripe_balance(account_id: str) -> str:
+        """Cached Stripe Connect balance (also the fallback during Stripe outages).
+
+        TTL: 15 minutes
+        Type: String (JSON with available/pending balance)
+        """
+        return f"stripe:balance:{account_id}"
+
     @staticmethod
     def otp_code(phone_number: str) -> str:
         """OTP verification code.
@@ -334,6 +343,15 @@ class CacheKeys:
         """
         return f"otp:{phone_number}"
 
+    @staticmethod
+    def invalidation_lock(scope: str, identifier: str) -> str:
+        """Debounce sentinel for cache invalidation events.
+
+        TTL: 2 seconds
+        Type: String (flag)
+        """
+        return f"invalidation:{scope}:{identifier}"
+
     @staticmethod
     def upload_progress(user_id: str, upload_id: str) -> str:
         """Video upload progress tracking.
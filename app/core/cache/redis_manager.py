@@ -70,6 +70,20 @@ class RedisManager:
         else:
             await self.redis.set(key, serialized)
 
+    async def set_if_absent(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set value only if key doesn't exist (SET NX).
+
+        Args:
+            key: Redis key
+            value: Value to store (will be JSON-serialized)
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            True if the key was set, False if it already existed
+        """
+        serialized = json.dumps(value) if not isinstance(value, str) else value
+        return bool(await self.redis.set(key, serialized, ex=ttl, nx=True))
+
     async def delete(self, key: str) -> int:
         """Delete key.
 
@@ -414,6 +428,26 @@ class RedisManager:
         """
         return await self.redis.llen(key)
 
+    # ========== Batching ==========
+
+    def pipeline(self, transaction: bool = False):
+        """Create a pipeline for sending several commands in one round trip.
+
+        Values are passed to Redis as-is (no JSON serialization).
+
+        Usage:
+            async with redis_manager.pipeline() as pipe:
+                pipe.incr("a").incr("b")
+                a, b = await pipe.execute()
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC (default: False)
+
+        Returns:
+            redis.asyncio Pipeline
+        """
+        return self.redis.pipeline(transaction=transaction)
+
     # ========== Pub/Sub Operations ==========
 
     async def publish(self, channel: str, message: Any) -> None:
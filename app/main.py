@@ -29,6 +29,19 @@ async def lifespan(app: FastAPI):
     import asyncio
     asyncio.create_task(warming_service.warm_all())
 
+    # Pre-open B2 connections so the first uploads skip DNS + TLS setup
+    # (background; B2 may be unconfigured locally)
+    from app.storage.b2_config import B2Config
+
+    async def warm_b2():
+        try:
+            warmed = await asyncio.to_thread(B2Config.warm_up)
+            app.debug and print(f"✅ B2 connections warmed ({warmed})")
+        except Exception as e:
+            app.debug and print(f"⚠️ B2 warm-up skipped: {e}")
+
+    asyncio.create_task(warm_b2())
+
     # Initialize Elasticsearch (optional)
     from app.services.elasticsearch_service import elasticsearch_service
     try:
@@ -52,6 +65,13 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass  # Elasticsearch was not connected
 
+    from app.services.email_service import email_service
+    await email_service.aclose()
+
+    import stripe
+    if stripe.default_http_client is not None:
+        stripe.default_http_client.close()
+
     await close_redis_manager()
     app.debug and print("✅ Redis cache manager closed")
 
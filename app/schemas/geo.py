@@ -0,0 +1,8 @@
+from typing import Annotated
+
+from pydantic import Field
+
+# Coordinate types validated at the API boundary; code past the route
+# handlers can rely on them being in range.
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+Longitude = Annotated[float, Field(ge=-180, le=180)]
@@ -7,12 +7,13 @@ from pydantic import Field, PositiveInt, model_validator
 
 from app.models.product import FeedType, ProductCategory, ProductCondition
 from app.schemas.base import ORMBaseModel
+from app.schemas.geo import Latitude, Longitude
 from app.schemas.user import UserResponse
 
 
 class ProductLocation(ORMBaseModel):
-    latitude: float = Field(..., ge=-90, le=90, examples=[25.0808])
-    longitude: float = Field(..., ge=-180, le=180, examples=[55.1398])
+    latitude: Latitude = Field(..., examples=[25.0808])
+    longitude: Longitude = Field(..., examples=[55.1398])
     neighborhood: str | None = Field(default=None, examples=["Dubai Marina"])
     building_name: str | None = Field(default=None, examples=["Marina Heights Tower"])
 
@@ -7,11 +7,12 @@ from pydantic import EmailStr, Field, field_validator, model_validator
 from app.models.product import ProductCategory
 from app.models.user import UserRole
 from app.schemas.base import ORMBaseModel
+from app.schemas.geo import Latitude, Longitude
 
 
 class UserLocation(ORMBaseModel):
-    latitude: float = Field(..., ge=-90, le=90, examples=[25.2048])
-    longitude: float = Field(..., ge=-180, le=180, examples=[55.2708])
+    latitude: Latitude = Field(..., examples=[25.2048])
+    longitude: Longitude = Field(..., examples=[55.2708])
     neighborhood: str | None = Field(default=None, examples=["Dubai Marina"])
     building_name: str | None = Field(default=None, examples=["Marina Heights Tower"])
 
@@ -8,6 +8,7 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 from app.models.verification import VerificationStatus, VerificationType
+from app.schemas.geo import Latitude, Longitude
 
 
 # === Request Schemas ===
@@ -37,8 +38,8 @@ class BusinessVerificationRequest(BaseModel):
     business_name: str = Field(..., min_length=2, max_length=200)
     trade_license_number: str = Field(..., min_length=3, max_length=100)
     trade_license_document: str = Field(..., description="Trade license document URL")
-    business_latitude: float = Field(..., ge=-90, le=90)
-    business_longitude: float = Field(..., ge=-180, le=180)
+    business_latitude: Latitude
+    business_longitude: Longitude
 
     class Config:
         json_schema_extra = {
@@ -11,7 +11,7 @@ Phase 4: Real-Time Features Implementation
 
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from app.core.cache.redis_manager import RedisManager
 
@@ -35,6 +35,22 @@ class RealTimeCacheService:
     STATUS_AWAY = "away"
     STATUS_OFFLINE = "offline"
 
+    # KEYS: conversation unread key, total unread key. Zeroes the
+    # conversation count, subtracts it from the total (floored at 0) and
+    # returns the new total.
+    _MARK_READ_SCRIPT = """
+local unread = tonumber(redis.call('GETSET', KEYS[1], 0) or 0) or 0
+local total = tonumber(redis.call('GET', KEYS[2]) or 0) or 0
+if unread > 0 then
+    total = redis.call('DECRBY', KEYS[2], unread)
+end
+if total < 0 then
+    redis.call('SET', KEYS[2], 0)
+    total = 0
+end
+return total
+"""
+
     def __init__(self, redis: RedisManager):
         """Initialize real-time cache service.
 
@@ -42,6 +58,9 @@ class RealTimeCacheService:
             redis: Redis manager instance
         """
         self.redis = redis
+        # Registered once: the Script object keeps the SHA, so each call is a
+        # single EVALSHA (falling back to SCRIPT LOAD if the server lost it)
+        self._mark_read_script = redis.redis.register_script(self._MARK_READ_SCRIPT)
 
     # ========== Viewer Count Tracking ==========
 
@@ -60,11 +79,12 @@ class RealTimeCacheService:
         key = f"live:stream:{stream_id}:viewers"
         timestamp = time.time()
 
-        # Add user to sorted set (score = join timestamp)
-        await self.redis.zadd(key, {user_id: timestamp})
-
-        # Get updated count
-        return await self.redis.zcard(key)
+        # Add user to sorted set (score = join timestamp) and get the
+        # updated count in one round trip
+        async with self.redis.pipeline() as pipe:
+            pipe.zadd(key, {user_id: timestamp}).zcard(key)
+            _, count = await pipe.execute()
+        return count
 
     async def remove_viewer(self, stream_id: str, user_id: str) -> int:
         """Remove viewer from live stream.
@@ -78,11 +98,12 @@ class RealTimeCacheService:
         """
         key = f"live:stream:{stream_id}:viewers"
 
-        # Remove user from sorted set
-        await self.redis.zrem(key, user_id)
-
-        # Get updated count
-        return await self.redis.zcard(key)
+        # Remove user from sorted set and get the updated count in one
+        # round trip
+        async with self.redis.pipeline() as pipe:
+            pipe.zrem(key, user_id).zcard(key)
+            _, count = await pipe.execute()
+        return count
 
     async def get_viewer_count(self, stream_id: str) -> int:
         """Get current viewer count for stream.
@@ -343,6 +364,41 @@ class RealTimeCacheService:
 
         return new_count
 
+    async def record_new_message(self, user_id: str, conversation_id: str) -> Tuple[int, int]:
+        """Increment conversation and total unread counts in one round trip.
+
+        Args:
+            user_id: Recipient user ID
+            conversation_id: Conversation ID
+
+        Returns:
+            (conversation unread count, total unread count)
+        """
+        async with self.redis.pipeline() as pipe:
+            pipe.incr(f"unread:{user_id}:conversation:{conversation_id}")
+            pipe.incr(f"unread:{user_id}:messages")
+            conversation_count, total_count = await pipe.execute()
+        return conversation_count, total_count
+
+    async def mark_conversation_read(self, user_id: str, conversation_id: str) -> int:
+        """Reset a conversation's unread count and take it off the total.
+
+        Runs as one atomic script instead of GET, SET and DECRBY round trips.
+
+        Args:
+            user_id: User ID
+            conversation_id: Conversation ID
+
+        Returns:
+            New total unread count (won't go below 0)
+        """
+        return await self._mark_read_script(
+            keys=[
+                f"unread:{user_id}:conversation:{conversation_id}",
+                f"unread:{user_id}:messages",
+            ]
+        )
+
     async def get_unread_count(
         self,
         user_id: str,
@@ -6,14 +6,89 @@ Provides full-text search, geospatial queries, autocomplete, and faceted search.
 from typing import Dict, List, Optional, Tuple
 from elasticsearch import AsyncElasticsearch
 from elasticsearch.helpers import async_bulk
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+import asyncio
+import contextlib
 import logging
+import re
 from datetime import datetime
 
 from app.models.product import Product
 from app.config import settings
+from app.utils.geospatial import point_from_ewkb
 
 logger = logging.getLogger(__name__)
 
+# PostGIS WKT point: POINT(lng lat)
+_POINT_RE = re.compile(r"POINT\s*\(\s*([-+\d.eE]+)\s+([-+\d.eE]+)\s*\)")
+
+# Static sort clauses keyed by sort_by; "nearest" is built per request
+_DEFAULT_SORT = ["_score"]
+_SORT_MAP = {
+    "recent": [{"created_at": "desc"}],
+    "price_low": [{"price": "asc"}],
+    "price_high": [{"price": "desc"}],
+    "relevance": _DEFAULT_SORT,
+}
+
+# Only the fields _format_search_response reads; skips tags/location/etc.
+_SEARCH_SOURCE_FIELDS = [
+    "id", "title", "description", "price", "currency", "category",
+    "condition", "feed_type", "neighborhood", "seller", "is_available",
+    "view_count", "like_count", "created_at"
+]
+
+# Exact hit counts beyond this are not needed for pagination
+_TRACK_TOTAL_HITS = 1000
+
+# Facet aggregations are identical for every search request
+_FACET_AGGS = {
+    "categories": {
+        "terms": {"field": "category", "size": 20}
+    },
+    "conditions": {
+        "terms": {"field": "condition", "size": 10}
+    },
+    "price_ranges": {
+        "range": {
+            "field": "price",
+            "ranges": [
+                {"key": "under_100", "to": 100},
+                {"key": "100_500", "from": 100, "to": 500},
+                {"key": "500_1000", "from": 500, "to": 1000},
+                {"key": "1000_5000", "from": 1000, "to": 5000},
+                {"key": "5000_10000", "from": 5000, "to": 10000},
+                {"key": "over_10000", "from": 10000}
+            ]
+        }
+    }
+}
+
+# Pending update_product/increment_counters calls are flushed on this interval
+_UPDATE_FLUSH_INTERVAL = 0.5
+
+# Adds params.deltas to numeric fields, treating missing fields as 0
+_INCREMENT_SCRIPT = (
+    "for (entry in params.deltas.entrySet()) {"
+    " def current = ctx._source[entry.getKey()];"
+    " ctx._source[entry.getKey()] = (current == null ? 0 : current) + entry.getValue();"
+    " }"
+)
+
+
+def _parse_point(point: str) -> Optional[Dict[str, float]]:
+    """Convert a PostGIS point (hex EWKB or WKT) to an Elasticsearch geo_point."""
+    match = _POINT_RE.match(point)
+    if match:
+        return {"lat": float(match.group(2)), "lon": float(match.group(1))}
+    try:
+        lat, lon = point_from_ewkb(point)
+    except ValueError:
+        return None
+    return {"lat": lat, "lon": lon}
+
 
 class ElasticsearchService:
     """Service for Elasticsearch operations"""
@@ -22,6 +97,11 @@ class ElasticsearchService:
         self.client: Optional[AsyncElasticsearch] = None
         self.index_name = "products"
 
+        # Coalesced partial updates, keyed by product ID
+        self._pending_updates: Dict[str, Dict] = {}
+        self._pending_increments: Dict[str, Dict[str, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
     async def connect(self):
         """Initialize Elasticsearch connection"""
         try:
@@ -37,13 +117,24 @@ class ElasticsearchService:
             # Create index if it doesn't exist
             if not await self.client.indices.exists(index=self.index_name):
                 await self._create_index()
+
+            self._flush_task = asyncio.create_task(self._periodic_flush())
         except Exception as e:
             logger.error(f"Failed to connect to Elasticsearch: {e}")
             self.client = None
 
     async def disconnect(self):
         """Close Elasticsearch connection"""
+        if self._flush_task:
+            # Wait for the task to stop; an in-flight flush is allowed to
+            # finish first (see _periodic_flush) so its batch isn't dropped
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+
         if self.client:
+            await self.flush_pending_updates()
             await self.client.close()
             logger.info("Disconnected from Elasticsearch")
 
@@ -141,40 +232,7 @@ class ElasticsearchService:
             return False
 
         try:
-            # Convert product to Elasticsearch document
-            doc = {
-                "id": str(product.id),
-                "title": product.title,
-                "description": product.description,
-                "price": float(product.price),
-                "currency": product.currency,
-                "category": product.category,
-                "condition": product.condition,
-                "feed_type": product.feed_type,
-                "neighborhood": product.neighborhood,
-                "tags": product.tags or [],
-                "seller": {
-                    "id": str(product.seller_id),
-                    "username": product.seller.username if product.seller else None,
-                    "is_verified": product.seller.is_verified if product.seller else False,
-                    "rating": float(product.seller.rating) if product.seller and product.seller.rating else 0.0
-                },
-                "is_available": product.is_available,
-                "view_count": product.view_count,
-                "like_count": product.like_count,
-                "created_at": product.created_at.isoformat() if product.created_at else None,
-                "updated_at": product.updated_at.isoformat() if product.updated_at else None
-            }
-
-            # Add location if available
-            if product.location:
-                # PostGIS Point format: POINT(lng lat)
-                # Elasticsearch expects: {"lat": y, "lon": x}
-                coords = product.location.split("(")[1].split(")")[0].split()
-                doc["location"] = {
-                    "lat": float(coords[1]),
-                    "lon": float(coords[0])
-                }
+            doc = self._product_document(product)
 
             await self.client.index(
                 index=self.index_name,
@@ -188,20 +246,92 @@ class ElasticsearchService:
             logger.error(f"Error indexing product {product.id}: {e}")
             return False
 
-    async def update_product(self, product_id: str, fields: Dict) -> bool:
+    @staticmethod
+    def _seller_document(product: Product) -> Dict:
+        """Build the embedded seller document without lazy-loading the relation.
+
+        Under AsyncSession an unloaded ``product.seller`` cannot be fetched
+        implicitly, and in bulk paths it would be one query per product anyway.
+        Callers are expected to eager-load it (see ``bulk_index_all``).
+        """
+        if "seller" in inspect(product).unloaded:
+            logger.warning(f"Seller not loaded for product {product.id}; indexing without seller details")
+            seller = None
+        else:
+            seller = product.seller
+
+        return {
+            "id": str(product.seller_id),
+            "username": seller.username if seller else None,
+            "is_verified": seller.is_verified if seller else False,
+            "rating": float(seller.rating) if seller and seller.rating else 0.0
+        }
+
+    def _product_document(
+        self,
+        product: Product,
+        locations: Optional[Dict[str, Optional[Dict[str, float]]]] = None
+    ) -> Dict:
+        """Convert a product to its Elasticsearch document
+
+        ``locations`` maps stored ``product.location`` values to geo_points
+        the caller already has (from ST_X/ST_Y or an earlier parse), so bulk
+        callers don't parse each location again.
+        """
+        doc = {
+            "id": str(product.id),
+            "title": product.title,
+            "description": product.description,
+            "price": float(product.price),
+            "currency": product.currency,
+            "category": product.category,
+            "condition": product.condition,
+            "feed_type": product.feed_type,
+            "neighborhood": product.neighborhood,
+            "tags": product.tags or [],
+            "seller": self._seller_document(product),
+            "is_available": product.is_available,
+            "view_count": product.view_count,
+            "like_count": product.like_count,
+            "created_at": product.created_at.isoformat() if product.created_at else None,
+            "updated_at": product.updated_at.isoformat() if product.updated_at else None
+        }
+
+        # Add location if available
+        if product.location:
+            # PostGIS Point format: POINT(lng lat)
+            # Elasticsearch expects: {"lat": y, "lon": x}
+            if locations is not None and product.location in locations:
+                location = locations[product.location]
+            else:
+                location = _parse_point(product.location)
+            if location:
+                doc["location"] = location
+
+        return doc
+
+    async def update_product(self, product_id: str, fields: Dict, immediate: bool = False) -> bool:
         """
         Update specific fields of a product document
 
+        Updates are buffered and merged per product, then sent as one bulk
+        request every ``_UPDATE_FLUSH_INTERVAL`` seconds.
+
         Args:
             product_id: Product ID
             fields: Dictionary of fields to update
+            immediate: Send the update now instead of buffering it
 
         Returns:
-            bool: Success status
+            bool: Success status (for buffered updates, whether it was queued)
         """
         if not self.client:
             return False
 
+        if not immediate:
+            self._pending_updates.setdefault(product_id, {}).update(fields)
+            return True
+
         try:
             await self.client.update(
                 index=self.index_name,
@@ -214,6 +344,93 @@ class ElasticsearchService:
             logger.error(f"Error updating product {product_id}: {e}")
             return False
 
+    def increment_counters(self, product_id: str, **deltas: int) -> bool:
+        """
+        Queue counter increments (e.g. view_count=1, like_count=-1)
+
+        Deltas for the same product are summed in memory and applied with a
+        single scripted update on the next flush.
+
+        Args:
+            product_id: Product ID
+            **deltas: Field name to increment amount
+
+        Returns:
+            bool: Whether the increments were queued
+        """
+        if not self.client:
+            return False
+
+        pending = self._pending_increments.setdefault(product_id, {})
+        for field, delta in deltas.items():
+            pending[field] = pending.get(field, 0) + delta
+        return True
+
+    async def flush_pending_updates(self) -> Tuple[int, int]:
+        """
+        Send all buffered updates and counter increments in one bulk request
+
+        Returns:
+            tuple: (success_count, error_count)
+        """
+        if not self.client or not (self._pending_updates or self._pending_increments):
+            return 0, 0
+
+        updates, self._pending_updates = self._pending_updates, {}
+        increments, self._pending_increments = self._pending_increments, {}
+
+        actions = [
+            {
+                "_op_type": "update",
+                "_index": self.index_name,
+                "_id": product_id,
+                "doc": fields,
+            }
+            for product_id, fields in updates.items()
+        ]
+        actions.extend(
+            {
+                "_op_type": "update",
+                "_index": self.index_name,
+                "_id": product_id,
+                "script": {
+                    "source": _INCREMENT_SCRIPT,
+                    "lang": "painless",
+                    "params": {"deltas": deltas},
+                },
+            }
+            for product_id, deltas in increments.items()
+            if any(deltas.values())
+        )
+
+        if not actions:
+            return 0, 0
+
+        try:
+            success, errors = await async_bulk(self.client, actions, raise_on_error=False)
+            if errors:
+                logger.error(f"Bulk update errors: {errors[:5]}")
+            logger.debug(f"Flushed {success} product updates, {len(errors)} errors")
+            return success, len(errors)
+        except Exception as e:
+            logger.error(f"Error flushing product updates: {e}")
+            return 0, len(actions)
+
+    async def _periodic_flush(self):
+        """Flush buffered updates until cancelled"""
+        while True:
+            await asyncio.sleep(_UPDATE_FLUSH_INTERVAL)
+            # The flush swaps the buffers out before sending; shield it so a
+            # cancel mid-request doesn't drop that batch on the floor
+            flush = asyncio.ensure_future(self.flush_pending_updates())
+            try:
+                await asyncio.shield(flush)
+            except asyncio.CancelledError:
+                await flush
+                raise
+            except Exception as e:
+                logger.error(f"Error in periodic update flush: {e}")
+
     async def delete_product(self, product_id: str) -> bool:
         """
         Remove product from index
@@ -227,6 +444,10 @@ class ElasticsearchService:
         if not self.client:
             return False
 
+        # Buffered updates would fail against the deleted document
+        self._pending_updates.pop(product_id, None)
+        self._pending_increments.pop(product_id, None)
+
         try:
             await self.client.delete(
                 index=self.index_name,
@@ -238,6 +459,196 @@ class ElasticsearchService:
             logger.error(f"Error deleting product {product_id}: {e}")
             return False
 
+    @staticmethod
+    def build_search_body(
+        query: str,
+        filters: Optional[Dict] = None,
+        location: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+        page: int = 1,
+        per_page: int = 20,
+        sort_by: str = "relevance"
+    ) -> Dict:
+        """
+        Build the request body for a product search
+
+        Args:
+            Same as ``search``
+
+        Returns:
+            dict: Elasticsearch search body
+        """
+        # Build query
+        must_clauses = []
+        filter_clauses = []
+
+        # Full-text search
+        if query and query.strip():
+            must_clauses.append({
+                "multi_match": {
+                    "query": query,
+                    "fields": [
+                        "title^3",  # Boost title matches
+                        "title.autocomplete^2",
+                        "description",
+                        "seller.username",
+                        "tags^2"
+                    ],
+                    "fuzziness": "AUTO",
+                    "operator": "or"
+                }
+            })
+
+        # Always filter by available products
+        filter_clauses.append({"term": {"is_available": True}})
+
+        # Apply filters
+        if filters:
+            # Category filter
+            if filters.get("category"):
+                filter_clauses.append({"term": {"category": filters["category"]}})
+
+            # Condition filter
+            if filters.get("condition"):
+                if isinstance(filters["condition"], list):
+                    filter_clauses.append({"terms": {"condition": filters["condition"]}})
+                else:
+                    filter_clauses.append({"term": {"condition": filters["condition"]}})
+
+            # Feed type filter
+            if filters.get("feed_type"):
+                filter_clauses.append({"term": {"feed_type": filters["feed_type"]}})
+
+            # Price range filter
+            if filters.get("min_price") is not None or filters.get("max_price") is not None:
+                price_range = {}
+                if filters.get("min_price") is not None:
+                    price_range["gte"] = filters["min_price"]
+                if filters.get("max_price") is not None:
+                    price_range["lte"] = filters["max_price"]
+                filter_clauses.append({"range": {"price": price_range}})
+
+            # Verified sellers only
+            if filters.get("verified_sellers_only"):
+                filter_clauses.append({"term": {"seller.is_verified": True}})
+
+            # Neighborhood filter
+            if filters.get("neighborhood"):
+                filter_clauses.append({"term": {"neighborhood": filters["neighborhood"]}})
+
+        # Geospatial filter
+        if location and radius_km:
+            filter_clauses.append({
+                "geo_distance": {
+                    "distance": f"{radius_km}km",
+                    "location": {
+                        "lat": location[0],
+                        "lon": location[1]
+                    }
+                }
+            })
+
+        # Build complete query. A lone filter (the default is_available
+        # term) needs no bool wrapper; constant_score keeps the same 1.0
+        # scores that bool{must: match_all, filter} produced.
+        if not must_clauses and len(filter_clauses) == 1:
+            es_query = {"constant_score": {"filter": filter_clauses[0]}}
+        else:
+            es_query = {
+                "bool": {
+                    "must": must_clauses if must_clauses else [{"match_all": {}}],
+                    "filter": filter_clauses
+                }
+            }
+
+        body = {
+            "query": es_query,
+            "from": (page - 1) * per_page,
+            "size": per_page,
+            "_source": {"includes": _SEARCH_SOURCE_FIELDS},
+            "track_total_hits": _TRACK_TOTAL_HITS
+        }
+
+        # Sorting ("nearest" needs the caller's location)
+        if sort_by == "nearest" and location:
+            body["sort"] = [{
+                "_geo_distance": {
+                    "location": {
+                        "lat": location[0],
+                        "lon": location[1]
+                    },
+                    "order": "asc",
+                    "unit": "km"
+                }
+            }]
+        else:
+            body["sort"] = _SORT_MAP.get(sort_by, _DEFAULT_SORT)
+
+        # Add aggregations for facets (shared, never mutated)
+        body["aggs"] = _FACET_AGGS
+
+        return body
+
+    @staticmethod
+    def _format_search_response(response: Dict, page: int, per_page: int, sort_by: str) -> Dict:
+        """Convert a raw search response into hits, facets, and metadata"""
+        # Format results
+        hits = []
+        for hit in response["hits"]["hits"]:
+            source = hit["_source"]
+            result = {
+                "id": source["id"],
+                "title": source["title"],
+                "description": source.get("description"),
+                "price": source["price"],
+                "currency": source.get("currency", "AED"),
+                "category": source["category"],
+                "condition": source["condition"],
+                "feed_type": source["feed_type"],
+                "neighborhood": source.get("neighborhood"),
+                "seller": source.get("seller"),
+                "is_available": source.get("is_available", True),
+                "view_count": source.get("view_count", 0),
+                "like_count": source.get("like_count", 0),
+                "created_at": source.get("created_at"),
+                "score": hit["_score"]
+            }
+
+            # Add distance if geospatial sort
+            if sort_by == "nearest" and "sort" in hit:
+                result["distance_km"] = round(hit["sort"][0], 2)
+
+            hits.append(result)
+
+        # Format facets
+        facets = {
+            "categories": [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in response["aggregations"]["categories"]["buckets"]
+            ],
+            "conditions": [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in response["aggregations"]["conditions"]["buckets"]
+            ],
+            "price_ranges": [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in response["aggregations"]["price_ranges"]["buckets"]
+            ]
+        }
+
+        # Past _TRACK_TOTAL_HITS, ES stops counting and reports relation
+        # "gte": "total" is then a lower bound, not the exact match count
+        total = response["hits"]["total"]
+        return {
+            "hits": hits,
+            "total": total["value"],
+            "total_is_lower_bound": total.get("relation") == "gte",
+            "page": page,
+            "per_page": per_page,
+            "facets": facets,
+            "took_ms": response["took"]
+        }
+
     async def search(
         self,
         query: str,
@@ -261,200 +672,75 @@ class ElasticsearchService:
             sort_by: Sort criteria (relevance, recent, price_low, price_high, nearest)
 
         Returns:
-            dict: Search results with hits, facets, and metadata
+            dict: Search results with hits, facets, and metadata. When more
+            than _TRACK_TOTAL_HITS documents match, ``total`` stops at that
+            cap and ``total_is_lower_bound`` is True.
         """
         if not self.client:
-            return {"hits": [], "total": 0, "facets": {}}
+            return {"hits": [], "total": 0, "total_is_lower_bound": False, "facets": {}}
 
         try:
-            # Build query
-            must_clauses = []
-            filter_clauses = []
-
-            # Full-text search
-            if query and query.strip():
-                must_clauses.append({
-                    "multi_match": {
-                        "query": query,
-                        "fields": [
-                            "title^3",  # Boost title matches
-                            "title.autocomplete^2",
-                            "description",
-                            "seller.username",
-                            "tags^2"
-                        ],
-                        "fuzziness": "AUTO",
-                        "operator": "or"
-                    }
-                })
-
-            # Always filter by available products
-            filter_clauses.append({"term": {"is_available": True}})
-
-            # Apply filters
-            if filters:
-                # Category filter
-                if filters.get("category"):
-                    filter_clauses.append({"term": {"category": filters["category"]}})
-
-                # Condition filter
-                if filters.get("condition"):
-                    if isinstance(filters["condition"], list):
-                        filter_clauses.append({"terms": {"condition": filters["condition"]}})
-                    else:
-                        filter_clauses.append({"term": {"condition": filters["condition"]}})
-
-                # Feed type filter
-                if filters.get("feed_type"):
-                    filter_clauses.append({"term": {"feed_type": filters["feed_type"]}})
-
-                # Price range filter
-                if filters.get("min_price") is not None or filters.get("max_price") is not None:
-                    price_range = {}
-                    if filters.get("min_price") is not None:
-                        price_range["gte"] = filters["min_price"]
-                    if filters.get("max_price") is not None:
-                        price_range["lte"] = filters["max_price"]
-                    filter_clauses.append({"range": {"price": price_range}})
-
-                # Verified sellers only
-                if filters.get("verified_sellers_only"):
-                    filter_clauses.append({"term": {"seller.is_verified": True}})
-
-                # Neighborhood filter
-                if filters.get("neighborhood"):
-                    filter_clauses.append({"term": {"neighborhood": filters["neighborhood"]}})
-
-            # Geospatial filter
-            if location and radius_km:
-                filter_clauses.append({
-                    "geo_distance": {
-                        "distance": f"{radius_km}km",
-                        "location": {
-                            "lat": location[0],
-                            "lon": location[1]
-                        }
-                    }
-                })
-
-            # Build complete query
-            body = {
-                "query": {
-                    "bool": {
-                        "must": must_clauses if must_clauses else [{"match_all": {}}],
-                        "filter": filter_clauses
-                    }
-                },
-                "from": (page - 1) * per_page,
-                "size": per_page
-            }
-
-            # Sorting
-            if sort_by == "recent":
-                body["sort"] = [{"created_at": "desc"}]
-            elif sort_by == "price_low":
-                body["sort"] = [{"price": "asc"}]
-            elif sort_by == "price_high":
-                body["sort"] = [{"price": "desc"}]
-            elif sort_by == "nearest" and location:
-                body["sort"] = [{
-                    "_geo_distance": {
-                        "location": {
-                            "lat": location[0],
-                            "lon": location[1]
-                        },
-                        "order": "asc",
-                        "unit": "km"
-                    }
-                }]
-            else:  # relevance (default)
-                body["sort"] = ["_score"]
-
-            # Add aggregations for facets
-            body["aggs"] = {
-                "categories": {
-                    "terms": {"field": "category", "size": 20}
-                },
-                "conditions": {
-                    "terms": {"field": "condition", "size": 10}
-                },
-                "price_ranges": {
-                    "range": {
-                        "field": "price",
-                        "ranges": [
-                            {"key": "under_100", "to": 100},
-                            {"key": "100_500", "from": 100, "to": 500},
-                            {"key": "500_1000", "from": 500, "to": 1000},
-                            {"key": "1000_5000", "from": 1000, "to": 5000},
-                            {"key": "5000_10000", "from": 5000, "to": 10000},
-                            {"key": "over_10000", "from": 10000}
-                        ]
-                    }
-                }
-            }
+            body = self.build_search_body(
+                query, filters, location, radius_km, page, per_page, sort_by
+            )
 
-            # Execute search
             response = await self.client.search(
                 index=self.index_name,
                 body=body
             )
 
-            # Format results
-            hits = []
-            for hit in response["hits"]["hits"]:
-                source = hit["_source"]
-                result = {
-                    "id": source["id"],
-                    "title": source["title"],
-                    "description": source.get("description"),
-                    "price": source["price"],
-                    "currency": source.get("currency", "AED"),
-                    "category": source["category"],
-                    "condition": source["condition"],
-                    "feed_type": source["feed_type"],
-                    "neighborhood": source.get("neighborhood"),
-                    "seller": source.get("seller"),
-                    "is_available": source.get("is_available", True),
-                    "view_count": source.get("view_count", 0),
-                    "like_count": source.get("like_count", 0),
-                    "created_at": source.get("created_at"),
-                    "score": hit["_score"]
-                }
-
-                # Add distance if geospatial sort
-                if sort_by == "nearest" and "sort" in hit:
-                    result["distance_km"] = round(hit["sort"][0], 2)
-
-                hits.append(result)
-
-            # Format facets
-            facets = {
-                "categories": [
-                    {"key": bucket["key"], "count": bucket["doc_count"]}
-                    for bucket in response["aggregations"]["categories"]["buckets"]
-                ],
-                "conditions": [
-                    {"key": bucket["key"], "count": bucket["doc_count"]}
-                    for bucket in response["aggregations"]["conditions"]["buckets"]
-                ],
-                "price_ranges": [
-                    {"key": bucket["key"], "count": bucket["doc_count"]}
-                    for bucket in response["aggregations"]["price_ranges"]["buckets"]
-                ]
-            }
-
-            return {
-                "hits": hits,
-                "total": response["hits"]["total"]["value"],
-                "page": page,
-                "per_page": per_page,
-                "facets": facets,
-                "took_ms": response["took"]
-            }
+            return self._format_search_response(response, page, per_page, sort_by)
 
         except Exception as e:
             logger.error(f"Search error: {e}")
-            return {"hits": [], "total": 0, "facets": {}}
+            return {"hits": [], "total": 0, "total_is_lower_bound": False, "facets": {}}
+
+    @staticmethod
+    def build_autocomplete_body(query: str, limit: int = 10) -> Dict:
+        """
+        Build the request body for autocomplete suggestions
+
+        Args:
+            query: Partial search query
+            limit: Maximum number of suggestions
+
+        Returns:
+            dict: Elasticsearch search body
+        """
+        return {
+            "query": {
+                "bool": {
+                    "must": [
+                        {
+                            "match": {
+                                "title.autocomplete": {
+                                    "query": query,
+                                    "operator": "and"
+                                }
+                            }
+                        }
+                    ],
+                    "filter": [
+                        {"term": {"is_available": True}}
+                    ]
+                }
+            },
+            "size": limit,
+            "_source": ["title"]
+        }
+
+    @staticmethod
+    def _format_autocomplete_response(response: Dict) -> List[str]:
+        """Extract unique titles from an autocomplete response"""
+        suggestions = []
+        seen = set()
+        for hit in response["hits"]["hits"]:
+            title = hit["_source"]["title"]
+            if title not in seen:
+                suggestions.append(title)
+                seen.add(title)
+
+        return suggestions
 
     async def autocomplete(
         self,
@@ -475,53 +761,30 @@ class ElasticsearchService:
             return []
 
         try:
-            body = {
-                "query": {
-                    "bool": {
-                        "must": [
-                            {
-                                "match": {
-                                    "title.autocomplete": {
-                                        "query": query,
-                                        "operator": "and"
-                                    }
-                                }
-                            }
-                        ],
-                        "filter": [
-                            {"term": {"is_available": True}}
-                        ]
-                    }
-                },
-                "size": limit,
-                "_source": ["title"]
-            }
-
             response = await self.client.search(
                 index=self.index_name,
-                body=body
+                body=self.build_autocomplete_body(query, limit)
             )
 
-            suggestions = []
-            seen = set()
-            for hit in response["hits"]["hits"]:
-                title = hit["_source"]["title"]
-                if title not in seen:
-                    suggestions.append(title)
-                    seen.add(title)
-
-            return suggestions
+            return self._format_autocomplete_response(response)
 
         except Exception as e:
             logger.error(f"Autocomplete error: {e}")
             return []
 
-    async def bulk_index_products(self, products: List[Product]) -> Tuple[int, int]:
+    async def bulk_index_products(
+        self,
+        products: List[Product],
+        locations: Optional[Dict[str, Optional[Dict[str, float]]]] = None
+    ) -> Tuple[int, int]:
         """
         Bulk index multiple products
 
         Args:
-            products: List of Product instances
+            products: List of Product instances. ``Product.seller`` should be
+                eager-loaded to avoid one query per product.
+            locations: Optional geo_points keyed by ``product.location``
+                value, e.g. selected with ST_X/ST_Y (see ``bulk_index_all``)
 
         Returns:
             tuple: (success_count, error_count)
@@ -530,45 +793,23 @@ class ElasticsearchService:
             return 0, len(products)
 
         try:
-            actions = []
-            for product in products:
-                doc = {
+            if locations is None:
+                # Listings cluster on a small set of pins (same seller,
+                # building, neighborhood centroid), so parse each distinct
+                # location only once
+                locations = {
+                    point: _parse_point(point)
+                    for point in {product.location for product in products if product.location}
+                }
+
+            actions = [
+                {
                     "_index": self.index_name,
                     "_id": str(product.id),
-                    "_source": {
-                        "id": str(product.id),
-                        "title": product.title,
-                        "description": product.description,
-                        "price": float(product.price),
-                        "currency": product.currency,
-                        "category": product.category,
-                        "condition": product.condition,
-                        "feed_type": product.feed_type,
-                        "neighborhood": product.neighborhood,
-                        "tags": product.tags or [],
-                        "seller": {
-                            "id": str(product.seller_id),
-                            "username": product.seller.username if product.seller else None,
-                            "is_verified": product.seller.is_verified if product.seller else False,
-                            "rating": float(product.seller.rating) if product.seller and product.seller.rating else 0.0
-                        },
-                        "is_available": product.is_available,
-                        "view_count": product.view_count,
-                        "like_count": product.like_count,
-                        "created_at": product.created_at.isoformat() if product.created_at else None,
-                        "updated_at": product.updated_at.isoformat() if product.updated_at else None
-                    }
+                    "_source": self._product_document(product, locations),
                 }
-
-                # Add location if available
-                if product.location:
-                    coords = product.location.split("(")[1].split(")")[0].split()
-                    doc["_source"]["location"] = {
-                        "lat": float(coords[1]),
-                        "lon": float(coords[0])
-                    }
-
-                actions.append(doc)
+                for product in products
+            ]
 
             success, errors = await async_bulk(self.client, actions)
             logger.info(f"Bulk indexed {success} products, {len(errors)} errors")
@@ -578,6 +819,44 @@ class ElasticsearchService:
             logger.error(f"Bulk index error: {e}")
             return 0, len(products)
 
+    async def bulk_index_all(self, session: AsyncSession, batch_size: int = 1000) -> Tuple[int, int]:
+        """
+        Reindex every product, streaming rows from Postgres in batches
+
+        Sellers are fetched with ``selectinload`` (one IN query per batch)
+        so the bulk path never issues per-product seller lookups. Coordinates
+        come back from PostGIS as ST_Y/ST_X floats, so no location is parsed
+        in Python.
+
+        Args:
+            session: Database session
+            batch_size: Rows fetched and indexed per batch
+
+        Returns:
+            tuple: (success_count, error_count)
+        """
+        stmt = (
+            select(Product, func.ST_Y(Product.location), func.ST_X(Product.location))
+            .options(selectinload(Product.seller))
+            .execution_options(yield_per=batch_size)
+        )
+
+        total_success = 0
+        total_errors = 0
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            products = [product for product, _, _ in partition]
+            locations = {
+                product.location: {"lat": lat, "lon": lon}
+                for product, lat, lon in partition
+                if product.location and lat is not None
+            }
+            success, errors = await self.bulk_index_products(products, locations)
+            total_success += success
+            total_errors += errors
+
+        return total_success, total_errors
+
 
 # Global Elasticsearch service instance
 elasticsearch_service = ElasticsearchService()
@@ -1,14 +1,89 @@
 """Email service for sending transactional emails with templates."""
 
+import asyncio
 import logging
+import re
+from collections.abc import Awaitable
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 
 from app.config import settings
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, retry_async
 
 logger = logging.getLogger(__name__)
 
+# ZeptoMail accepts at most this many recipients per batch request; we
+# stay well under it to keep individual payloads small
+BATCH_SIZE = 500
+
+# Shared by all sends: after 10 consecutive failures, fail fast for 30s
+_zeptomail_breaker = CircuitBreaker("zeptomail", failure_threshold=10, reset_timeout=30.0)
+
+# One-click verification endpoint; query string is added per email
+_VERIFY_EMAIL_URL = "https://api.jiran.app/api/v1/auth/verify-email?"
+
+# Template placeholders look like {{USER_NAME}}
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Parsed templates by file name: (statics, placeholders), where
+# len(statics) == len(placeholders) + 1
+_TEMPLATE_CACHE: dict[str, tuple[list[str], list[str]]] = {}
+
+# Placeholders whose values never change, folded into the template's static
+# chunks when it is loaded so only per-recipient values are filled per send
+_TEMPLATE_CONSTANTS: dict[str, dict[str, str]] = {
+    "welcome.html": {
+        "APP_LINK": "https://jiran.app",
+        "BROWSE_LINK": "https://jiran.app/browse",
+        "IOS_APP_LINK": "https://apps.apple.com/app/jiran",
+        "ANDROID_APP_LINK": "https://play.google.com/store/apps/jiran",
+        "SUPPORT_EMAIL": "support@jiran.app",
+        "UNSUBSCRIBE_LINK": "https://jiran.app/unsubscribe",
+        "PRIVACY_LINK": "https://jiran.app/privacy",
+        "TERMS_LINK": "https://jiran.app/terms",
+    },
+}
+
+
+def _parse_template(text: str, constants: dict[str, str]) -> tuple[list[str], list[str]]:
+    """Split a template into static chunks and placeholder names in one pass.
+
+    Placeholders found in ``constants`` are substituted immediately and merged
+    into the surrounding static chunk.
+    """
+    parts = _PLACEHOLDER_RE.split(text)
+    statics = [parts[0]]
+    placeholders = []
+    for i in range(1, len(parts), 2):
+        name, static = parts[i], parts[i + 1]
+        if name in constants:
+            statics[-1] += constants[name] + static
+        else:
+            placeholders.append(name)
+            statics.append(static)
+    return statics, placeholders
+
+
+def _render_template(statics: list[str], placeholders: list[str], variables: dict[str, str]) -> str:
+    """Interleave a parsed template's static chunks with variable values."""
+    parts = []
+    for static, name in zip(statics, placeholders):
+        parts.append(static)
+        parts.append(variables.get(name, ""))
+    parts.append(statics[-1])
+    return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def _render_cached(name: str, variables: frozenset[tuple[str, str]]) -> str:
+    """Render a loaded template, memoized for repeated variable sets (OTP resends, retries)."""
+    statics, placeholders = _TEMPLATE_CACHE[name]
+    return _render_template(statics, placeholders, dict(variables))
+
 
 class EmailService:
     """
@@ -33,12 +108,151 @@ class EmailService:
         # Check if ZeptoMail is configured
         self.is_configured = bool(self.send_token)
 
+        # Batch endpoint lives next to the single-send endpoint
+        self.batch_api_url = f"{self.api_url.rstrip('/')}/batch"
+
+        # Shared HTTP client (created lazily, closed on app shutdown)
+        self._client: httpx.AsyncClient | None = None
+
+        # Fire-and-forget sends; references kept so tasks aren't garbage collected
+        self._background_tasks: set[asyncio.Task] = set()
+
         if not self.is_configured:
             logger.warning(
                 'ZeptoMail not configured - emails will be logged only',
                 extra={'api_url': self.api_url},
             )
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive HTTP/2 client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                timeout=30.0,
+            )
+        return self._client
+
+    def send_in_background(self, send: Awaitable[bool]) -> None:
+        """
+        Run an email send without making the caller wait for ZeptoMail.
+
+        Request handlers use this so the HTTP response is not held up by the
+        mail API round trip. Failures are logged; the result is discarded.
+
+        Args:
+            send: Send coroutine, e.g. ``email_service.send_welcome_email(...)``
+        """
+        task = asyncio.create_task(send)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_send_done)
+
+    def _on_background_send_done(self, task: asyncio.Task) -> None:
+        """Drop the finished task and log unexpected failures."""
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error('Background email send failed', extra={'error': str(exc)}, exc_info=exc)
+
+    async def aclose(self) -> None:
+        """Wait for pending background sends, then close the shared HTTP client."""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, url: str, payload: dict, headers: dict[str, str]) -> httpx.Response:
+        """
+        POST a JSON payload to ZeptoMail with retries and circuit breaking.
+
+        Transport errors (timeouts, connection resets) are retried up to 3
+        times with jittered exponential backoff. Transport errors and 5xx
+        responses count against the shared circuit breaker.
+
+        Raises:
+            CircuitOpenError: If ZeptoMail has been failing and the circuit is open
+            httpx.TransportError: If every attempt failed
+        """
+        if not _zeptomail_breaker.allow():
+            raise CircuitOpenError(_zeptomail_breaker.name, _zeptomail_breaker.retry_after())
+
+        try:
+            response = await retry_async(
+                self._get_client().post,
+                url,
+                content=orjson.dumps(payload),
+                headers=headers,
+                retry_on=(httpx.TransportError,),
+            )
+        except Exception:
+            _zeptomail_breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled mid-request; free the half-open trial slot
+            _zeptomail_breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            _zeptomail_breaker.record_failure()
+        else:
+            _zeptomail_breaker.record_success()
+        return response
+
+    def _headers(self) -> dict[str, str]:
+        """Build ZeptoMail API request headers."""
+        return {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "authorization": f"Zoho-enczapikey {self.send_token}",
+        }
+
+    def _load_template(self, name: str) -> tuple[list[str], list[str]] | None:
+        """
+        Load and parse an email template, reading the file only once.
+
+        Args:
+            name: Template file name inside the templates directory
+
+        Returns:
+            (statics, placeholders) split of the template, or None if missing
+        """
+        parsed = _TEMPLATE_CACHE.get(name)
+        if parsed is not None:
+            return parsed
+
+        template_path = self.templates_dir / name
+        if not template_path.exists():
+            logger.error('Email template not found', extra={'path': str(template_path)})
+            return None
+
+        # Read raw bytes and decode once; skips text-mode newline translation.
+        # Rendered bodies stay str: the JSON payload needs a str htmlbody and
+        # orjson encodes it straight to UTF-8 bytes for the POST.
+        text = template_path.read_bytes().decode("utf-8")
+        parsed = _parse_template(text, _TEMPLATE_CONSTANTS.get(name, {}))
+
+        _TEMPLATE_CACHE[name] = parsed
+        return parsed
+
+    def _render(self, name: str, variables: dict[str, str]) -> str | None:
+        """
+        Render an email template with the given variables.
+
+        Args:
+            name: Template file name inside the templates directory
+            variables: Placeholder name to value
+
+        Returns:
+            Rendered HTML, or None if the template is missing
+        """
+        if self._load_template(name) is None:
+            return None
+        return _render_cached(name, frozenset(variables.items()))
+
     async def send_email(
         self,
         to_email: str,
@@ -70,12 +284,7 @@ class EmailService:
             return True  # Return success to not block development
 
         try:
-            # Build headers
-            headers = {
-                "accept": "application/json",
-                "content-type": "application/json",
-                "authorization": f"Zoho-enczapikey {self.send_token}",
-            }
+            headers = self._headers()
 
             # Build payload matching ZeptoMail format
             to_data = {"email_address": {"address": to_email}}
@@ -89,34 +298,28 @@ class EmailService:
                 "htmlbody": html_body,
             }
 
-            # Send email via API
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0,
-                )
+            # Send email via API (reuses pooled connections)
+            response = await self._post(self.api_url, payload, headers)
 
-                if response.status_code == 200:
-                    logger.info(
-                        'Email sent successfully via ZeptoMail API',
-                        extra={'to': to_email, 'subject': subject},
-                    )
-                    return True
-                else:
-                    logger.error(
-                        'ZeptoMail API returned non-200 status',
-                        extra={
-                            'to': to_email,
-                            'subject': subject,
-                            'status_code': response.status_code,
-                            'response': response.text[:500],  # Limit response length
-                        },
-                    )
-                    # Note: Email might still be delivered even with non-200 response
-                    # ZeptoMail can accept email but return errors for billing/quota warnings
-                    return False
+            if response.status_code == 200:
+                logger.info(
+                    'Email sent successfully via ZeptoMail API',
+                    extra={'to': to_email, 'subject': subject},
+                )
+                return True
+            else:
+                logger.error(
+                    'ZeptoMail API returned non-200 status',
+                    extra={
+                        'to': to_email,
+                        'subject': subject,
+                        'status_code': response.status_code,
+                        'response': response.content[:500].decode('utf-8', 'replace'),  # Limit response length
+                    },
+                )
+                # Note: Email might still be delivered even with non-200 response
+                # ZeptoMail can accept email but return errors for billing/quota warnings
+                return False
 
         except Exception as e:
             logger.error(
@@ -126,6 +329,86 @@ class EmailService:
             )
             return False
 
+    async def send_batch(
+        self,
+        subject: str,
+        html_body: str,
+        recipients: list[dict],
+    ) -> dict[str, int]:
+        """
+        Send one email to many recipients via ZeptoMail's batch API.
+
+        Recipients are split into requests of ``BATCH_SIZE`` which are sent
+        concurrently. Per-recipient values are passed as ZeptoMail
+        ``merge_info`` and substituted into ``{{merge_tag}}`` markers in
+        ``html_body`` by ZeptoMail.
+
+        Args:
+            subject: Email subject line
+            html_body: HTML email content (may contain merge tags)
+            recipients: Dicts with ``email`` and optional ``name`` and
+                ``merge_info`` keys
+
+        Returns:
+            Dictionary with success and failure counts
+        """
+        total = len(recipients)
+        if not self.is_configured:
+            logger.info(
+                'Batch email sending skipped (ZeptoMail not configured)',
+                extra={'subject': subject, 'recipients': total},
+            )
+            return {"success": total, "failed": 0, "total": total}
+
+        def build_to(recipient: dict) -> dict:
+            to_data = {"email_address": {"address": recipient["email"]}}
+            if recipient.get("name"):
+                to_data["email_address"]["name"] = recipient["name"]
+            if recipient.get("merge_info"):
+                to_data["merge_info"] = recipient["merge_info"]
+            return to_data
+
+        chunks = [recipients[i:i + BATCH_SIZE] for i in range(0, total, BATCH_SIZE)]
+
+        async def send_chunk(chunk: list[dict]) -> bool:
+            payload = {
+                "from": {"address": self.from_email, "name": self.from_name},
+                "to": [build_to(recipient) for recipient in chunk],
+                "subject": subject,
+                "htmlbody": html_body,
+            }
+            try:
+                response = await self._post(self.batch_api_url, payload, self._headers())
+            except Exception as e:
+                logger.error(
+                    'Failed to send batch email via ZeptoMail API',
+                    extra={'subject': subject, 'recipients': len(chunk), 'error': str(e)},
+                    exc_info=True,
+                )
+                return False
+
+            if response.status_code not in (200, 201):
+                logger.error(
+                    'ZeptoMail batch API returned non-2xx status',
+                    extra={
+                        'subject': subject,
+                        'recipients': len(chunk),
+                        'status_code': response.status_code,
+                        'response': response.content[:500].decode('utf-8', 'replace'),  # Limit response length
+                    },
+                )
+                return False
+            return True
+
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+
+        success_count = sum(len(chunk) for chunk, ok in zip(chunks, results) if ok)
+        logger.info(
+            'Batch email sent via ZeptoMail API',
+            extra={'subject': subject, 'success': success_count, 'total': total},
+        )
+        return {"success": success_count, "failed": total - success_count, "total": total}
+
     async def send_otp_email(self, email: str, otp: str, user_name: str | None = None) -> bool:
         """
         Send OTP verification email.
@@ -139,27 +422,18 @@ class EmailService:
             True if email sent successfully
         """
         try:
-            # Load OTP template
-            template_path = self.templates_dir / "otp_verification.html"
-
-            if not template_path.exists():
-                logger.error('OTP email template not found', extra={'path': str(template_path)})
-                return False
-
-            with open(template_path, "r", encoding="utf-8") as f:
-                html_template = f.read()
-
-            # Replace template variables
-            html_body = html_template.replace("{{OTP_CODE}}", otp)
-            html_body = html_body.replace("{{USER_EMAIL}}", email)
-
-            # Add user name if provided
-            if user_name:
-                html_body = html_body.replace("{{USER_NAME}}", user_name)
-
             # Create verification deep link (for one-click verification)
-            verification_link = f"https://api.jiran.app/api/v1/auth/verify-email?code={otp}&email={email}"
-            html_body = html_body.replace("{{VERIFICATION_LINK}}", verification_link)
+            # urlencode so addresses like user+tag@gmail.com survive ("+" would decode as a space)
+            verification_link = _VERIFY_EMAIL_URL + urlencode({"code": otp, "email": email})
+
+            html_body = self._render("otp_verification.html", {
+                "OTP_CODE": otp,
+                "USER_EMAIL": email,
+                "USER_NAME": user_name or "",
+                "VERIFICATION_LINK": verification_link,
+            })
+            if html_body is None:
+                return False
 
             # Send email
             return await self.send_email(
@@ -185,28 +459,13 @@ class EmailService:
             True if email sent successfully
         """
         try:
-            # Load welcome template
-            template_path = self.templates_dir / "welcome.html"
-
-            if not template_path.exists():
-                logger.error('Welcome email template not found', extra={'path': str(template_path)})
+            html_body = self._render("welcome.html", {
+                "USER_NAME": name,
+                "USER_EMAIL": email,
+            })
+            if html_body is None:
                 return False
 
-            with open(template_path, "r", encoding="utf-8") as f:
-                html_template = f.read()
-
-            # Replace template variables
-            html_body = html_template.replace("{{USER_NAME}}", name)
-            html_body = html_body.replace("{{USER_EMAIL}}", email)
-            html_body = html_body.replace("{{APP_LINK}}", "https://jiran.app")
-            html_body = html_body.replace("{{BROWSE_LINK}}", "https://jiran.app/browse")
-            html_body = html_body.replace("{{IOS_APP_LINK}}", "https://apps.apple.com/app/jiran")
-            html_body = html_body.replace("{{ANDROID_APP_LINK}}", "https://play.google.com/store/apps/jiran")
-            html_body = html_body.replace("{{SUPPORT_EMAIL}}", "support@jiran.app")
-            html_body = html_body.replace("{{UNSUBSCRIBE_LINK}}", "https://jiran.app/unsubscribe")
-            html_body = html_body.replace("{{PRIVACY_LINK}}", "https://jiran.app/privacy")
-            html_body = html_body.replace("{{TERMS_LINK}}", "https://jiran.app/terms")
-
             # Send email
             return await self.send_email(
                 to_email=email,
@@ -237,60 +496,12 @@ class EmailService:
             # Fallback web link
             web_reset_link = f"https://jiran.app/reset-password?token={reset_token}"
 
-            # Simple HTML email (can create template later)
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; margin: 0; padding: 0; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff; border-radius: 12px; overflow: hidden; margin-top: 40px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #D4A745 0%, #C1440E 100%); padding: 40px 20px; text-align: center;">
-            <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: 700;">Reset Your Password</h1>
-        </div>
-
-        <!-- Body -->
-        <div style="padding: 40px 30px;">
-            <p style="font-size: 16px; color: #333333; line-height: 1.6; margin: 0 0 20px;">
-                {f"Hi {user_name}," if user_name else "Hello,"}
-            </p>
-
-            <p style="font-size: 16px; color: #333333; line-height: 1.6; margin: 0 0 20px;">
-                We received a request to reset your password. Click the button below to create a new password:
-            </p>
-
-            <!-- Reset Button -->
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{web_reset_link}" style="display: inline-block; background: linear-gradient(135deg, #D4A745 0%, #C1440E 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-weight: 600; font-size: 16px;">
-                    Reset Password
-                </a>
-            </div>
-
-            <p style="font-size: 14px; color: #666666; line-height: 1.6; margin: 20px 0 0;">
-                Or copy and paste this link into your browser:
-            </p>
-            <p style="font-size: 14px; color: #D4A745; word-break: break-all; margin: 10px 0 20px;">
-                {web_reset_link}
-            </p>
-
-            <p style="font-size: 14px; color: #999999; line-height: 1.6; margin: 30px 0 0; padding-top: 20px; border-top: 1px solid #eeeeee;">
-                This link will expire in 1 hour. If you didn't request a password reset, please ignore this email.
-            </p>
-        </div>
-
-        <!-- Footer -->
-        <div style="background-color: #f9f9f9; padding: 20px; text-align: center; border-top: 1px solid #eeeeee;">
-            <p style="font-size: 12px; color: #999999; margin: 0;">
-                © 2025 Jiran. All rights reserved.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-            """.strip()
+            html_body = self._render("password_reset.html", {
+                "USER_GREETING": f"Hi {user_name}," if user_name else "Hello,",
+                "RESET_LINK": web_reset_link,
+            })
+            if html_body is None:
+                return False
 
             # Send email
             return await self.send_email(
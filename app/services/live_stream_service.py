@@ -29,13 +29,22 @@ Usage:
     await service.finalize_stream(stream_id, upload_id, parts)
 """
 
+import asyncio
+import base64
 import hashlib
 from typing import Optional, Dict, List
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+from operator import itemgetter
 
 from app.storage.b2_config import B2Config
 
+# Max concurrent part uploads per process; bounds memory held by in-flight chunks
+MAX_CONCURRENT_PART_UPLOADS = 8
+_part_upload_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PART_UPLOADS)
+
+_part_number = itemgetter('PartNumber')
+
 
 class LiveStreamService:
     """Service for handling live video streaming to Backblaze B2"""
@@ -50,7 +59,8 @@ class LiveStreamService:
         stream_id: str,
         chunk_number: int,
         chunk_data: bytes,
-        upload_id: Optional[str] = None
+        upload_id: Optional[str] = None,
+        verify_integrity: bool = False
     ) -> Dict[str, any]:
         """
         Upload a live stream chunk
@@ -63,6 +73,9 @@ class LiveStreamService:
             chunk_number: Sequential chunk number (starts at 1)
             chunk_data: Video chunk data as bytes
             upload_id: Multipart upload ID (None for first chunk, required for others)
+            verify_integrity: Send a Content-MD5 so B2 rejects corrupted parts.
+                Off by default: TLS already protects the transfer and hashing
+                costs CPU on every chunk.
 
         Returns:
             dict: Result with keys:
@@ -80,14 +93,15 @@ class LiveStreamService:
 
             # Initialize multipart upload if first chunk
             if chunk_number == 1:
-                response = self.s3_client.create_multipart_upload(
+                response = await asyncio.to_thread(
+                    self.s3_client.create_multipart_upload,
                     Bucket=self.bucket_live,
                     Key=file_key,
                     ContentType='video/mp4',
                     Metadata={
                         'stream_id': stream_id,
                         'live': 'true',
-                        'start_time': datetime.utcnow().isoformat()
+                        'start_time': datetime.now(timezone.utc).isoformat(timespec='seconds')
                     },
                     ServerSideEncryption='AES256'
                 )
@@ -99,13 +113,22 @@ class LiveStreamService:
                 )
 
             # Upload chunk as part
-            part_response = self.s3_client.upload_part(
-                Bucket=self.bucket_live,
-                Key=file_key,
-                PartNumber=chunk_number,
-                UploadId=upload_id,
-                Body=chunk_data
-            )
+            part_kwargs = {
+                'Bucket': self.bucket_live,
+                'Key': file_key,
+                'PartNumber': chunk_number,
+                'UploadId': upload_id,
+                'Body': chunk_data,
+            }
+            if verify_integrity:
+                part_kwargs['ContentMD5'] = self._content_md5(chunk_data)
+
+            # boto3 is blocking; run it off the event loop so parts upload in parallel
+            async with _part_upload_semaphore:
+                part_response = await asyncio.to_thread(
+                    self.s3_client.upload_part,
+                    **part_kwargs
+                )
 
             return {
                 'upload_id': upload_id,
@@ -125,6 +148,38 @@ class LiveStreamService:
                 detail=f"Failed to upload stream chunk: {str(e)}"
             )
 
+    async def upload_stream_chunks(
+        self,
+        stream_id: str,
+        upload_id: str,
+        chunks: Dict[int, bytes]
+    ) -> List[Dict[str, any]]:
+        """
+        Upload several chunks of an initialized stream concurrently
+
+        Up to MAX_CONCURRENT_PART_UPLOADS parts are in flight at once.
+
+        Args:
+            stream_id: Stream identifier
+            upload_id: Multipart upload ID from the first chunk
+            chunks: Mapping of chunk_number (> 1) to chunk data
+
+        Returns:
+            list: upload_stream_chunk results, in chunk_number order
+
+        Raises:
+            HTTPException: If any upload fails
+        """
+        return await asyncio.gather(*(
+            self.upload_stream_chunk(
+                stream_id=stream_id,
+                chunk_number=chunk_number,
+                chunk_data=chunk_data,
+                upload_id=upload_id
+            )
+            for chunk_number, chunk_data in sorted(chunks.items())
+        ))
+
     async def finalize_stream(
         self,
         stream_id: str,
@@ -164,11 +219,13 @@ class LiveStreamService:
         try:
             file_key = f"live/{stream_id}/stream.mp4"
 
-            # Sort parts by PartNumber to ensure correct order
-            sorted_parts = sorted(parts, key=lambda p: p['PartNumber'])
+            # Sort parts by PartNumber to ensure correct order. Parts usually
+            # arrive in order, which Timsort handles in a single O(n) pass.
+            sorted_parts = sorted(parts, key=_part_number)
 
             # Complete multipart upload
-            self.s3_client.complete_multipart_upload(
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
                 Bucket=self.bucket_live,
                 Key=file_key,
                 UploadId=upload_id,
@@ -211,7 +268,8 @@ class LiveStreamService:
         try:
             file_key = f"live/{stream_id}/stream.mp4"
 
-            self.s3_client.abort_multipart_upload(
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
                 Bucket=self.bucket_live,
                 Key=file_key,
                 UploadId=upload_id
@@ -225,6 +283,17 @@ class LiveStreamService:
                 detail=f"Failed to abort stream: {str(e)}"
             )
 
+    @staticmethod
+    def _content_md5(chunk_data: bytes) -> str:
+        """
+        Base64 MD5 digest for the Content-MD5 header
+
+        Hashes through a memoryview so bytearray/slice inputs are not copied;
+        hashlib uses OpenSSL's optimized implementation.
+        """
+        digest = hashlib.md5(memoryview(chunk_data), usedforsecurity=False).digest()
+        return base64.b64encode(digest).decode('ascii')
+
     def _generate_file_url(self, file_key: str) -> str:
         """
         Generate public URL for stream
@@ -258,7 +327,8 @@ class LiveStreamService:
         try:
             file_key = f"live/{stream_id}/stream.mp4"
 
-            self.s3_client.delete_object(
+            await asyncio.to_thread(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_live,
                 Key=file_key
             )
@@ -290,7 +360,8 @@ class LiveStreamService:
         try:
             file_key = f"live/{stream_id}/stream.mp4"
 
-            response = self.s3_client.list_parts(
+            response = await asyncio.to_thread(
+                self.s3_client.list_parts,
                 Bucket=self.bucket_live,
                 Key=file_key,
                 UploadId=upload_id
@@ -6,17 +6,38 @@ This module provides notification functionality using:
 - Database storage for notification history
 """
 
+import asyncio
 import logging
 from typing import Any
 
-from firebase_admin import credentials, initialize_app, messaging
-from sqlalchemy import select
+from firebase_admin import credentials, initialize_app
+from firebase_admin.exceptions import DeadlineExceededError, InternalError, UnavailableError
+from firebase_admin.messaging import MulticastMessage, SendResponse, send_each_for_multicast
+from firebase_admin.messaging import Notification as FcmNotification
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.notification import DeviceToken, Notification, NotificationType
+from app.services.email_service import email_service
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# FCM accepts at most 500 tokens per multicast request
+FCM_MULTICAST_LIMIT = 500
+
+# FCM errors worth retrying (server-side / timeout); others fail immediately
+FCM_TRANSIENT_ERRORS = (UnavailableError, DeadlineExceededError, InternalError)
+
+# Attempts per token (first send plus retries of transient failures)
+FCM_SEND_ATTEMPTS = 3
+FCM_RETRY_BASE_DELAY = 0.2
+FCM_RETRY_MAX_DELAY = 5.0
+
+# After 10 consecutive multicasts in which every token failed transiently,
+# skip FCM for 30s
+_fcm_breaker = CircuitBreaker("fcm", failure_threshold=10, reset_timeout=30.0)
+
 
 class NotificationService:
     """Service for sending notifications via FCM and email."""
@@ -85,17 +106,14 @@ class NotificationService:
             db.add(notification)
             await db.commit()
 
-            # Get user's FCM tokens
-            result = await db.execute(select(DeviceToken).where(DeviceToken.user_id == user_id))
-            device_tokens = result.scalars().all()
+            # Get user's FCM tokens (token column only, no ORM hydration)
+            result = await db.execute(select(DeviceToken.fcm_token).where(DeviceToken.user_id == user_id))
+            fcm_tokens = list(result.scalars().all())
 
-            if not device_tokens:
+            if not fcm_tokens:
                 logger.info(f"No device tokens found for user {user_id}")
                 return True  # Still consider successful (notification stored)
 
-            # Extract FCM tokens
-            fcm_tokens = [token.fcm_token for token in device_tokens]
-
             # Send push notification
             success = await self.send_push(fcm_tokens, title, body, data or {})
 
@@ -108,6 +126,94 @@ class NotificationService:
             logger.error(f"Error sending notification to user {user_id}: {e}")
             return False
 
+    @staticmethod
+    def _build_fcm_message(
+        title: str,
+        body: str,
+        data: dict[str, Any],
+    ) -> tuple[FcmNotification, dict[str, str]]:
+        """Build the FCM notification and string-only data payload.
+
+        Built once per send and shared by every multicast chunk.
+
+        Args:
+            title: Notification title
+            body: Notification body
+            data: Additional data payload
+
+        Returns:
+            Tuple of (FCM notification, data with string values)
+        """
+        notification = FcmNotification(title=title, body=body)
+        # FCM requires string values; most navigation payloads already are
+        str_data = {k: v if isinstance(v, str) else str(v) for k, v in data.items()}
+        return notification, str_data
+
+    @staticmethod
+    async def _send_multicast(
+        tokens: list[str],
+        notification: FcmNotification,
+        data: dict[str, str],
+    ) -> list[SendResponse]:
+        """Send one multicast on a worker thread with retries and circuit breaking.
+
+        ``send_each_for_multicast`` doesn't raise for per-token errors; it
+        stores them on ``BatchResponse.responses[i].exception``. So the
+        responses are inspected: tokens that failed with a transient error are
+        re-sent with backoff, and a multicast in which every token still
+        failed transiently counts as an FCM outage for the breaker.
+
+        Args:
+            tokens: Device tokens (at most ``FCM_MULTICAST_LIMIT``)
+            notification: FCM notification
+            data: String-only data payload
+
+        Returns:
+            One SendResponse per token, in ``tokens`` order
+
+        Raises:
+            CircuitOpenError: If FCM has been failing and the circuit is open
+        """
+        if not _fcm_breaker.allow():
+            raise CircuitOpenError(_fcm_breaker.name, _fcm_breaker.retry_after())
+
+        responses: list[SendResponse | None] = [None] * len(tokens)
+        pending = list(range(len(tokens)))
+        try:
+            for attempt in range(FCM_SEND_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(backoff_delay(attempt - 1, FCM_RETRY_BASE_DELAY, FCM_RETRY_MAX_DELAY))
+                message = MulticastMessage(
+                    tokens=[tokens[i] for i in pending],
+                    notification=notification,
+                    data=data,
+                )
+                batch = await asyncio.to_thread(send_each_for_multicast, message)
+
+                retry = []
+                for i, response in zip(pending, batch.responses):
+                    responses[i] = response
+                    if not response.success and isinstance(response.exception, FCM_TRANSIENT_ERRORS):
+                        retry.append(i)
+                if not retry:
+                    break
+                pending = retry
+        except Exception:
+            _fcm_breaker.record_failure()
+            raise
+        except BaseException:
+            _fcm_breaker.release()
+            raise
+
+        if all(
+            not response.success and isinstance(response.exception, FCM_TRANSIENT_ERRORS)
+            for response in responses
+        ):
+            _fcm_breaker.record_failure()
+        else:
+            _fcm_breaker.record_success()
+        return responses
+
     async def send_push(
         self,
         fcm_tokens: list[str],
@@ -126,41 +232,64 @@ class NotificationService:
         Returns:
             True if at least one message was sent successfully
         """
-        try:
-            # Create FCM message
-            message_data = {
-                "notification": messaging.Notification(
-                    title=title,
-                    body=body,
-                ),
-                "data": {k: str(v) for k, v in data.items()},  # FCM requires string values
-            }
+        return any(await self._push_to_tokens(fcm_tokens, title, body, data))
 
-            # Send to multiple devices (multicast)
-            multicast_message = messaging.MulticastMessage(
-                tokens=fcm_tokens,
-                notification=message_data["notification"],
-                data=message_data["data"],
+    async def _push_to_tokens(
+        self,
+        fcm_tokens: list[str],
+        title: str,
+        body: str,
+        data: dict[str, Any],
+    ) -> list[bool]:
+        """Push to each token and report which deliveries succeeded.
+
+        Tokens are split into multicasts of ``FCM_MULTICAST_LIMIT`` which are
+        sent concurrently on worker threads (the Firebase SDK is blocking).
+
+        Args:
+            fcm_tokens: List of FCM device tokens
+            title: Notification title
+            body: Notification body
+            data: Additional data payload
+
+        Returns:
+            One flag per token, in ``fcm_tokens`` order; all False if the
+            send itself failed
+        """
+        if not fcm_tokens:
+            return []
+
+        try:
+            notification, str_data = self._build_fcm_message(title, body, data)
+
+            # Send to multiple devices (multicast), 500 tokens per request
+            batches = await asyncio.gather(
+                *(
+                    self._send_multicast(fcm_tokens[i:i + FCM_MULTICAST_LIMIT], notification, str_data)
+                    for i in range(0, len(fcm_tokens), FCM_MULTICAST_LIMIT)
+                )
             )
+            delivered = [response.success for batch in batches for response in batch]
 
-            response = messaging.send_multicast(multicast_message)
+            success_count = sum(delivered)
+            failure_count = len(fcm_tokens) - success_count
 
             logger.info(
-                f"FCM multicast sent: {response.success_count} successful, "
-                f"{response.failure_count} failed out of {len(fcm_tokens)} tokens"
+                f"FCM multicast sent: {success_count} successful, "
+                f"{failure_count} failed out of {len(fcm_tokens)} tokens"
             )
 
             # TODO: Handle invalid tokens (remove from database)
-            # for idx, result in enumerate(response.responses):
-            #     if not result.success:
+            # for token, ok in zip(fcm_tokens, delivered):
+            #     if not ok:
             #         # Log or remove invalid token
             #         pass
 
-            return response.success_count > 0
+            return delivered
 
         except Exception as e:
             logger.error(f"Error sending FCM push notification: {e}")
-            return False
+            return [False] * len(fcm_tokens)
 
     async def send_bulk_notification(
         self,
@@ -173,6 +302,10 @@ class NotificationService:
     ) -> dict[str, int]:
         """Send notification to multiple users.
 
+        Stores all notification records with one bulk INSERT, fetches every
+        recipient's device tokens with one query, and pushes to all of them
+        in FCM multicasts.
+
         Args:
             db: Database session
             user_ids: List of user UUIDs
@@ -182,34 +315,89 @@ class NotificationService:
             data: Additional data payload
 
         Returns:
-            Dictionary with success and failure counts
+            Dictionary with success and failure counts; a user fails if the
+            record couldn't be stored, or they have device tokens and none
+            of them received the push
         """
-        success_count = 0
-        failure_count = 0
+        total = len(user_ids)
+        if not user_ids:
+            return {"success": 0, "failed": 0, "total": 0}
 
-        for user_id in user_ids:
-            result = await self.send_notification(
-                db=db,
-                user_id=user_id,
-                notification_type=notification_type,
-                title=title,
-                body=body,
-                data=data,
+        try:
+            await self.create_notifications_bulk(
+                db,
+                [
+                    {
+                        "user_id": user_id,
+                        "notification_type": notification_type,
+                        "title": title,
+                        "body": body,
+                        "data": data or {},
+                    }
+                    for user_id in user_ids
+                ],
             )
+        except Exception as e:
+            logger.error(f"Error storing bulk notifications: {e}")
+            await db.rollback()
+            return {"success": 0, "failed": total, "total": total}
+
+        # A user counts as failed when they have device tokens and none of
+        # them received the push, as with send_notification
+        failed_users: set = set()
+        fcm_tokens: list[str] = []
+        try:
+            result = await db.execute(
+                select(DeviceToken.user_id, DeviceToken.fcm_token).where(DeviceToken.user_id.in_(user_ids))
+            )
+            users_by_token: dict[str, list] = {}
+            for user_id, fcm_token in result.all():
+                users_by_token.setdefault(fcm_token, []).append(user_id)
+
+            # A device registered to several recipients (shared phone, stale
+            # registrations) should only be pushed to once
+            fcm_tokens = list(users_by_token)
+            delivered = await self._push_to_tokens(fcm_tokens, title, body, data or {})
+
+            reached = {
+                user_id
+                for fcm_token, ok in zip(fcm_tokens, delivered)
+                if ok
+                for user_id in users_by_token[fcm_token]
+            }
+            failed_users = {
+                user_id for owners in users_by_token.values() for user_id in owners
+            } - reached
+        except Exception as e:
+            # Notifications are stored, but nobody's delivery is known
+            logger.error(f"Error sending bulk push notifications: {e}")
+            failed_users = set(user_ids)
 
-            if result:
-                success_count += 1
-            else:
-                failure_count += 1
-
-        logger.info(f"Bulk notification sent: {success_count} successful, {failure_count} failed")
+        failure_count = len(failed_users)
+        logger.info(
+            f"Bulk notification sent: {total} stored, pushed to {len(fcm_tokens)} device tokens, "
+            f"{failure_count} users unreachable"
+        )
 
         return {
-            "success": success_count,
+            "success": total - failure_count,
             "failed": failure_count,
-            "total": len(user_ids),
+            "total": total,
         }
 
+    async def create_notifications_bulk(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Insert many notification records in a single statement and commit.
+
+        Args:
+            db: Database session
+            rows: Notification column values, one dict per record
+        """
+        if not rows:
+            return
+
+        await db.execute(insert(Notification), rows)
+        await db.commit()
+
     async def send_email_notification(
         self,
         user_email: str,
@@ -232,6 +420,31 @@ class NotificationService:
         logger.info(f"Email notification to {user_email}: {subject}")
         return True
 
+    async def send_bulk_email_notification(
+        self,
+        recipients: list[dict],
+        subject: str,
+        body: str,
+    ) -> dict[str, int]:
+        """Send the same email notification to many recipients.
+
+        Uses ZeptoMail's batch endpoint, so N recipients cost about
+        N / 500 requests instead of N.
+
+        Args:
+            recipients: Dicts with ``email`` and optional ``name`` and
+                ``merge_info`` (per-recipient merge tag values)
+            subject: Email subject
+            body: Email body (HTML, may contain ``{{merge_tag}}`` markers)
+
+        Returns:
+            Dictionary with success and failure counts
+        """
+        if not recipients:
+            return {"success": 0, "failed": 0, "total": 0}
+
+        return await email_service.send_batch(subject, body, recipients)
+
 
 # Global notification service instance
 notification_service = NotificationService()
@@ -7,17 +7,169 @@ This module handles all Stripe payment operations including:
 - Platform fee calculations
 - Refunds and payouts
 """
-from decimal import Decimal
-from typing import Any
-
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, TypeVar
+
+import httpx
 import stripe
 
 from app.config import settings
+from app.core.cache.cache_keys import CacheKeys
+from app.core.cache.redis_manager import get_redis_manager
 from app.models.product import FeedType
 from app.models.user import User
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
+from app.utils.stripe_http import HTTPXClient
+
+logger = logging.getLogger(__name__)
 
 # Initialize Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
+# Retry connection errors, 409s and 5xx/429 responses with the SDK's
+# exponential backoff + jitter (0.5s base, 2s cap, honours Stripe-Should-Retry)
+stripe.max_network_retries = 3
+# Per-attempt timeouts: fail in seconds rather than the SDK's 80s default so
+# the breaker can trip
+STRIPE_CONNECT_TIMEOUT = 3.0
+STRIPE_READ_TIMEOUT = 10.0
+# Shared HTTP/2 client: one kept-alive connection multiplexes calls from all
+# worker threads.
+stripe.default_http_client = HTTPXClient(
+    timeout=httpx.Timeout(STRIPE_READ_TIMEOUT, connect=STRIPE_CONNECT_TIMEOUT),
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+)
+
+# Errors that mean Stripe itself is unreachable or failing. Card declines and
+# invalid requests are answered normally and do not count against the breaker.
+STRIPE_OUTAGE_ERRORS = (stripe.error.APIConnectionError, stripe.error.APIError)
+
+# Upper bound on one Stripe call, set above the SDK's own budget (every
+# attempt timing out plus the capped backoff between them) so wait_for
+# doesn't abandon a thread that is still about to create something. A
+# Retry-After header can stretch the SDK past this; the pending
+# Transaction/Payout row and its idempotency key cover that case.
+STRIPE_CALL_TIMEOUT = (
+    (stripe.max_network_retries + 1) * (STRIPE_CONNECT_TIMEOUT + STRIPE_READ_TIMEOUT)
+    + stripe.max_network_retries * stripe.HTTPClient.MAX_DELAY
+    + 5.0
+)
+
+BALANCE_CACHE_TTL = 900  # Balances cached in Redis for 15 minutes
+BALANCE_LOCAL_TTL = 30.0  # Per-process copy; short because other workers can't invalidate it
+
+# feed type -> (fee in basis points, minimum fee in fils)
+_FEE_TABLE: dict[FeedType, tuple[int, int]] = {
+    FeedType.DISCOVER: (1500, 500),  # 15%, min AED 5
+    FeedType.COMMUNITY: (500, 200),  # 5%, min AED 2
+}
+
+_CENT = Decimal("0.01")
+
+_stripe_breaker = CircuitBreaker("stripe", failure_threshold=5, reset_timeout=30.0)
+
+# account_id -> (expires_at, balance)
+_local_balances: dict[str, tuple[float, dict[str, Any]]] = {}
+
+T = TypeVar("T")
+
+
+async def _stripe_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Stripe SDK call on a worker thread.
+
+    The stripe SDK uses synchronous HTTP; calling it directly from an async
+    handler would block the event loop for the whole API round trip. Calls go
+    through the shared Stripe circuit breaker and are bounded by
+    STRIPE_CALL_TIMEOUT; timeouts count as breaker failures.
+
+    Raises:
+        CircuitOpenError: If Stripe has been failing and the circuit is open
+        TimeoutError: If the call takes longer than STRIPE_CALL_TIMEOUT
+    """
+    if not _stripe_breaker.allow():
+        raise CircuitOpenError(_stripe_breaker.name, _stripe_breaker.retry_after())
+    try:
+        result = await asyncio.wait_for(
+            asyncio.to_thread(func, *args, **kwargs),
+            timeout=STRIPE_CALL_TIMEOUT,
+        )
+    except TimeoutError:
+        logger.error(f"Stripe call {getattr(func, '__qualname__', func)} timed out after {STRIPE_CALL_TIMEOUT}s")
+        _stripe_breaker.record_failure()
+        raise
+    except STRIPE_OUTAGE_ERRORS:
+        _stripe_breaker.record_failure()
+        raise
+    except stripe.error.StripeError:
+        _stripe_breaker.record_success()
+        raise
+    except Exception:
+        _stripe_breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled while waiting on the thread; free the half-open trial slot
+        _stripe_breaker.release()
+        raise
+    _stripe_breaker.record_success()
+    return result
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Convert a currency amount to Stripe's smallest unit, rounding half up.
+
+    ``int(amount * 100)`` truncates, so Decimal("10.005") would become 1000.
+    """
+    return int(amount.quantize(_CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def _from_cents(amount: int) -> Decimal:
+    """Convert a Stripe smallest-unit amount to an exact Decimal."""
+    return Decimal(amount).scaleb(-2)
+
+
+async def _cache_balance(seller_account_id: str, balance: dict[str, Any]) -> None:
+    """Store a balance in the local and Redis caches (best effort)."""
+    _local_balances[seller_account_id] = (time.monotonic() + BALANCE_LOCAL_TTL, balance)
+    try:
+        await get_redis_manager().set(
+            CacheKeys.stripe_balance(seller_account_id),
+            {
+                "available_balance": str(balance["available_balance"]),
+                "pending_balance": str(balance["pending_balance"]),
+                "currency": balance["currency"],
+            },
+            ttl=BALANCE_CACHE_TTL,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache Stripe balance for {seller_account_id}: {e}")
+
+
+async def _get_cached_balance(seller_account_id: str) -> dict[str, Any] | None:
+    """Return the cached balance from process memory or Redis, or None."""
+    local = _local_balances.get(seller_account_id)
+    if local is not None:
+        if local[0] > time.monotonic():
+            return local[1]
+        del _local_balances[seller_account_id]
+
+    try:
+        cached = await get_redis_manager().get(CacheKeys.stripe_balance(seller_account_id))
+    except Exception as e:
+        logger.warning(f"Failed to read cached Stripe balance for {seller_account_id}: {e}")
+        return None
+    if not isinstance(cached, dict):
+        return None
+    balance = {
+        "available_balance": Decimal(cached["available_balance"]),
+        "pending_balance": Decimal(cached["pending_balance"]),
+        "currency": cached["currency"],
+    }
+    _local_balances[seller_account_id] = (time.monotonic() + BALANCE_LOCAL_TTL, balance)
+    return balance
 
 
 class PaymentService:
@@ -36,7 +188,9 @@ class PaymentService:
         Raises:
             stripe.error.StripeError: If customer creation fails
         """
-        customer = stripe.Customer.create(
+        customer = await _stripe_call(
+            stripe.Customer.create,
+            idempotency_key=f"customer:{user.id}",
             email=user.email,
             name=user.full_name,
             phone=user.phone,
@@ -60,7 +214,9 @@ class PaymentService:
         Raises:
             stripe.error.StripeError: If account creation fails
         """
-        account = stripe.Account.create(
+        account = await _stripe_call(
+            stripe.Account.create,
+            idempotency_key=f"connect:{user.id}",
             type="express",
             country="AE",  # United Arab Emirates
             email=user.email,
@@ -76,7 +232,8 @@ class PaymentService:
         )
 
         # Generate account onboarding link
-        account_link = stripe.AccountLink.create(
+        account_link = await _stripe_call(
+            stripe.AccountLink.create,
             account=account.id,
             refresh_url=f"https://soukloop.com/seller/connect/refresh",
             return_url=f"https://soukloop.com/seller/connect/success",
@@ -89,7 +246,7 @@ class PaymentService:
         }
 
     @staticmethod
-    async def calculate_platform_fee(amount: Decimal, feed_type: FeedType) -> Decimal:
+    def calculate_platform_fee(amount: Decimal, feed_type: FeedType) -> Decimal:
         """Calculate platform fee based on amount and feed type.
 
         Fee structure:
@@ -101,17 +258,26 @@ class PaymentService:
             feed_type: Type of feed (discover or community)
 
         Returns:
-            Platform fee amount
+            Platform fee amount, rounded to the cent
         """
-        if feed_type == FeedType.DISCOVER:
-            fee_percentage = Decimal("0.15")  # 15%
-            min_fee = Decimal("5.0")
-        else:  # COMMUNITY
-            fee_percentage = Decimal("0.05")  # 5%
-            min_fee = Decimal("2.0")
+        return _from_cents(PaymentService.calculate_platform_fee_cents(_to_cents(amount), feed_type))
+
+    @staticmethod
+    def calculate_platform_fee_cents(amount_cents: int, feed_type: FeedType) -> int:
+        """Calculate platform fee in the smallest currency unit.
+
+        Integer-only counterpart of ``calculate_platform_fee``; the percentage
+        is rounded half up to the nearest cent.
 
-        calculated_fee = amount * fee_percentage
-        return max(calculated_fee, min_fee)
+        Args:
+            amount_cents: Transaction amount in cents (fils)
+            feed_type: Type of feed (discover or community)
+
+        Returns:
+            Platform fee in cents (fils)
+        """
+        fee_bps, min_fee_cents = _FEE_TABLE[feed_type]
+        return max((amount_cents * fee_bps + 5000) // 10000, min_fee_cents)
 
     @staticmethod
     async def create_payment_intent(
@@ -121,6 +287,7 @@ class PaymentService:
         product_id: str,
         seller_account_id: str,
         platform_fee: Decimal,
+        transaction_id: str,
     ) -> dict[str, Any]:
         """Create a Stripe PaymentIntent with platform fee.
 
@@ -131,6 +298,7 @@ class PaymentService:
             product_id: Product UUID
             seller_account_id: Seller's Stripe Connect account ID
             platform_fee: Platform fee amount
+            transaction_id: UUID of the Transaction row this intent pays for
 
         Returns:
             Dictionary with payment intent details including client_secret
@@ -139,10 +307,15 @@ class PaymentService:
             stripe.error.StripeError: If payment intent creation fails
         """
         # Convert Decimal to cents (Stripe uses smallest currency unit)
-        amount_cents = int(amount * 100)
-        platform_fee_cents = int(platform_fee * 100)
-
-        payment_intent = stripe.PaymentIntent.create(
+        amount_cents = _to_cents(amount)
+        platform_fee_cents = _to_cents(platform_fee)
+
+        payment_intent = await _stripe_call(
+            stripe.PaymentIntent.create,
+            # Keyed on the transaction row, so a retried call for this
+            # transaction reuses its intent while a new purchase of the same
+            # product at the same price still gets its own
+            idempotency_key=f"pi:{transaction_id}",
             amount=amount_cents,
             currency=currency.lower(),
             customer=customer_id,
@@ -152,6 +325,7 @@ class PaymentService:
             },
             metadata={
                 "product_id": product_id,
+                "transaction_id": transaction_id,
             },
             automatic_payment_methods={
                 "enabled": True,
@@ -166,6 +340,29 @@ class PaymentService:
             "platform_fee": platform_fee,
         }
 
+    @staticmethod
+    async def retrieve_payment_intent(payment_intent_id: str) -> dict[str, Any]:
+        """Fetch an existing PaymentIntent in the shape create_payment_intent returns.
+
+        Args:
+            payment_intent_id: Stripe payment intent ID
+
+        Returns:
+            Dictionary with payment intent details including client_secret
+
+        Raises:
+            stripe.error.StripeError: If retrieval fails
+        """
+        payment_intent = await _stripe_call(stripe.PaymentIntent.retrieve, payment_intent_id)
+
+        return {
+            "payment_intent_id": payment_intent.id,
+            "client_secret": payment_intent.client_secret,
+            "status": payment_intent.status,
+            "amount": _from_cents(payment_intent.amount),
+            "platform_fee": _from_cents(payment_intent.application_fee_amount or 0),
+        }
+
     @staticmethod
     async def capture_payment(payment_intent_id: str) -> dict[str, Any]:
         """Capture a payment intent.
@@ -179,16 +376,16 @@ class PaymentService:
         Raises:
             stripe.error.StripeError: If capture fails
         """
-        payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+        payment_intent = await _stripe_call(stripe.PaymentIntent.retrieve, payment_intent_id)
 
         # If payment intent requires capture (not automatic)
         if payment_intent.status == "requires_capture":
-            payment_intent = stripe.PaymentIntent.capture(payment_intent_id)
+            payment_intent = await _stripe_call(stripe.PaymentIntent.capture, payment_intent_id)
 
         return {
             "payment_intent_id": payment_intent.id,
             "status": payment_intent.status,
-            "amount": Decimal(str(payment_intent.amount / 100)),
+            "amount": _from_cents(payment_intent.amount),
             "currency": payment_intent.currency.upper(),
             "charge_id": payment_intent.latest_charge,
         }
@@ -207,7 +404,9 @@ class PaymentService:
         Raises:
             stripe.error.StripeError: If refund creation fails
         """
-        refund = stripe.Refund.create(
+        refund = await _stripe_call(
+            stripe.Refund.create,
+            idempotency_key=f"refund:{payment_intent_id}",
             payment_intent=payment_intent_id,
             reason=reason,
             refund_application_fee=True,  # Also refund the platform fee
@@ -217,17 +416,20 @@ class PaymentService:
         return {
             "refund_id": refund.id,
             "status": refund.status,
-            "amount": Decimal(str(refund.amount / 100)),
+            "amount": _from_cents(refund.amount),
             "currency": refund.currency.upper(),
         }
 
     @staticmethod
-    async def create_payout(seller_account_id: str, amount: Decimal, currency: str = "AED") -> dict[str, Any]:
+    async def create_payout(
+        seller_account_id: str, amount: Decimal, payout_id: str, currency: str = "AED"
+    ) -> dict[str, Any]:
         """Create a payout to seller's bank account.
 
         Args:
             seller_account_id: Seller's Stripe Connect account ID
             amount: Payout amount
+            payout_id: UUID of the Payout row this payout is recorded as
             currency: Currency code
 
         Returns:
@@ -237,54 +439,88 @@ class PaymentService:
             stripe.error.StripeError: If payout creation fails
         """
         # Convert to cents
-        amount_cents = int(amount * 100)
+        amount_cents = _to_cents(amount)
 
         # Create payout on the connected account
-        payout = stripe.Payout.create(
+        payout = await _stripe_call(
+            stripe.Payout.create,
+            # Keyed on the payout row, so a retried call reuses this payout
+            # while a later payout of the same amount is still created
+            idempotency_key=f"payout:{payout_id}",
             amount=amount_cents,
             currency=currency.lower(),
             stripe_account=seller_account_id,
+            # Lets the payout webhooks find the row if this call times out
+            metadata={"payout_id": payout_id},
         )
 
+        await PaymentService.invalidate_balance_cache(seller_account_id)
+
         return {
             "payout_id": payout.id,
             "status": payout.status,
-            "amount": Decimal(str(payout.amount / 100)),
+            "amount": _from_cents(payout.amount),
             "currency": payout.currency.upper(),
             "arrival_date": payout.arrival_date,
         }
 
     @staticmethod
-    async def get_account_balance(seller_account_id: str) -> dict[str, Any]:
+    async def get_account_balance(seller_account_id: str, use_cache: bool = True) -> dict[str, Any]:
         """Get balance for a connected account.
 
+        Balances are cached for 15 minutes (in process memory, then Redis) and
+        invalidated by payouts and balance/payout webhooks. While the Stripe
+        circuit is open, the cached balance is returned even when
+        ``use_cache`` is False.
+
         Args:
             seller_account_id: Seller's Stripe Connect account ID
+            use_cache: Set False to force a fresh read (e.g. before a payout)
 
         Returns:
             Balance information
 
         Raises:
             stripe.error.StripeError: If balance retrieval fails
+            CircuitOpenError: If the circuit is open and no cached balance exists
         """
-        balance = stripe.Balance.retrieve(stripe_account=seller_account_id)
-
-        available_balance = Decimal("0")
-        pending_balance = Decimal("0")
-
-        for balance_item in balance.available:
-            if balance_item.currency.upper() == "AED":
-                available_balance = Decimal(str(balance_item.amount / 100))
-
-        for balance_item in balance.pending:
-            if balance_item.currency.upper() == "AED":
-                pending_balance = Decimal(str(balance_item.amount / 100))
-
-        return {
-            "available_balance": available_balance,
-            "pending_balance": pending_balance,
+        if use_cache:
+            cached = await _get_cached_balance(seller_account_id)
+            if cached is not None:
+                return cached
+
+        try:
+            balance = await _stripe_call(stripe.Balance.retrieve, stripe_account=seller_account_id)
+        except CircuitOpenError:
+            cached = await _get_cached_balance(seller_account_id)
+            if cached is None:
+                raise
+            logger.warning(f"Stripe circuit open, serving cached balance for {seller_account_id}")
+            return cached
+
+        available = {item.currency.upper(): item.amount for item in balance.available}
+        pending = {item.currency.upper(): item.amount for item in balance.pending}
+
+        result = {
+            "available_balance": _from_cents(available.get("AED", 0)),
+            "pending_balance": _from_cents(pending.get("AED", 0)),
             "currency": "AED",
         }
+        await _cache_balance(seller_account_id, result)
+        return result
+
+    @staticmethod
+    async def invalidate_balance_cache(seller_account_id: str) -> None:
+        """Drop the cached balance for a connected account.
+
+        Args:
+            seller_account_id: Seller's Stripe Connect account ID
+        """
+        _local_balances.pop(seller_account_id, None)
+        try:
+            await get_redis_manager().delete(CacheKeys.stripe_balance(seller_account_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached Stripe balance for {seller_account_id}: {e}")
 
     @staticmethod
     async def verify_webhook_signature(payload: bytes, signature: str) -> dict[str, Any]:
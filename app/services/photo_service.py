@@ -8,17 +8,28 @@ Usage:
 
     service = PhotoService()
     result = await service.upload_photo(file, user_id="123")
-    # Returns: {file_url, file_key, file_size, content_type, sha1}
+    # Returns: {file_url, file_key, file_size, content_type, blake3}
 """
 
-import hashlib
-import uuid
+import asyncio
+import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import BinaryIO, Optional, Dict
+from typing import BinaryIO, Optional, Dict, List, Tuple
+
+from blake3 import blake3
 from fastapi import UploadFile, HTTPException
+from uuid_utils import uuid7
 
 from app.storage.b2_config import B2Config
 
+logger = logging.getLogger(__name__)
+
+# (file_key, expiration) -> (signed_at, url), shared by all PhotoService
+# instances (one is created per request)
+_presigned_url_cache: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+
 
 class PhotoService:
     """Service for handling photo uploads to Backblaze B2"""
@@ -26,6 +37,19 @@ class PhotoService:
     # Max photo size: 10MB
     MAX_PHOTO_SIZE = 10 * 1024 * 1024
 
+    # Read size when hashing the spooled upload
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    # Max cached presigned URLs; a URL is reused for the first 10% of its
+    # lifetime so callers always get at least 90% of the requested validity
+    PRESIGNED_URL_CACHE_SIZE = 10000
+    PRESIGNED_URL_REUSE_FRACTION = 0.1
+
+    # Upper bounds (seconds) on B2 operations run in worker threads. Uploads
+    # get longer because a 10MB body can legitimately take a while to send.
+    B2_CALL_TIMEOUT = 15
+    B2_UPLOAD_TIMEOUT = 60
+
     def __init__(self):
         """Initialize photo service with B2 S3 client"""
         self.s3_client = B2Config.get_s3_client()
@@ -43,14 +67,15 @@ class PhotoService:
         Returns:
             str: Unique S3 key path
 
+        Keys use a UUIDv7, which is time-ordered (keys sort by upload time,
+        even within the same second) and has no truncation collisions.
+
         Example:
-            "users/123/photos/20250120_143022_a1b2c3d4.jpg"
+            "users/123/photos/0194d4a0-6c2e-7b3f-9a1d-2f6e8c4b5a7d.jpg"
         """
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        unique_id = str(uuid.uuid4())[:8]
         extension = filename.split('.')[-1].lower() if '.' in filename else 'jpg'
 
-        return f"users/{user_id}/photos/{timestamp}_{unique_id}.{extension}"
+        return f"users/{user_id}/photos/{uuid7()}.{extension}"
 
     async def upload_photo(
         self,
@@ -72,23 +97,12 @@ class PhotoService:
                 - file_key: S3 object key
                 - file_size: Size in bytes
                 - content_type: MIME type
-                - sha1: SHA1 hash of file content
+                - blake3: BLAKE3 hash of file content
 
         Raises:
             HTTPException: If upload fails or file too large
         """
         try:
-            # Read file content
-            content = await file.read()
-            file_size = len(content)
-
-            # Validate file size (max 10MB for photos)
-            if file_size > self.MAX_PHOTO_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Photo size exceeds {self.MAX_PHOTO_SIZE / (1024*1024)}MB limit"
-                )
-
             # Detect content type
             if not content_type:
                 content_type = file.content_type or 'image/jpeg'
@@ -96,23 +110,21 @@ class PhotoService:
             # Generate unique key
             file_key = self.generate_photo_key(user_id, file.filename or 'photo.jpg')
 
-            # Calculate SHA1 checksum for integrity
-            sha1_hash = hashlib.sha1(content).hexdigest()
-
-            # Upload to B2
-            self.s3_client.put_object(
-                Bucket=self.bucket_photos,
-                Key=file_key,
-                Body=content,
-                ContentType=content_type,
-                Metadata={
+            # Hash and upload in a worker thread so the event loop isn't
+            # blocked by hashing up to 10MB or by boto3's socket I/O.
+            # The spooled upload is streamed, never read into memory whole.
+            checksum, file_size = await self._run_blocking(
+                'upload_photo',
+                self.B2_UPLOAD_TIMEOUT,
+                self._put_photo,
+                file.file,
+                file_key,
+                content_type,
+                {
                     'user_id': user_id,
                     'original_filename': file.filename or 'unknown',
                     'upload_timestamp': datetime.utcnow().isoformat(),
-                    'sha1': sha1_hash
                 },
-                # Server-side encryption
-                ServerSideEncryption='AES256'
             )
 
             # Generate public URL
@@ -123,7 +135,7 @@ class PhotoService:
                 'file_key': file_key,
                 'file_size': file_size,
                 'content_type': content_type,
-                'sha1': sha1_hash
+                'blake3': checksum
             }
 
         except HTTPException:
@@ -136,6 +148,71 @@ class PhotoService:
                 detail=f"Failed to upload photo: {str(e)}"
             )
 
+    async def _run_blocking(self, operation: str, timeout: float, func, *args, **kwargs):
+        """
+        Run a blocking B2 call in a worker thread with an overall timeout
+
+        Raises:
+            TimeoutError: If the call doesn't finish within `timeout` seconds
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(func, *args, **kwargs),
+                timeout=timeout
+            )
+        except TimeoutError:
+            logger.error(f"B2 {operation} timed out after {timeout}s")
+            raise
+
+    def _put_photo(
+        self,
+        fileobj: BinaryIO,
+        file_key: str,
+        content_type: str,
+        metadata: Dict[str, str]
+    ) -> Tuple[str, int]:
+        """
+        Checksum and stream-upload a photo (blocking; run via asyncio.to_thread)
+
+        Returns:
+            tuple: (BLAKE3 hash of the content, size in bytes)
+
+        Raises:
+            HTTPException: If the file exceeds MAX_PHOTO_SIZE
+        """
+        # Integrity checksum only (nothing is signed), so use BLAKE3 rather
+        # than SHA1; enforce the size limit as we go so oversized uploads are
+        # rejected without a full pass
+        hasher = blake3()
+        file_size = 0
+        fileobj.seek(0)
+        while chunk := fileobj.read(self.READ_CHUNK_SIZE):
+            file_size += len(chunk)
+            if file_size > self.MAX_PHOTO_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Photo size exceeds {self.MAX_PHOTO_SIZE / (1024*1024)}MB limit"
+                )
+            hasher.update(chunk)
+        checksum = hasher.hexdigest()
+
+        # upload_fileobj reads in parts (multipart above 8MB), so memory
+        # stays bounded by the part size rather than the file size
+        fileobj.seek(0)
+        self.s3_client.upload_fileobj(
+            fileobj,
+            self.bucket_photos,
+            file_key,
+            ExtraArgs={
+                'ContentType': content_type,
+                'Metadata': {**metadata, 'blake3': checksum},
+                # Server-side encryption
+                'ServerSideEncryption': 'AES256'
+            }
+        )
+
+        return checksum, file_size
+
     def _generate_file_url(self, file_key: str) -> str:
         """
         Generate public URL for file
@@ -168,17 +245,48 @@ class PhotoService:
         Raises:
             HTTPException: If deletion fails
         """
+        results = await self.delete_photos([file_key])
+        if not results[file_key]:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete photo: {file_key}"
+            )
+        return True
+
+    async def delete_photos(self, file_keys: List[str]) -> Dict[str, bool]:
+        """
+        Delete many photos from Backblaze B2
+
+        Uses DeleteObjects, so N photos cost ceil(N / 1000) requests
+        instead of N.
+
+        Args:
+            file_keys: S3 object keys to delete
+
+        Returns:
+            dict: Key -> True if deleted, False if B2 reported an error
+
+        Raises:
+            HTTPException: If a delete request fails
+        """
+        # Drop cached presigned URLs for the deleted keys
+        deleted = set(file_keys)
+        for cache_key in [k for k in _presigned_url_cache if k[0] in deleted]:
+            del _presigned_url_cache[cache_key]
+
         try:
-            self.s3_client.delete_object(
-                Bucket=self.bucket_photos,
-                Key=file_key
+            return await self._run_blocking(
+                'delete_photos',
+                self.B2_CALL_TIMEOUT,
+                B2Config.delete_objects,
+                self.bucket_photos,
+                file_keys
             )
-            return True
 
         except Exception as e:
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to delete photo: {str(e)}"
+                detail=f"Failed to delete photos: {str(e)}"
             )
 
     def generate_presigned_url(
@@ -190,6 +298,8 @@ class PhotoService:
         Generate pre-signed URL for temporary access
 
         Useful for private files that need temporary public access.
+        Signed URLs are cached and reused for the first 10% of their
+        lifetime, so feeds requesting the same key repeatedly don't re-sign.
 
         Args:
             file_key: S3 object key
@@ -202,8 +312,17 @@ class PhotoService:
             url = service.generate_presigned_url('users/123/photo.jpg', 7200)
             # URL expires after 2 hours
         """
+        cache_key = (file_key, expiration)
+        now = time.monotonic()
+        cached = _presigned_url_cache.get(cache_key)
+        if cached is not None:
+            signed_at, url = cached
+            if now - signed_at < expiration * self.PRESIGNED_URL_REUSE_FRACTION:
+                _presigned_url_cache.move_to_end(cache_key)
+                return url
+
         try:
-            return self.s3_client.generate_presigned_url(
+            url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={
                     'Bucket': self.bucket_photos,
@@ -218,7 +337,14 @@ class PhotoService:
                 detail=f"Failed to generate presigned URL: {str(e)}"
             )
 
-    def get_photo_metadata(self, file_key: str) -> Dict[str, any]:
+        _presigned_url_cache[cache_key] = (now, url)
+        _presigned_url_cache.move_to_end(cache_key)
+        if len(_presigned_url_cache) > self.PRESIGNED_URL_CACHE_SIZE:
+            _presigned_url_cache.popitem(last=False)
+
+        return url
+
+    async def get_photo_metadata(self, file_key: str) -> Dict[str, any]:
         """
         Get metadata for a photo
 
@@ -232,7 +358,10 @@ class PhotoService:
             HTTPException: If photo not found or error occurs
         """
         try:
-            response = self.s3_client.head_object(
+            response = await self._run_blocking(
+                'get_photo_metadata',
+                self.B2_CALL_TIMEOUT,
+                self.s3_client.head_object,
                 Bucket=self.bucket_photos,
                 Key=file_key
             )
@@ -9,18 +9,23 @@ Supports:
 - Automatic upload to B2 storage
 """
 
+import asyncio
+import contextlib
 import logging
 import os
-import subprocess
 import tempfile
 import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Union
 
 from app.storage.b2_config import B2Config
 
 logger = logging.getLogger(__name__)
 
+# ffmpeg is CPU-bound; don't run more extractions at once than there are cores
+_ffmpeg_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
 
 class ThumbnailService:
     """Service for generating video thumbnails."""
@@ -33,20 +38,30 @@ class ThumbnailService:
     # Thumbnail positions (which frame to extract)
     THUMBNAIL_POSITION = "00:00:01"  # 1 second into video (skip intro)
 
+    # Scrubber preview strip settings
+    PREVIEW_INTERVAL = 5.0  # Seconds between preview frames
+    PREVIEW_WIDTH = 320
+    PREVIEW_UPLOAD_CONCURRENCY = 8
+
+    # JPEG start/end-of-image markers, used to split an MJPEG pipe into frames
+    _JPEG_SOI = b'\xff\xd8'
+    _JPEG_EOI = b'\xff\xd9'
+
     def __init__(self):
         """Initialize thumbnail service with B2 client."""
         self.s3_client = B2Config.get_s3_client()
         self.bucket_thumbnails = B2Config.BUCKET_THUMBNAILS
 
-    def generate_thumbnail(
+    async def generate_thumbnail(
         self,
         video_path: str,
         output_path: Optional[str] = None,
         width: int = DEFAULT_WIDTH,
         height: int = DEFAULT_HEIGHT,
         position: str = THUMBNAIL_POSITION,
-        quality: int = DEFAULT_QUALITY
-    ) -> str:
+        quality: int = DEFAULT_QUALITY,
+        return_bytes: bool = False
+    ) -> Union[str, bytes]:
         """
         Generate a thumbnail from a video file.
 
@@ -57,65 +72,78 @@ class ThumbnailService:
             height: Thumbnail height in pixels (use -1 for auto aspect ratio)
             position: Timestamp to extract (e.g., "00:00:01" for 1 second)
             quality: JPEG quality (1=best, 31=worst)
+            return_bytes: Return the JPEG bytes from ffmpeg's stdout instead
+                of writing a file (output_path is ignored)
 
         Returns:
-            str: Path to generated thumbnail file
+            str | bytes: Path to generated thumbnail file, or the JPEG bytes
+                if return_bytes is True
 
         Raises:
             RuntimeError: If FFmpeg fails to generate thumbnail
         """
-        # Auto-generate output path if not provided
-        if output_path is None:
-            temp_dir = tempfile.gettempdir()
-            thumbnail_filename = f"thumb_{uuid.uuid4().hex[:8]}.jpg"
-            output_path = os.path.join(temp_dir, thumbnail_filename)
+        # FFmpeg command to extract frame
+        # -ss: Seek to position (before -i for faster processing)
+        # -i: Input file
+        # -vframes 1: Extract only 1 frame
+        # -vf scale: Resize frame
+        # -q:v: JPEG quality
+        cmd = [
+            'ffmpeg',
+            '-ss', position,  # Seek to timestamp
+            '-i', video_path,  # Input video
+            '-vframes', '1',  # Extract 1 frame
+            '-vf', f'scale={width}:{height}',  # Resize
+            '-q:v', str(quality),  # Quality
+        ]
 
+        if return_bytes:
+            # Write the JPEG to stdout; no temp file
+            cmd += ['-f', 'image2', '-c:v', 'mjpeg', 'pipe:1']
+        else:
+            # Auto-generate output path if not provided
+            if output_path is None:
+                temp_dir = tempfile.gettempdir()
+                thumbnail_filename = f"thumb_{uuid.uuid4().hex[:8]}.jpg"
+                output_path = os.path.join(temp_dir, thumbnail_filename)
+            cmd += ['-y', output_path]  # Overwrite output file
+
+        # Run FFmpeg
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         try:
-            # FFmpeg command to extract frame
-            # -ss: Seek to position (before -i for faster processing)
-            # -i: Input file
-            # -vframes 1: Extract only 1 frame
-            # -vf scale: Resize frame
-            # -q:v: JPEG quality
-            cmd = [
-                'ffmpeg',
-                '-ss', position,  # Seek to timestamp
-                '-i', video_path,  # Input video
-                '-vframes', '1',  # Extract 1 frame
-                '-vf', f'scale={width}:{height}',  # Resize
-                '-q:v', str(quality),  # Quality
-                '-y',  # Overwrite output file
-                output_path
-            ]
-
-            # Run FFmpeg
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(),
                 timeout=30  # 30 second timeout
             )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error("FFmpeg timeout while generating thumbnail")
+            raise RuntimeError("Thumbnail generation timed out")
 
-            if result.returncode != 0:
-                error_msg = result.stderr.decode('utf-8')
-                logger.error(f"FFmpeg failed: {error_msg}")
-                raise RuntimeError(f"Failed to generate thumbnail: {error_msg}")
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', 'replace')
+            logger.error(f"FFmpeg failed: {error_msg}")
+            raise RuntimeError(f"Failed to generate thumbnail: {error_msg}")
 
-            # Verify thumbnail was created
-            if not os.path.exists(output_path):
-                raise RuntimeError("Thumbnail file was not created")
+        if return_bytes:
+            if not stdout:
+                raise RuntimeError("FFmpeg produced no thumbnail data")
+            logger.info(f"✅ Thumbnail generated ({len(stdout)} bytes)")
+            return stdout
 
-            logger.info(f"✅ Thumbnail generated: {output_path}")
-            return output_path
+        # Verify thumbnail was created
+        if not os.path.exists(output_path):
+            raise RuntimeError("Thumbnail file was not created")
 
-        except subprocess.TimeoutExpired:
-            logger.error("FFmpeg timeout while generating thumbnail")
-            raise RuntimeError("Thumbnail generation timed out")
-        except Exception as e:
-            logger.error(f"Error generating thumbnail: {e}")
-            raise
+        logger.info(f"✅ Thumbnail generated: {output_path}")
+        return output_path
 
-    def generate_and_upload_thumbnail(
+    async def generate_and_upload_thumbnail(
         self,
         video_path: str,
         user_id: str,
@@ -124,6 +152,9 @@ class ThumbnailService:
         """
         Generate thumbnail and upload to B2 storage.
 
+        The JPEG is piped from ffmpeg straight into the upload; nothing is
+        written to disk.
+
         Args:
             video_path: Path to video file
             user_id: User ID (for organizing thumbnails)
@@ -133,34 +164,29 @@ class ThumbnailService:
             tuple: (thumbnail_url, thumbnail_key)
 
         Example:
-            url, key = service.generate_and_upload_thumbnail(
+            url, key = await service.generate_and_upload_thumbnail(
                 '/tmp/video.mp4',
                 'user123',
                 'my_video.mp4'
             )
         """
-        temp_thumbnail = None
-
         try:
-            # Generate thumbnail locally
+            # Generate thumbnail in memory
             logger.info(f"📸 Generating thumbnail for {video_filename}...")
-            temp_thumbnail = self.generate_thumbnail(video_path)
+            thumbnail_data = await self.generate_thumbnail(video_path, return_bytes=True)
 
             # Generate unique thumbnail filename
             base_name = Path(video_filename).stem
             thumbnail_filename = f"{base_name}_thumb_{uuid.uuid4().hex[:8]}.jpg"
             thumbnail_key = f"thumbnails/{user_id}/{thumbnail_filename}"
 
-            # Read thumbnail file
-            with open(temp_thumbnail, 'rb') as f:
-                thumbnail_data = f.read()
-
             thumbnail_size = len(thumbnail_data)
             logger.info(f"   Thumbnail size: {thumbnail_size / 1024:.2f} KB")
 
             # Upload to B2
             logger.info(f"☁️  Uploading thumbnail to B2...")
-            self.s3_client.put_object(
+            await asyncio.to_thread(
+                self.s3_client.put_object,
                 Bucket=self.bucket_thumbnails,
                 Key=thumbnail_key,
                 Body=thumbnail_data,
@@ -185,16 +211,23 @@ class ThumbnailService:
             logger.error(f"❌ Failed to generate and upload thumbnail: {e}")
             raise
 
-        finally:
-            # Cleanup temporary thumbnail file
-            if temp_thumbnail and os.path.exists(temp_thumbnail):
-                try:
-                    os.remove(temp_thumbnail)
-                    logger.debug(f"🧹 Cleaned up temp thumbnail: {temp_thumbnail}")
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup temp file: {e}")
+    async def delete_thumbnails(self, thumbnail_keys: List[str]) -> Dict[str, bool]:
+        """
+        Delete thumbnails from B2 in batches of up to 1000 keys.
+
+        Args:
+            thumbnail_keys: Thumbnail object keys to delete
 
-    def generate_multiple_thumbnails(
+        Returns:
+            dict: Key -> True if deleted, False if B2 reported an error
+        """
+        return await asyncio.to_thread(
+            B2Config.delete_objects,
+            self.bucket_thumbnails,
+            thumbnail_keys
+        )
+
+    async def generate_multiple_thumbnails(
         self,
         video_path: str,
         count: int = 3,
@@ -203,39 +236,204 @@ class ThumbnailService:
         """
         Generate multiple thumbnails from a video (for preview gallery).
 
+        All frames are extracted by a single ffmpeg process in one decode
+        pass, rather than one process (and seek) per thumbnail.
+
         Args:
-            video_path: Path to video file
+            video_path: Path to input video file
             count: Number of thumbnails to generate
             interval: Time interval between thumbnails (auto-calculated if None)
 
         Returns:
-            list[str]: Paths to generated thumbnail files
+            list[str]: Paths to generated thumbnail files, in timestamp order
+
+        Raises:
+            RuntimeError: If FFmpeg fails or times out
 
         Example:
             # Generate 3 evenly-spaced thumbnails
-            thumbnails = service.generate_multiple_thumbnails('/tmp/video.mp4', count=3)
+            thumbnails = await service.generate_multiple_thumbnails('/tmp/video.mp4', count=3)
         """
-        # Get video duration first
-        duration = self._get_video_duration(video_path)
-
         if interval is None:
             # Distribute thumbnails evenly across video
+            duration = await self._get_video_duration(video_path)
             interval = duration / (count + 1)
 
-        thumbnails = []
-        for i in range(1, count + 1):
-            position_seconds = i * interval
-            position = self._seconds_to_timestamp(position_seconds)
+        # Select the first frame at or after each position; prev_selected_t
+        # is NAN until the first frame has been picked
+        select_expr = '+'.join(
+            f"gte(t,{position:.3f})*(isnan(prev_selected_t)+lt(prev_selected_t,{position:.3f}))"
+            for position in (i * interval for i in range(1, count + 1))
+        )
+
+        output_dir = tempfile.mkdtemp(prefix='thumbs_')
+        cmd = [
+            'ffmpeg',
+            '-i', video_path,
+            '-vf', f"select='gt({select_expr},0)',scale={self.DEFAULT_WIDTH}:{self.DEFAULT_HEIGHT}",
+            '-vsync', 'vfr',  # Only emit the selected frames
+            '-frames:v', str(count),  # Stop decoding after the last one
+            '-q:v', str(self.DEFAULT_QUALITY),
+            '-y',
+            os.path.join(output_dir, 'thumb_%03d.jpg')
+        ]
+
+        async with _ffmpeg_semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error("FFmpeg timeout while generating thumbnails")
+                raise RuntimeError("Thumbnail generation timed out")
+
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', 'replace')
+            logger.error(f"FFmpeg failed: {error_msg}")
+            raise RuntimeError(f"Failed to generate thumbnails: {error_msg}")
+
+        return sorted(str(path) for path in Path(output_dir).glob('thumb_*.jpg'))
+
+    async def iter_preview_frames(
+        self,
+        video_path: str,
+        interval: float = PREVIEW_INTERVAL,
+        width: int = PREVIEW_WIDTH
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield one JPEG every ``interval`` seconds of video, from one ffmpeg.
+
+        ffmpeg decodes the video once and writes the frames back to back as
+        MJPEG on stdout (image2pipe); frames are split on the JPEG SOI/EOI
+        markers and yielded as soon as each one is complete. A slow consumer
+        applies backpressure through the pipe.
+
+        Args:
+            video_path: Path to input video file
+            interval: Seconds between frames
+            width: Frame width in pixels (height keeps the aspect ratio)
 
-            thumbnail_path = self.generate_thumbnail(
-                video_path,
-                position=position
+        Yields:
+            bytes: JPEG data of each frame, in timestamp order
+
+        Raises:
+            RuntimeError: If FFmpeg fails
+        """
+        cmd = [
+            'ffmpeg',
+            '-v', 'error',  # Keep stderr small; it's only read at the end
+            '-i', video_path,
+            '-vf', f'fps=1/{interval},scale={width}:-2',
+            '-q:v', str(self.DEFAULT_QUALITY),
+            '-f', 'image2pipe',
+            '-c:v', 'mjpeg',
+            'pipe:1'
+        ]
+
+        async with _ffmpeg_semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
-            thumbnails.append(thumbnail_path)
+            try:
+                buffer = bytearray()
+                search_from = 0
+                while chunk := await process.stdout.read(64 * 1024):
+                    buffer += chunk
+                    while (end := buffer.find(self._JPEG_EOI, search_from)) != -1:
+                        start = buffer.find(self._JPEG_SOI)
+                        yield bytes(buffer[start:end + 2])
+                        del buffer[:end + 2]
+                        search_from = 0
+                    # Resume the marker scan where this chunk left off
+                    search_from = max(0, len(buffer) - 1)
+
+                stderr = await process.stderr.read()
+                await process.wait()
+            finally:
+                # Consumer stopped early or was cancelled
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', 'replace')
+            logger.error(f"FFmpeg failed: {error_msg}")
+            raise RuntimeError(f"Failed to generate preview frames: {error_msg}")
+
+    async def generate_and_upload_preview_strip(
+        self,
+        video_path: str,
+        user_id: str,
+        video_filename: str,
+        interval: float = PREVIEW_INTERVAL
+    ) -> list[str]:
+        """
+        Generate scrubber preview frames and upload them to B2.
 
-        return thumbnails
+        Frames come from a single ffmpeg process (iter_preview_frames) and
+        each one is uploaded while later frames are still being decoded, with
+        up to PREVIEW_UPLOAD_CONCURRENCY uploads in flight.
 
-    def _get_video_duration(self, video_path: str) -> float:
+        Args:
+            video_path: Path to video file
+            user_id: User ID (for organizing thumbnails)
+            video_filename: Original video filename (for naming)
+            interval: Seconds between frames
+
+        Returns:
+            list[str]: Frame URLs in timestamp order
+        """
+        base_name = Path(video_filename).stem
+        strip_id = uuid.uuid4().hex[:8]
+        slots = asyncio.Semaphore(self.PREVIEW_UPLOAD_CONCURRENCY)
+        tasks: list[asyncio.Task] = []
+
+        async def upload(index: int, frame: bytes) -> str:
+            key = f"thumbnails/{user_id}/{base_name}_preview_{strip_id}_{index:04d}.jpg"
+            try:
+                await asyncio.to_thread(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket_thumbnails,
+                    Key=key,
+                    Body=frame,
+                    ContentType='image/jpeg'
+                )
+            finally:
+                slots.release()
+            return B2Config.get_public_url(self.bucket_thumbnails, key)
+
+        try:
+            index = 0
+            # aclosing: on error or cancellation the generator is closed right
+            # away, killing ffmpeg and releasing _ffmpeg_semaphore, instead of
+            # whenever asyncio finalizes it
+            async with contextlib.aclosing(self.iter_preview_frames(video_path, interval)) as frames:
+                async for frame in frames:
+                    await slots.acquire()
+                    tasks.append(asyncio.create_task(upload(index, frame)))
+                    index += 1
+
+            urls = list(await asyncio.gather(*tasks))
+        except BaseException as e:
+            # Includes CancelledError: don't leave uploads running behind us
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if isinstance(e, Exception):
+                logger.error(f"❌ Failed to generate and upload preview strip: {e}")
+            raise
+
+        logger.info(f"✅ Uploaded {len(urls)} preview frames for {video_filename}")
+        return urls
+
+    async def _get_video_duration(self, video_path: str) -> float:
         """
         Get video duration in seconds using FFprobe.
 
@@ -245,16 +443,17 @@ class ThumbnailService:
         Returns:
             float: Duration in seconds
         """
-        cmd = [
+        process = await asyncio.create_subprocess_exec(
             'ffprobe',
             '-v', 'error',
             '-show_entries', 'format=duration',
             '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]
-
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        duration_str = result.stdout.decode('utf-8').strip()
+            video_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await process.communicate()
+        duration_str = stdout.decode('utf-8').strip()
 
         try:
             return float(duration_str)
@@ -278,5 +477,13 @@ class ThumbnailService:
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
-# Global thumbnail service instance
-thumbnail_service = ThumbnailService()
+
+@lru_cache(maxsize=1)
+def get_thumbnail_service() -> ThumbnailService:
+    """
+    Return the shared thumbnail service, creating it on first use.
+
+    Built lazily so importing this module doesn't require B2 credentials;
+    also usable as a FastAPI dependency (Depends(get_thumbnail_service)).
+    """
+    return ThumbnailService()
@@ -21,19 +21,63 @@ NOTE: This is a placeholder implementation. In production, you would:
 
 import asyncio
 import logging
-import subprocess
+import os
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Transcodes expected to run at once on this host; FFmpeg threads are
+# divided between them so concurrent jobs don't oversubscribe the CPU
+MAX_CONCURRENT_JOBS = int(os.getenv('FFMPEG_MAX_CONCURRENT_JOBS', '1'))
+
+
+class Rendition(NamedTuple):
+    """HLS rendition settings plus its prebuilt master-playlist entry"""
+
+    scale: str
+    video_bitrate: str
+    audio_bitrate: str
+    stream_inf: str
+
+
+def _rendition(name: str, width: int, height: int, video_kbps: int, audio_kbps: int) -> Rendition:
+    return Rendition(
+        scale=f"{width}:{height}",
+        video_bitrate=f"{video_kbps}k",
+        audio_bitrate=f"{audio_kbps}k",
+        stream_inf=(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={video_kbps * 1000},RESOLUTION={width}x{height}\n"
+            f"output_{name}.m3u8\n\n"
+        ),
+    )
+
+
+RESOLUTION_CONFIG: dict[str, Rendition] = {
+    "360p": _rendition("360p", 640, 360, 800, 96),
+    "480p": _rendition("480p", 854, 480, 1400, 128),
+    "720p": _rendition("720p", 1280, 720, 2500, 128),
+    "1080p": _rendition("1080p", 1920, 1080, 5000, 192),
+}
+
+MASTER_PLAYLIST_HEADER = "#EXTM3U\n#EXT-X-VERSION:3\n\n"
+
+# Concurrent B2 uploads per HLS package (well under the S3 client's pool)
+UPLOAD_CONCURRENCY = 16
+
 
 class VideoProcessor:
     """Handles video processing operations"""
 
-    def __init__(self):
+    def __init__(self, max_concurrent_jobs: int = MAX_CONCURRENT_JOBS):
         self.ffmpeg_path = "ffmpeg"  # Assumes ffmpeg is in PATH
         self.ffprobe_path = "ffprobe"  # Assumes ffprobe is in PATH
+        # FFmpeg defaults to one thread per core for every process, so N
+        # parallel jobs would each spawn cpu_count threads
+        self.threads_per_job = int(
+            os.getenv('FFMPEG_THREADS_PER_JOB')
+            or max(1, (os.cpu_count() or 4) // max(1, max_concurrent_jobs))
+        )
 
     async def extract_metadata(self, video_path: str) -> dict:
         """
@@ -61,14 +105,9 @@ class VideoProcessor:
             #     video_path
             # ]
             #
-            # result = subprocess.run(
-            #     command,
-            #     capture_output=True,
-            #     text=True,
-            #     check=True
-            # )
+            # stdout = await self._run_command(command)
             #
-            # data = json.loads(result.stdout)
+            # data = json.loads(stdout)
             # video_stream = next(s for s in data['streams'] if s['codec_type'] == 'video')
             #
             # return {
@@ -92,6 +131,42 @@ class VideoProcessor:
             logger.error(f"Error extracting metadata from {video_path}: {e}")
             raise
 
+    async def _run_command(self, command: list[str]) -> bytes:
+        """
+        Run an FFmpeg/FFprobe command without blocking the event loop.
+
+        Transcodes can take minutes, so the process is awaited with
+        asyncio.create_subprocess_exec rather than subprocess.run, leaving
+        the worker free to serve other requests meanwhile.
+
+        Args:
+            command: Program and argument list
+
+        Returns:
+            Captured stdout
+
+        Raises:
+            RuntimeError: If the process exits with a non-zero status
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', 'replace')
+            logger.error(f"{command[0]} failed (exit {process.returncode}): {error_msg}")
+            raise RuntimeError(f"{command[0]} failed: {error_msg[-500:]}")
+
+        return stdout
+
     async def generate_thumbnail(
         self,
         video_path: str,
@@ -118,7 +193,9 @@ class VideoProcessor:
             #
             # command = [
             #     self.ffmpeg_path,
+            #     '-threads', str(self.threads_per_job),
             #     '-i', video_path,
+            #     '-threads', str(self.threads_per_job),
             #     '-ss', f'00:00:{timestamp:02d}',
             #     '-vframes', '1',
             #     '-vf', 'scale=1280:720',
@@ -126,12 +203,7 @@ class VideoProcessor:
             #     output_path
             # ]
             #
-            # result = subprocess.run(
-            #     command,
-            #     capture_output=True,
-            #     text=True,
-            #     check=True
-            # )
+            # await self._run_command(command)
             #
             # logger.info(f"Thumbnail generated: {output_path}")
             # return output_path
@@ -148,39 +220,38 @@ class VideoProcessor:
         video_path: str,
         output_dir: str,
         resolutions: Optional[list] = None,
+        thumbnail_path: Optional[str] = None,
+        thumbnail_timestamp: int = 1,
     ) -> str:
         """
         Transcode video to HLS format with adaptive bitrate streaming.
 
+        All renditions (and optionally the thumbnail) come out of a single
+        FFmpeg process, so the source is demuxed and decoded once instead
+        of once per output.
+
         Args:
             video_path: Path to input video
             output_dir: Directory for output files
             resolutions: List of resolutions (default: ['720p', '1080p'])
+            thumbnail_path: Also write a thumbnail here from the same decode
+            thumbnail_timestamp: Thumbnail position in seconds (default 1)
 
         Returns:
             Path to master HLS playlist (.m3u8)
 
-        Example FFmpeg commands:
+        Example FFmpeg command (720p + 1080p + thumbnail):
 
-        # 720p stream
-        ffmpeg -i input.mp4 \\
-            -vf scale=1280:720 \\
-            -c:v libx264 -b:v 2500k \\
-            -c:a aac -b:a 128k \\
-            -hls_time 6 \\
-            -hls_list_size 0 \\
-            -hls_segment_filename "segment_720p_%03d.ts" \\
-            output_720p.m3u8
-
-        # 1080p stream
-        ffmpeg -i input.mp4 \\
-            -vf scale=1920:1080 \\
-            -c:v libx264 -b:v 5000k \\
-            -c:a aac -b:a 192k \\
-            -hls_time 6 \\
-            -hls_list_size 0 \\
-            -hls_segment_filename "segment_1080p_%03d.ts" \\
-            output_1080p.m3u8
+        ffmpeg -y -i input.mp4 \\
+            -filter_complex "[0:v]split=3[s0][s1][s2];[s0]scale=1280:720[v720p];\\
+                [s1]scale=1920:1080[v1080p];[s2]select='gte(t,1)',scale=1280:720[thumb]" \\
+            -map "[v720p]" -map 0:a? -c:v libx264 -b:v 2500k -c:a aac -b:a 128k \\
+                -hls_time 6 -hls_list_size 0 \\
+                -hls_segment_filename "segment_720p_%03d.ts" output_720p.m3u8 \\
+            -map "[v1080p]" -map 0:a? -c:v libx264 -b:v 5000k -c:a aac -b:a 192k \\
+                -hls_time 6 -hls_list_size 0 \\
+                -hls_segment_filename "segment_1080p_%03d.ts" output_1080p.m3u8 \\
+            -map "[thumb]" -frames:v 1 thumbnail.jpg
 
         Then create master playlist that references both
         """
@@ -192,44 +263,21 @@ class VideoProcessor:
             output_path.mkdir(parents=True, exist_ok=True)
 
             # Resolution settings
-            resolution_config = {
-                "360p": {"scale": "640:360", "video_bitrate": "800k", "audio_bitrate": "96k"},
-                "480p": {"scale": "854:480", "video_bitrate": "1400k", "audio_bitrate": "128k"},
-                "720p": {"scale": "1280:720", "video_bitrate": "2500k", "audio_bitrate": "128k"},
-                "1080p": {"scale": "1920:1080", "video_bitrate": "5000k", "audio_bitrate": "192k"},
-            }
+            command = self._build_hls_command(
+                video_path,
+                output_path,
+                resolutions,
+                thumbnail_path=thumbnail_path,
+                thumbnail_timestamp=thumbnail_timestamp,
+            )
 
             # TODO: Implement actual FFmpeg transcoding
-            # In production, for each resolution:
-            #
-            # for resolution in resolutions:
-            #     config = resolution_config[resolution]
-            #     output_file = output_path / f"output_{resolution}.m3u8"
+            # In production, run the single multi-output command:
             #
-            #     command = [
-            #         self.ffmpeg_path,
-            #         '-i', video_path,
-            #         '-vf', f"scale={config['scale']}",
-            #         '-c:v', 'libx264',
-            #         '-b:v', config['video_bitrate'],
-            #         '-c:a', 'aac',
-            #         '-b:a', config['audio_bitrate'],
-            #         '-hls_time', '6',
-            #         '-hls_list_size', '0',
-            #         '-hls_segment_filename', str(output_path / f"segment_{resolution}_%03d.ts"),
-            #         '-y',
-            #         str(output_file)
-            #     ]
-            #
-            #     result = subprocess.run(
-            #         command,
-            #         capture_output=True,
-            #         text=True,
-            #         check=True
-            #     )
+            # await self._run_command(command)
             #
             # # Create master playlist
-            # master_playlist = self._create_master_playlist(resolutions, resolution_config)
+            # master_playlist = self._create_master_playlist(resolutions)
             # master_path = output_path / "master.m3u8"
             # master_path.write_text(master_playlist)
             #
@@ -237,35 +285,87 @@ class VideoProcessor:
 
             # Placeholder
             master_path = output_path / "master.m3u8"
-            logger.info(f"Placeholder: Would create HLS at {master_path}")
+            logger.info(f"Placeholder: Would create HLS at {master_path}: {' '.join(command)}")
             return str(master_path)
 
         except Exception as e:
             logger.error(f"Error transcoding to HLS: {e}")
             raise
 
-    def _create_master_playlist(
+    def _build_hls_command(
         self,
+        video_path: str,
+        output_path: Path,
         resolutions: list,
-        resolution_config: dict,
-    ) -> str:
+        thumbnail_path: Optional[str] = None,
+        thumbnail_timestamp: int = 1,
+    ) -> list[str]:
         """
-        Create HLS master playlist referencing multiple resolution streams.
+        Build one FFmpeg command that writes every HLS rendition (and an
+        optional thumbnail) from a single decode of the input.
+
+        The decoded video is split once per output in -filter_complex; each
+        branch is scaled and mapped to its own HLS output.
 
         Returns:
-            Master playlist content as string
+            FFmpeg argument list
         """
-        playlist = "#EXTM3U\n#EXT-X-VERSION:3\n\n"
+        branch_count = len(resolutions) + (1 if thumbnail_path else 0)
+        filters = [
+            "[0:v]split={}{}".format(branch_count, "".join(f"[s{i}]" for i in range(branch_count)))
+        ]
+        for i, resolution in enumerate(resolutions):
+            filters.append(f"[s{i}]scale={RESOLUTION_CONFIG[resolution].scale}[v{resolution}]")
+        if thumbnail_path:
+            filters.append(f"[s{len(resolutions)}]select='gte(t,{thumbnail_timestamp})',scale=1280:720[thumb]")
+
+        # Renditions encode in parallel inside this one process, so the
+        # job's thread budget is shared between them
+        encoder_threads = max(1, self.threads_per_job // len(resolutions))
+
+        command = [
+            self.ffmpeg_path,
+            '-y',  # Overwrite outputs
+            '-threads', str(self.threads_per_job),  # Decoder threads
+            '-i', video_path,
+            '-filter_complex', ';'.join(filters),
+            '-filter_complex_threads', str(self.threads_per_job),
+        ]
 
         for resolution in resolutions:
-            config = resolution_config[resolution]
-            width, height = config["scale"].split(":")
-            bitrate = int(config["video_bitrate"].replace("k", "000"))
+            config = RESOLUTION_CONFIG[resolution]
+            command += [
+                '-map', f'[v{resolution}]',
+                '-map', '0:a?',  # Audio if present
+                '-c:v', 'libx264',
+                '-threads', str(encoder_threads),
+                '-b:v', config.video_bitrate,
+                '-c:a', 'aac',
+                '-b:a', config.audio_bitrate,
+                '-hls_time', '6',
+                '-hls_list_size', '0',
+                '-hls_segment_filename', str(output_path / f"segment_{resolution}_%03d.ts"),
+                str(output_path / f"output_{resolution}.m3u8"),
+            ]
+
+        if thumbnail_path:
+            command += ['-map', '[thumb]', '-frames:v', '1', thumbnail_path]
+
+        return command
 
-            playlist += f"#EXT-X-STREAM-INF:BANDWIDTH={bitrate},RESOLUTION={width}x{height}\n"
-            playlist += f"output_{resolution}.m3u8\n\n"
+    def _create_master_playlist(
+        self,
+        resolutions: list,
+    ) -> str:
+        """
+        Create HLS master playlist referencing multiple resolution streams.
 
-        return playlist
+        Returns:
+            Master playlist content as string
+        """
+        return MASTER_PLAYLIST_HEADER + "".join(
+            RESOLUTION_CONFIG[resolution].stream_inf for resolution in resolutions
+        )
 
     async def transcode_to_dash(
         self,
@@ -303,7 +403,9 @@ class VideoProcessor:
             #
             # command = [
             #     self.ffmpeg_path,
+            #     '-threads', str(self.threads_per_job),
             #     '-i', video_path,
+            #     '-threads', str(self.threads_per_job),
             #     '-map', '0',
             #     '-c:v', 'libx264',
             #     '-c:a', 'aac',
@@ -319,12 +421,7 @@ class VideoProcessor:
             #     str(manifest_path)
             # ]
             #
-            # result = subprocess.run(
-            #     command,
-            #     capture_output=True,
-            #     text=True,
-            #     check=True
-            # )
+            # await self._run_command(command)
             #
             # return str(manifest_path)
 
@@ -385,6 +482,35 @@ class VideoProcessor:
             logger.error(f"Error uploading to B2: {e}")
             raise
 
+    async def upload_hls_to_b2(
+        self,
+        output_dir: str,
+        remote_prefix: str,
+    ) -> str:
+        """
+        Upload an HLS package (playlists and segments) to B2 concurrently.
+
+        A package holds dozens of small files, so round trips dominate when
+        they are sent one by one; up to UPLOAD_CONCURRENCY go at once.
+
+        Args:
+            output_dir: Local directory written by transcode_to_hls
+            remote_prefix: Remote key prefix, e.g. "videos/{job_id}"
+
+        Returns:
+            Public URL of the master playlist
+        """
+        slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+        async def upload(path: Path) -> str:
+            async with slots:
+                return await self.upload_to_b2(str(path), f"{remote_prefix}/{path.name}")
+
+        files = [path for path in Path(output_dir).iterdir() if path.is_file()]
+        await asyncio.gather(*(upload(path) for path in files))
+
+        return f"https://cdn.soukloop.com/{remote_prefix}/master.m3u8"
+
 
 # Async task for processing video (would be Celery task in production)
 async def process_video_async(
@@ -420,28 +546,29 @@ async def process_video_async(
         # Download video (placeholder)
         local_video_path = f"/tmp/video_{job_id}.mp4"
 
-        # Update status: extracting metadata
-        logger.info(f"Job {job_id}: Extracting metadata")
-        metadata = await processor.extract_metadata(local_video_path)
-
-        # Update status: generating thumbnail
-        logger.info(f"Job {job_id}: Generating thumbnail")
+        # Update status: transcoding (thumbnail comes from the same decode).
+        # Nothing in the transcode depends on the metadata, so ffprobe runs
+        # alongside it instead of delaying its start
+        logger.info(f"Job {job_id}: Extracting metadata, transcoding to HLS and generating thumbnail")
         thumbnail_path = f"/tmp/thumbnail_{job_id}.jpg"
-        await processor.generate_thumbnail(local_video_path, thumbnail_path, timestamp=1)
-
-        # Update status: transcoding
-        logger.info(f"Job {job_id}: Transcoding to HLS")
         output_dir = f"/tmp/hls_{job_id}"
-        hls_path = await processor.transcode_to_hls(
-            local_video_path,
-            output_dir,
-            resolutions=["720p", "1080p"],
+        metadata, hls_path = await asyncio.gather(
+            processor.extract_metadata(local_video_path),
+            processor.transcode_to_hls(
+                local_video_path,
+                output_dir,
+                resolutions=["720p", "1080p"],
+                thumbnail_path=thumbnail_path,
+                thumbnail_timestamp=1,
+            ),
         )
 
         # Update status: uploading
         logger.info(f"Job {job_id}: Uploading to B2")
-        video_url = await processor.upload_to_b2(hls_path, f"videos/{job_id}/master.m3u8")
-        thumbnail_url = await processor.upload_to_b2(thumbnail_path, f"thumbnails/{job_id}.jpg")
+        video_url, thumbnail_url = await asyncio.gather(
+            processor.upload_hls_to_b2(str(Path(hls_path).parent), f"videos/{job_id}"),
+            processor.upload_to_b2(thumbnail_path, f"thumbnails/{job_id}.jpg"),
+        )
 
         # Update status: completed
         logger.info(f"Job {job_id}: Completed")
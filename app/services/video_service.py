@@ -12,25 +12,67 @@ Usage:
     # Returns: {file_url, file_key, file_size, upload_method, sha1}
 """
 
+import asyncio
 import hashlib
-import uuid
+import os
 from datetime import datetime
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, NoReturn, Optional
+from boto3.s3.transfer import TransferConfig
 from fastapi import UploadFile, HTTPException
+from uuid_utils import uuid7
 
 from app.storage.b2_config import B2Config
 
 
+class _Sha1Reader:
+    """
+    File wrapper that hashes data as it is read
+
+    boto3's transfer manager reads a seekable file sequentially, one part
+    per read(), copying each part into memory before uploading it; hashing
+    in read() covers every byte exactly once.
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self._sha1 = hashlib.sha1()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._sha1.update(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._fileobj.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._fileobj.tell()
+
+    def hexdigest(self) -> str:
+        return self._sha1.hexdigest()
+
+
 class VideoService:
     """Service for handling video uploads to Backblaze B2"""
 
     # 100MB threshold for multipart upload
     MULTIPART_THRESHOLD = 100 * 1024 * 1024  # 100MB
     CHUNK_SIZE = 5 * 1024 * 1024  # 5MB chunks for multipart upload
+    MAX_CONCURRENT_PARTS = 8  # Parts uploaded in parallel
 
     # Maximum video size: 2GB
     MAX_VIDEO_SIZE = 2 * 1024 * 1024 * 1024
 
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=CHUNK_SIZE,
+        max_concurrency=MAX_CONCURRENT_PARTS,
+        use_threads=True
+    )
+
+    # Validity of presigned part URLs for direct uploads
+    DIRECT_UPLOAD_EXPIRY = 3600  # 1 hour
+
     def __init__(self):
         """Initialize video service with B2 S3 client"""
         self.s3_client = B2Config.get_s3_client()
@@ -54,14 +96,16 @@ class VideoService:
         Returns:
             str: Unique S3 key path
 
+        Keys use a UUIDv7 (same as photo keys): time-ordered, so listings
+        sort by upload time, and generated in one call instead of
+        formatting a timestamp and truncating a UUIDv4.
+
         Example:
-            "recorded/123/20250120_143022_a1b2c3d4.mp4"
+            "recorded/123/0194d4a0-6c2e-7b3f-9a1d-2f6e8c4b5a7d.mp4"
         """
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        unique_id = str(uuid.uuid4())[:8]
         extension = filename.split('.')[-1].lower() if '.' in filename else 'mp4'
 
-        return f"{video_type}/{user_id}/{timestamp}_{unique_id}.{extension}"
+        return f"{video_type}/{user_id}/{uuid7()}.{extension}"
 
     async def upload_video(
         self,
@@ -94,34 +138,49 @@ class VideoService:
             HTTPException: If upload fails or file too large
         """
         try:
-            # Read file content
-            content = await file.read()
-            file_size = len(content)
-
-            # Validate file size
-            if file_size > self.MAX_VIDEO_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Video size exceeds {self.MAX_VIDEO_SIZE / (1024*1024*1024)}GB limit"
-                )
+            # Reject oversized uploads before touching the body when the
+            # size is already known
+            if file.size is not None and file.size > self.MAX_VIDEO_SIZE:
+                self._raise_too_large()
 
             # Generate unique key
             file_key = self.generate_video_key(user_id, file.filename or 'video.mp4', video_type)
 
-            # Calculate SHA1 checksum
-            sha1_hash = hashlib.sha1(content).hexdigest()
+            file_size = await asyncio.to_thread(self._measure_file, file.file)
 
-            # Choose upload method based on file size
-            if file_size < self.MULTIPART_THRESHOLD:
-                # Simple upload for files < 100MB
-                return await self._simple_upload(
-                    content, file_key, file_size, user_id, sha1_hash, video_type
-                )
+            bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
+            metadata = {
+                'user_id': user_id,
+                'video_type': video_type,
+                'upload_timestamp': datetime.utcnow().isoformat()
+            }
+
+            multipart = file_size >= self.MULTIPART_THRESHOLD
+
+            if not multipart:
+                # Single PUT: the SHA1 goes into the object metadata, so it
+                # has to be known first; hash the spooled upload up front
+                sha1_hash = await asyncio.to_thread(self._hash_file, file.file)
+                metadata['sha1'] = sha1_hash
+                await self._transfer(file.file, bucket, file_key, metadata)
             else:
-                # Multipart upload for large files
-                return await self._multipart_upload(
-                    content, file_key, file_size, user_id, sha1_hash, video_type
-                )
+                # Multipart: metadata is fixed at initiation, so the SHA1 is
+                # only returned. It is computed as the transfer manager reads
+                # each part, overlapping the parts already uploading
+                reader = _Sha1Reader(file.file)
+                await self._transfer(reader, bucket, file_key, metadata)
+                sha1_hash = reader.hexdigest()
+
+            result = {
+                'file_url': self._generate_file_url(file_key, bucket),
+                'file_key': file_key,
+                'file_size': file_size,
+                'upload_method': 'multipart' if multipart else 'simple',
+                'sha1': sha1_hash
+            }
+            if multipart:
+                result['parts_count'] = -(-file_size // self.CHUNK_SIZE)
+            return result
 
         except HTTPException:
             # Re-raise HTTP exceptions as-is
@@ -133,163 +192,76 @@ class VideoService:
                 detail=f"Failed to upload video: {str(e)}"
             )
 
-    async def _simple_upload(
-        self,
-        content: bytes,
-        file_key: str,
-        file_size: int,
-        user_id: str,
-        sha1_hash: str,
-        video_type: str
-    ) -> Dict[str, any]:
+    def _raise_too_large(self) -> NoReturn:
+        """Reject a video over MAX_VIDEO_SIZE"""
+        raise HTTPException(
+            status_code=400,
+            detail=f"Video size exceeds {self.MAX_VIDEO_SIZE / (1024*1024*1024)}GB limit"
+        )
+
+    def _measure_file(self, fileobj: BinaryIO) -> int:
         """
-        Simple upload for files < 100MB
+        Size of a seekable file object (blocking)
 
-        Args:
-            content: File content as bytes
-            file_key: S3 object key
-            file_size: Size in bytes
-            user_id: User ID
-            sha1_hash: SHA1 hash of content
-            video_type: 'recorded' or 'live'
+        The size comes from seeking to the end, so oversized files are
+        rejected without being read.
 
-        Returns:
-            dict: Upload result
+        Raises:
+            HTTPException: If the size exceeds MAX_VIDEO_SIZE
         """
-        # Select bucket based on video type
-        bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
+        file_size = fileobj.seek(0, os.SEEK_END)
+        if file_size > self.MAX_VIDEO_SIZE:
+            self._raise_too_large()
 
-        self.s3_client.put_object(
-            Bucket=bucket,
-            Key=file_key,
-            Body=content,
-            ContentType='video/mp4',
-            Metadata={
-                'user_id': user_id,
-                'video_type': video_type,
-                'upload_timestamp': datetime.utcnow().isoformat(),
-                'sha1': sha1_hash
-            },
-            ServerSideEncryption='AES256'
-        )
+        fileobj.seek(0)
+        return file_size
 
-        file_url = self._generate_file_url(file_key, bucket)
+    def _hash_file(self, fileobj: BinaryIO) -> str:
+        """
+        SHA1 of a seekable file object (blocking)
 
-        return {
-            'file_url': file_url,
-            'file_key': file_key,
-            'file_size': file_size,
-            'upload_method': 'simple',
-            'sha1': sha1_hash
-        }
+        hashlib.file_digest hashes through one reusable buffer via readinto
+        (no per-chunk allocations); OpenSSL uses the CPU's SHA extensions
+        where available.
+        """
+        fileobj.seek(0)
+        digest = hashlib.file_digest(fileobj, 'sha1').hexdigest()
+        fileobj.seek(0)
+        return digest
 
-    async def _multipart_upload(
+    async def _transfer(
         self,
-        content: bytes,
+        fileobj: BinaryIO,
+        bucket: str,
         file_key: str,
-        file_size: int,
-        user_id: str,
-        sha1_hash: str,
-        video_type: str
-    ) -> Dict[str, any]:
+        metadata: Dict[str, str]
+    ) -> None:
         """
-        Multipart upload for large files (100MB+)
+        Upload a file object through boto3's transfer manager
 
-        Uploads file in 5MB chunks for better reliability and progress tracking.
+        Files under MULTIPART_THRESHOLD go up in a single PUT; larger ones as
+        CHUNK_SIZE parts, MAX_CONCURRENT_PARTS at a time, with per-part
+        retries and the multipart upload aborted automatically on failure.
 
         Args:
-            content: File content as bytes
+            fileobj: Readable file object positioned at the start
+            bucket: Destination bucket
             file_key: S3 object key
-            file_size: Size in bytes
-            user_id: User ID
-            sha1_hash: SHA1 hash of content
-            video_type: 'recorded' or 'live'
-
-        Returns:
-            dict: Upload result
-
-        Raises:
-            Exception: If multipart upload fails (aborts upload automatically)
+            metadata: Object metadata
         """
-        # Select bucket based on video type
-        bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
-
-        # Initiate multipart upload
-        response = self.s3_client.create_multipart_upload(
-            Bucket=bucket,
-            Key=file_key,
-            ContentType='video/mp4',
-            Metadata={
-                'user_id': user_id,
-                'video_type': video_type,
-                'upload_timestamp': datetime.utcnow().isoformat(),
-                'sha1': sha1_hash
+        await asyncio.to_thread(
+            self.s3_client.upload_fileobj,
+            fileobj,
+            bucket,
+            file_key,
+            ExtraArgs={
+                'ContentType': 'video/mp4',
+                'Metadata': metadata,
+                'ServerSideEncryption': 'AES256'
             },
-            ServerSideEncryption='AES256'
+            Config=self.TRANSFER_CONFIG
         )
 
-        upload_id = response['UploadId']
-        parts = []
-
-        try:
-            # Upload parts
-            part_number = 1
-            offset = 0
-
-            while offset < file_size:
-                # Calculate chunk size
-                chunk_size = min(self.CHUNK_SIZE, file_size - offset)
-                chunk = content[offset:offset + chunk_size]
-
-                # Upload part
-                part_response = self.s3_client.upload_part(
-                    Bucket=bucket,
-                    Key=file_key,
-                    PartNumber=part_number,
-                    UploadId=upload_id,
-                    Body=chunk
-                )
-
-                parts.append({
-                    'PartNumber': part_number,
-                    'ETag': part_response['ETag']
-                })
-
-                offset += chunk_size
-                part_number += 1
-
-            # Complete multipart upload
-            self.s3_client.complete_multipart_upload(
-                Bucket=bucket,
-                Key=file_key,
-                UploadId=upload_id,
-                MultipartUpload={'Parts': parts}
-            )
-
-            file_url = self._generate_file_url(file_key, bucket)
-
-            return {
-                'file_url': file_url,
-                'file_key': file_key,
-                'file_size': file_size,
-                'upload_method': 'multipart',
-                'parts_count': len(parts),
-                'sha1': sha1_hash
-            }
-
-        except Exception as e:
-            # Abort multipart upload on error to prevent orphaned parts
-            try:
-                self.s3_client.abort_multipart_upload(
-                    Bucket=bucket,
-                    Key=file_key,
-                    UploadId=upload_id
-                )
-            except Exception as abort_error:
-                print(f"Failed to abort multipart upload: {abort_error}")
-
-            raise e
-
     def _generate_file_url(self, file_key: str, bucket: str) -> str:
         """
         Generate public URL for video
@@ -373,3 +345,216 @@ class VideoService:
                 status_code=500,
                 detail=f"Failed to generate presigned URL: {str(e)}"
             )
+
+    async def initiate_direct_upload(
+        self,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        content_type: str = 'video/mp4',
+        video_type: str = 'recorded'
+    ) -> Dict[str, any]:
+        """
+        Start a multipart upload that the client sends straight to B2
+
+        The API only signs URLs; the video bytes never pass through this
+        server. The client PUTs each CHUNK_SIZE part to its URL, collects
+        the ETag response headers, then calls complete_direct_upload.
+
+        Args:
+            user_id: User ID
+            filename: Original filename
+            file_size: Size in bytes (determines the part count)
+            content_type: MIME type of the video
+            video_type: 'recorded' or 'live'
+
+        Returns:
+            dict: upload_id, file_key, part_size, expires_in and parts
+                (list of {part_number, upload_url})
+
+        Raises:
+            HTTPException: If the file is too large or B2 rejects the request
+        """
+        if file_size > self.MAX_VIDEO_SIZE:
+            self._raise_too_large()
+
+        bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
+        file_key = self.generate_video_key(user_id, filename, video_type)
+        part_count = max(1, -(-file_size // self.CHUNK_SIZE))
+
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.create_multipart_upload,
+                Bucket=bucket,
+                Key=file_key,
+                ContentType=content_type,
+                Metadata={
+                    'user_id': user_id,
+                    'video_type': video_type,
+                    'upload_timestamp': datetime.utcnow().isoformat()
+                },
+                ServerSideEncryption='AES256'
+            )
+            upload_id = response['UploadId']
+
+            # Signing is local (no network), but hundreds of URLs is still
+            # enough CPU to keep off the event loop
+            parts = await asyncio.to_thread(
+                self._presign_parts, bucket, file_key, upload_id, part_count
+            )
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to initiate upload: {str(e)}"
+            )
+
+        return {
+            'upload_id': upload_id,
+            'file_key': file_key,
+            'part_size': self.CHUNK_SIZE,
+            'expires_in': self.DIRECT_UPLOAD_EXPIRY,
+            'parts': parts
+        }
+
+    def _presign_parts(
+        self,
+        bucket: str,
+        file_key: str,
+        upload_id: str,
+        part_count: int
+    ) -> list:
+        """Presigned upload_part URLs for parts 1..part_count (blocking)"""
+        return [
+            {
+                'part_number': part_number,
+                'upload_url': self.s3_client.generate_presigned_url(
+                    'upload_part',
+                    Params={
+                        'Bucket': bucket,
+                        'Key': file_key,
+                        'UploadId': upload_id,
+                        'PartNumber': part_number
+                    },
+                    ExpiresIn=self.DIRECT_UPLOAD_EXPIRY
+                )
+            }
+            for part_number in range(1, part_count + 1)
+        ]
+
+    async def complete_direct_upload(
+        self,
+        user_id: str,
+        file_key: str,
+        upload_id: str,
+        parts: list,
+        video_type: str = 'recorded'
+    ) -> Dict[str, any]:
+        """
+        Complete a direct-to-B2 multipart upload
+
+        Args:
+            user_id: User ID (must own file_key)
+            file_key: S3 object key from initiate_direct_upload
+            upload_id: Multipart upload ID
+            parts: List of {PartNumber, ETag} collected by the client
+            video_type: 'recorded' or 'live'
+
+        Returns:
+            dict: Upload result (file_url, file_key, file_size,
+                upload_method, parts_count)
+
+        Raises:
+            HTTPException: If the key belongs to another user, B2 rejects
+                the completion, or the uploaded video exceeds MAX_VIDEO_SIZE
+                (the object is deleted)
+        """
+        self._check_key_owner(user_id, file_key, video_type)
+        bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
+
+        try:
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
+                Bucket=bucket,
+                Key=file_key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    'Parts': sorted(
+                        ({'PartNumber': p['PartNumber'], 'ETag': p['ETag']} for p in parts),
+                        key=lambda p: p['PartNumber']
+                    )
+                }
+            )
+            head = await asyncio.to_thread(
+                self.s3_client.head_object,
+                Bucket=bucket,
+                Key=file_key
+            )
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to complete upload: {str(e)}"
+            )
+
+        # Presigned part URLs don't bind Content-Length, so the size declared
+        # at initiate isn't binding; enforce the cap on the assembled object
+        if head['ContentLength'] > self.MAX_VIDEO_SIZE:
+            await asyncio.to_thread(self.s3_client.delete_object, Bucket=bucket, Key=file_key)
+            self._raise_too_large()
+
+        return {
+            'file_url': self._generate_file_url(file_key, bucket),
+            'file_key': file_key,
+            'file_size': head['ContentLength'],
+            'upload_method': 'direct',
+            'parts_count': len(parts)
+        }
+
+    async def abort_direct_upload(
+        self,
+        user_id: str,
+        file_key: str,
+        upload_id: str,
+        video_type: str = 'recorded'
+    ) -> bool:
+        """
+        Abort a direct-to-B2 multipart upload and discard its parts
+
+        Args:
+            user_id: User ID (must own file_key)
+            file_key: S3 object key from initiate_direct_upload
+            upload_id: Multipart upload ID
+            video_type: 'recorded' or 'live'
+
+        Returns:
+            bool: True if aborted
+
+        Raises:
+            HTTPException: If the key belongs to another user or the abort fails
+        """
+        self._check_key_owner(user_id, file_key, video_type)
+        bucket = self.bucket_live_videos if video_type == 'live' else self.bucket_videos
+
+        try:
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
+                Bucket=bucket,
+                Key=file_key,
+                UploadId=upload_id
+            )
+            return True
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to abort upload: {str(e)}"
+            )
+
+    def _check_key_owner(self, user_id: str, file_key: str, video_type: str) -> None:
+        """Reject keys outside the user's own prefix"""
+        if not file_key.startswith(f"{video_type}/{user_id}/"):
+            raise HTTPException(
+                status_code=403,
+                detail="Upload does not belong to this user"
+            )
@@ -19,8 +19,12 @@ Usage:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
+
 import boto3
-from typing import Optional
+from botocore.config import Config
 
 
 class B2Config:
@@ -41,10 +45,27 @@ class B2Config:
     # CDN URL (optional)
     CDN_URL: Optional[str] = os.getenv('B2_CDN_URL') or None
 
+    # Connection pool size of the shared client (botocore default is 10)
+    MAX_POOL_CONNECTIONS: int = 50
+
+    # Socket timeouts in seconds (botocore defaults are 60s each)
+    CONNECT_TIMEOUT: int = 3
+    READ_TIMEOUT: int = 10
+
+    # S3 DeleteObjects accepts at most 1000 keys per request
+    DELETE_BATCH_SIZE: int = 1000
+
+    # Connections per bucket opened at startup by warm_up
+    WARMUP_CONNECTIONS: int = 8
+
     @classmethod
+    @lru_cache(maxsize=1)
     def get_s3_client(cls):
         """
-        Create and return S3 client for Backblaze B2
+        Return the shared S3 client for Backblaze B2
+
+        The client is created once and reused by every service: boto3 clients
+        are thread-safe, and building one (loading the service model) is slow.
 
         Returns:
             boto3.client: Configured S3 client for B2
@@ -63,7 +84,14 @@ class B2Config:
             endpoint_url=cls.ENDPOINT_URL,
             aws_access_key_id=cls.ACCESS_KEY_ID,
             aws_secret_access_key=cls.SECRET_ACCESS_KEY,
-            region_name=cls.REGION
+            region_name=cls.REGION,
+            config=Config(
+                max_pool_connections=cls.MAX_POOL_CONNECTIONS,
+                connect_timeout=cls.CONNECT_TIMEOUT,
+                read_timeout=cls.READ_TIMEOUT,
+                tcp_keepalive=True,
+                retries={'max_attempts': 3, 'mode': 'adaptive'}
+            )
         )
 
     @classmethod
@@ -91,6 +119,69 @@ class B2Config:
             region_name=cls.REGION
         )
 
+    @classmethod
+    def delete_objects(cls, bucket: str, keys: List[str]) -> Dict[str, bool]:
+        """
+        Delete many objects with batched DeleteObjects requests (blocking)
+
+        Args:
+            bucket: Bucket name
+            keys: Object keys to delete
+
+        Returns:
+            dict: Key -> True if deleted, False if B2 reported an error
+
+        Raises:
+            botocore.exceptions.ClientError: If a batch request fails outright
+        """
+        s3_client = cls.get_s3_client()
+        results: Dict[str, bool] = {}
+
+        for start in range(0, len(keys), cls.DELETE_BATCH_SIZE):
+            batch = keys[start:start + cls.DELETE_BATCH_SIZE]
+            response = s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    'Objects': [{'Key': key} for key in batch],
+                    'Quiet': True  # Only errors are listed in the response
+                }
+            )
+            failed = {error['Key'] for error in response.get('Errors', [])}
+            results.update((key, key not in failed) for key in batch)
+
+        return results
+
+    @classmethod
+    def warm_up(cls, buckets: Optional[List[str]] = None) -> int:
+        """
+        Pre-open pooled connections to B2 (blocking)
+
+        Fires WARMUP_CONNECTIONS concurrent HeadBucket requests per bucket so
+        the shared client's pool already holds resolved, TLS-established,
+        kept-alive connections when the first uploads arrive. Buckets are
+        addressed virtual-host style, so each one has its own pool.
+
+        Args:
+            buckets: Buckets to warm (default: video and thumbnail buckets)
+
+        Returns:
+            int: Number of requests that succeeded
+        """
+        s3_client = cls.get_s3_client()
+        if buckets is None:
+            buckets = [cls.BUCKET_VIDEOS, cls.BUCKET_LIVE_VIDEOS, cls.BUCKET_THUMBNAILS]
+
+        def head(bucket: str) -> bool:
+            try:
+                s3_client.head_bucket(Bucket=bucket)
+                return True
+            except Exception:
+                return False
+
+        targets = [bucket for bucket in buckets for _ in range(cls.WARMUP_CONNECTIONS)]
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            return sum(executor.map(head, targets))
+
     @classmethod
     def get_public_url(cls, bucket: str, key: str) -> str:
         """
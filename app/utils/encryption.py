@@ -1,21 +1,63 @@
 """
 Encryption utilities for sensitive data (Emirates ID numbers, etc.)
 """
+import base64
+import os
+from functools import lru_cache
+
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from app.config import get_settings
 
 settings = get_settings()
 
+# Ciphertext layout: version byte + 12-byte nonce + AES-GCM ciphertext/tag,
+# urlsafe base64. Fernet tokens always start with 0x80, so older values
+# are still recognised and decrypted with the legacy cipher.
+_AESGCM_VERSION = 0x01
+_FERNET_VERSION = 0x80
+_NONCE_SIZE = 12
+
+_KDF_SALT = b"jiran-emirates-id-v1"
+
+# Masked values keep only the last 4 characters
+_MASK_EMPTY = "****"
+_MASK_PREFIX_EMIRATES_ID = "***-****-*****-"
+_MASK_PREFIX_TRADE_LICENSE = "***-****-"
+
 
+def _derive_key(purpose: bytes) -> bytes:
+    """Derive a 32-byte key from SECRET_KEY with HKDF-SHA256, one per purpose."""
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=_KDF_SALT,
+        info=purpose,
+    ).derive(settings.SECRET_KEY.encode())
+
+
+@lru_cache(maxsize=1)
 def get_cipher() -> Fernet:
-    """Get Fernet cipher for encryption/decryption"""
-    key = settings.SECRET_KEY.encode()
-    # Ensure key is 32 bytes for Fernet
-    if len(key) < 32:
-        key = key.ljust(32, b'0')
-    elif len(key) > 32:
-        key = key[:32]
-    return Fernet(Fernet.generate_key())  # Use proper key derivation in production
+    """
+    Get the legacy Fernet cipher (decrypts values stored before AES-GCM)
+
+    Built once from an HKDF-derived key and reused.
+    """
+    return Fernet(base64.urlsafe_b64encode(_derive_key(b"fernet")))
+
+
+@lru_cache(maxsize=1)
+def get_aead() -> AESGCM:
+    """
+    Get AES-256-GCM cipher for encryption/decryption
+
+    GCM encrypts and authenticates in one pass (AES-NI/PCLMUL in OpenSSL)
+    where Fernet needs AES-CBC plus a separate HMAC. Uses its own derived
+    key, separate from the Fernet one.
+    """
+    return AESGCM(_derive_key(b"aes-256-gcm"))
 
 
 def encrypt_emirates_id(id_number: str) -> str:
@@ -28,9 +70,9 @@ def encrypt_emirates_id(id_number: str) -> str:
     Returns:
         Encrypted string
     """
-    cipher = get_cipher()
-    encrypted = cipher.encrypt(id_number.encode())
-    return encrypted.decode()
+    nonce = os.urandom(_NONCE_SIZE)
+    ciphertext = get_aead().encrypt(nonce, id_number.encode(), None)
+    return base64.urlsafe_b64encode(bytes([_AESGCM_VERSION]) + nonce + ciphertext).decode()
 
 
 def decrypt_emirates_id(encrypted: str) -> str:
@@ -38,13 +80,23 @@ def decrypt_emirates_id(encrypted: str) -> str:
     Decrypt Emirates ID number
 
     Args:
-        encrypted: Encrypted Emirates ID
+        encrypted: Encrypted Emirates ID (AES-GCM or legacy Fernet token)
 
     Returns:
         Decrypted ID number
+
+    Raises:
+        ValueError: If the value is not a recognised ciphertext
+        cryptography.exceptions.InvalidTag: If an AES-GCM value fails authentication
     """
-    cipher = get_cipher()
-    decrypted = cipher.decrypt(encrypted.encode())
+    raw = base64.urlsafe_b64decode(encrypted)
+    if raw[:1] == bytes([_FERNET_VERSION]):
+        return get_cipher().decrypt(encrypted.encode()).decode()
+    if raw[:1] != bytes([_AESGCM_VERSION]):
+        raise ValueError("Unrecognised ciphertext version")
+
+    nonce = raw[1:1 + _NONCE_SIZE]
+    decrypted = get_aead().decrypt(nonce, raw[1 + _NONCE_SIZE:], None)
     return decrypted.decode()
 
 
@@ -59,8 +111,24 @@ def mask_emirates_id(id_number: str) -> str:
         Masked ID like "***-****-*****-123-4"
     """
     if not id_number or len(id_number) < 4:
-        return "****"
-    return f"***-****-*****-{id_number[-4:]}"
+        return _MASK_EMPTY
+    return _MASK_PREFIX_EMIRATES_ID + id_number[-4:]
+
+
+def mask_emirates_ids(id_numbers: list[str]) -> list[str]:
+    """
+    Mask a batch of Emirates IDs (for list endpoints)
+
+    Args:
+        id_numbers: Emirates ID numbers
+
+    Returns:
+        Masked IDs, in the same order
+    """
+    return [
+        _MASK_PREFIX_EMIRATES_ID + n[-4:] if n and len(n) >= 4 else _MASK_EMPTY
+        for n in id_numbers
+    ]
 
 
 def mask_trade_license(license_number: str) -> str:
@@ -74,5 +142,21 @@ def mask_trade_license(license_number: str) -> str:
         Masked license like "***-****-1234"
     """
     if not license_number or len(license_number) < 4:
-        return "****"
-    return f"***-****-{license_number[-4:]}"
+        return _MASK_EMPTY
+    return _MASK_PREFIX_TRADE_LICENSE + license_number[-4:]
+
+
+def mask_trade_licenses(license_numbers: list[str]) -> list[str]:
+    """
+    Mask a batch of trade license numbers (for list endpoints)
+
+    Args:
+        license_numbers: Trade license numbers
+
+    Returns:
+        Masked licenses, in the same order
+    """
+    return [
+        _MASK_PREFIX_TRADE_LICENSE + n[-4:] if n and len(n) >= 4 else _MASK_EMPTY
+        for n in license_numbers
+    ]
@@ -1,9 +1,18 @@
+import struct
 from dataclasses import dataclass
 from typing import Any
 
 from geoalchemy2.elements import WKBElement
-from geoalchemy2.shape import from_shape, to_shape
-from shapely.geometry import Point
+from geoalchemy2.shape import to_shape
+
+# Points are packed/unpacked directly instead of going through a shapely
+# (GEOS) object. Layouts are little-endian (NDR) WKB:
+#   WKB:  byte order, geometry type (1 = Point), x, y
+#   EWKB: byte order, geometry type with SRID flag, srid, x, y
+_WKB_POINT = struct.Struct('<BIdd')
+_EWKB_POINT = struct.Struct('<BIIdd')
+_WKB_POINT_TYPE = 1
+_EWKB_POINT_TYPE = 0x20000001
 
 
 @dataclass
@@ -13,13 +22,27 @@ class Coordinates:
 
 
 def point_from_coordinates(latitude: float, longitude: float) -> WKBElement:
-    point = Point(float(longitude), float(latitude))
-    return from_shape(point, srid=4326)
+    data = _WKB_POINT.pack(1, _WKB_POINT_TYPE, float(longitude), float(latitude))
+    return WKBElement(data, srid=4326)
 
 
 def point_to_coordinates(geom: Any) -> Coordinates | None:
     if not geom:
         return None
+
+    if isinstance(geom, WKBElement):
+        data = geom.data
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        if len(data) == _EWKB_POINT.size and data[0] == 1:
+            _, geom_type, _, x, y = _EWKB_POINT.unpack(data)
+            if geom_type == _EWKB_POINT_TYPE:
+                return Coordinates(latitude=y, longitude=x)
+        elif len(data) == _WKB_POINT.size and data[0] == 1:
+            _, geom_type, x, y = _WKB_POINT.unpack(data)
+            if geom_type == _WKB_POINT_TYPE:
+                return Coordinates(latitude=y, longitude=x)
+
+    # Big-endian, non-point or WKT input
     shape = to_shape(geom)
     return Coordinates(latitude=shape.y, longitude=shape.x)
-
@@ -7,15 +7,32 @@ This module provides utilities for working with geographic data:
 - Spatial queries
 """
 import math
+import struct
 from typing import Any
 
-from geoalchemy2.functions import ST_Distance, ST_DWithin, ST_MakePoint, ST_SetSRID
-from sqlalchemy import cast, select
+import numpy as np
+from geoalchemy2 import Geography, Geometry
+from geoalchemy2.functions import ST_Distance, ST_DWithin, ST_MakeEnvelope, ST_MakePoint, ST_SetSRID
+from sqlalchemy import func, select, type_coerce
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import literal_column
 
 from app.models.product import Product
 
+# Mean Earth radius in kilometers (Haversine)
+EARTH_RADIUS_KM = 6371.0
+
+# Shortest length of one degree of latitude (at the equator); using it for
+# the bbox half-widths keeps the box a superset of the true radius
+KM_PER_DEGREE = 110.57
+
+# Degrees to half-angle radians for the Haversine sin(d/2) terms
+_HALF_RADIANS = math.pi / 360
+
+# EWKB geometry type flag marking an embedded SRID
+_EWKB_SRID_FLAG = 0x20000000
+
 
 def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """Calculate distance between two points using Haversine formula.
@@ -29,20 +46,39 @@ def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     Returns:
         Distance in kilometers
     """
-    # Radius of Earth in kilometers
-    R = 6371.0
-
-    # Convert to radians
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
+    # Half-angle sines, folded into one multiply each
+    sin_dlat = math.sin((lat2 - lat1) * _HALF_RADIANS)
+    sin_dlng = math.sin((lng2 - lng1) * _HALF_RADIANS)
 
     # Haversine formula
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    a = sin_dlat * sin_dlat + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * sin_dlng * sin_dlng
+
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
 
-    return R * c
+
+def haversine_np(lat1: Any, lng1: Any, lat2: Any, lng2: Any) -> np.ndarray:
+    """Vectorized Haversine distance for bulk scoring (feed ranking, ingest).
+
+    Same formula as calculate_distance, evaluated with NumPy ufuncs over whole
+    arrays; arguments broadcast, so one point can be compared against many.
+    For a single pair, calculate_distance is faster (no array overhead).
+
+    Args:
+        lat1: Latitude(s) of first point(s)
+        lng1: Longitude(s) of first point(s)
+        lat2: Latitude(s) of second point(s)
+        lng2: Longitude(s) of second point(s)
+
+    Returns:
+        Array of distances in kilometers
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlng = np.radians(np.subtract(lng2, lng1))
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlng / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 
 def get_distance_label(distance_km: float) -> str:
@@ -77,30 +113,61 @@ def point_from_coordinates(latitude: float, longitude: float) -> str:
         WKT format: "POINT(lng lat)"
 
     Note:
-        PostGIS uses (longitude, latitude) order, not (latitude, longitude)
+        PostGIS uses (longitude, latitude) order, not (latitude, longitude).
+        Coordinates are expected to be validated already (app.schemas.geo).
     """
-    if not validate_coordinates(latitude, longitude):
-        raise ValueError("Invalid coordinates")
-
     return f"POINT({longitude} {latitude})"
 
 
-def point_to_coordinates(point_wkt: str) -> tuple[float, float]:
-    """Extract lat/lng from PostGIS POINT WKT string.
+def point_from_ewkb(wkb: str | bytes) -> tuple[float, float]:
+    """Extract lat/lng from a PostGIS (E)WKB point.
+
+    This is the form PostGIS returns geometry columns in (hex-encoded when
+    read as text), so the coordinates are unpacked straight from the bytes.
 
     Args:
-        point_wkt: WKT format "POINT(lng lat)"
+        wkb: Hex string or raw bytes of a WKB/EWKB point
 
     Returns:
         Tuple of (latitude, longitude)
+
+    Raises:
+        ValueError: If the value is not a 2D point
     """
-    # Remove "POINT(" and ")" and split
-    coords = point_wkt.replace("POINT(", "").replace(")", "").split()
-    longitude = float(coords[0])
-    latitude = float(coords[1])
+    raw = bytes.fromhex(wkb) if isinstance(wkb, str) else bytes(wkb)
+    if len(raw) < 21:
+        raise ValueError("Invalid WKB point")
+
+    byte_order = "<" if raw[0] == 1 else ">"
+    (geom_type,) = struct.unpack_from(f"{byte_order}I", raw, 1)
+    if geom_type & 0xFFFF != 1:
+        raise ValueError("WKB geometry is not a point")
+
+    # EWKB carries a 4-byte SRID after the type when the flag is set
+    offset = 9 if geom_type & _EWKB_SRID_FLAG else 5
+    longitude, latitude = struct.unpack_from(f"{byte_order}dd", raw, offset)
     return (latitude, longitude)
 
 
+def point_to_coordinates(point: str | bytes) -> tuple[float, float]:
+    """Extract lat/lng from a PostGIS point.
+
+    Args:
+        point: EWKB (hex or bytes) as returned by PostGIS, or WKT "POINT(lng lat)"
+
+    Returns:
+        Tuple of (latitude, longitude)
+    """
+    if isinstance(point, str) and point.lstrip().upper().startswith("POINT"):
+        # Remove "POINT(" and ")" and split
+        coords = point.replace("POINT(", "").replace(")", "").split()
+        longitude = float(coords[0])
+        latitude = float(coords[1])
+        return (latitude, longitude)
+
+    return point_from_ewkb(point)
+
+
 def validate_coordinates(latitude: float, longitude: float) -> bool:
     """Validate geographic coordinates.
 
@@ -114,6 +181,65 @@ def validate_coordinates(latitude: float, longitude: float) -> bool:
     return -90 <= latitude <= 90 and -180 <= longitude <= 180
 
 
+def bbox_filter(column: Any, latitude: float, longitude: float, radius_km: float) -> ColumnElement[bool]:
+    """Cheap bounding-box prefilter for a radius query.
+
+    ``column && envelope`` is answered by the geometry GiST index with plain
+    box comparisons, so most rows are rejected before the (much more
+    expensive) geography ST_DWithin runs on the survivors. The envelope is
+    widened in longitude by 1/cos(latitude) so it always contains the circle.
+
+    Args:
+        column: Geometry column (SRID 4326)
+        latitude: Center point latitude
+        longitude: Center point longitude
+        radius_km: Search radius in kilometers
+
+    Returns:
+        SQL boolean expression to AND with the exact distance predicate
+    """
+    lat_deg = radius_km / KM_PER_DEGREE
+    lng_deg = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    envelope = ST_MakeEnvelope(
+        longitude - lng_deg, latitude - lat_deg, longitude + lng_deg, latitude + lat_deg, 4326
+    )
+    # type_coerce, not cast: the column is already geometry in the DB, and a
+    # SQL CAST around it would stop && from using the GiST index
+    return type_coerce(column, Geometry).op("&&")(envelope)
+
+
+def to_geography(expr: Any) -> ColumnElement:
+    """Convert a geometry expression to geography as ``geography(expr)``.
+
+    For ``Product.location`` this renders ``geography(products.location)``,
+    the exact expression idx_products_location_geog is built on. A SQLAlchemy
+    ``cast(..., Geography)`` renders ``CAST(... AS geography(GEOMETRY,-1))``
+    instead, a typmod coercion the planner can't match to that index.
+
+    Args:
+        expr: Geometry column or expression
+
+    Returns:
+        Geography-typed SQL expression
+    """
+    return func.geography(expr, type_=Geography)
+
+
+def validate_coordinates_np(latitudes: Any, longitudes: Any) -> np.ndarray:
+    """Vectorized validate_coordinates for bulk ingest.
+
+    Args:
+        latitudes: Array of latitude values
+        longitudes: Array of longitude values
+
+    Returns:
+        Boolean array, True where the pair is valid
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    return (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)
+
+
 async def get_products_within_radius(
     db: AsyncSession,
     latitude: float,
@@ -122,7 +248,8 @@ async def get_products_within_radius(
     filters: dict[str, Any] | None = None,
     limit: int = 20,
     offset: int = 0,
-) -> list[tuple[Product, float]]:
+    need_distance: bool = True,
+) -> list[tuple[Product, float]] | list[Product]:
     """Query products within radius using PostGIS ST_DWithin.
 
     Args:
@@ -133,29 +260,38 @@ async def get_products_within_radius(
         filters: Optional filters (category, feed_type, etc.)
         limit: Maximum results to return
         offset: Pagination offset
+        need_distance: Compute ST_Distance and order by it. When False, the
+            per-row distance is skipped and products come newest first.
+
+    Coordinates are expected to be validated at the API boundary
+    (app.schemas.geo); they are not re-checked here.
 
     Returns:
-        List of (Product, distance_km) tuples ordered by distance
+        List of (Product, distance_km) tuples ordered by distance, or a list
+        of Products ordered by created_at when need_distance is False
     """
-    if not validate_coordinates(latitude, longitude):
-        raise ValueError("Invalid coordinates")
-
     # Convert km to meters for PostGIS
     radius_m = radius_km * 1000
 
-    # Create point using ST_MakePoint (longitude, latitude)
-    user_point = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
-
-    # Build query with distance calculation
-    query = select(
-        Product,
-        # ST_Distance returns meters, divide by 1000 for km
-        (ST_Distance(cast(Product.location, "geography"), cast(user_point, "geography")) / 1000).label(
-            "distance_km"
-        ),
-    ).where(
-        # ST_DWithin for efficient spatial filtering
-        ST_DWithin(cast(Product.location, "geography"), cast(user_point, "geography"), radius_m),
+    # Create point using ST_MakePoint (longitude, latitude); both geography
+    # conversions are built once and shared by the WHERE and SELECT clauses
+    user_geog = to_geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))
+    location_geog = to_geography(Product.location)
+
+    # Build query, with the distance calculation only if it's needed
+    if need_distance:
+        query = select(
+            Product,
+            # ST_Distance returns meters, divide by 1000 for km
+            (ST_Distance(location_geog, user_geog) / 1000).label("distance_km"),
+        )
+    else:
+        query = select(Product)
+
+    query = query.where(
+        # Index-backed bbox prefilter first, exact ST_DWithin on the survivors
+        bbox_filter(Product.location, latitude, longitude, radius_km),
+        ST_DWithin(location_geog, user_geog, radius_m),
         Product.is_available == True,  # noqa: E712
     )
 
@@ -172,8 +308,14 @@ async def get_products_within_radius(
         if "condition" in filters:
             query = query.where(Product.condition == filters["condition"])
 
-    # Order by distance and apply pagination
-    query = query.order_by(literal_column("distance_km")).limit(limit).offset(offset)
+    # Order by distance (or recency) and apply pagination
+    if need_distance:
+        query = query.order_by(literal_column("distance_km"))
+    else:
+        query = query.order_by(Product.created_at.desc())
+    query = query.limit(limit).offset(offset)
 
     result = await db.execute(query)
-    return result.all()
+    if need_distance:
+        return result.all()
+    return result.scalars().all()
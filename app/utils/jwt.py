@@ -1,20 +1,73 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 from jwt import InvalidTokenError
 from passlib.context import CryptContext
 
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+# OWASP argon2id baseline (19 MiB, 2 passes, 1 lane). passlib's defaults
+# (64 MiB) cost hundreds of ms per login. bcrypt stays verify-only so legacy
+# hashes keep working and get upgraded on the next successful login.
+ARGON2_MEMORY_COST_KIB = 19456
+ARGON2_TIME_COST = 2
+ARGON2_PARALLELISM = 1
+
+# argon2-cffi directly; passlib is only kept for legacy bcrypt hashes
+_password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST_KIB,
+    parallelism=ARGON2_PARALLELISM,
+)
+_legacy_context = CryptContext(schemes=["bcrypt"])
+
+# Decoded tokens, keyed by blake2b(token) -> (valid_until, payload). Entries
+# live at most _TOKEN_CACHE_TTL seconds and never past the token's exp.
+_TOKEN_CACHE_SIZE = 50_000
+_TOKEN_CACHE_TTL = 60
+_token_cache: "OrderedDict[bytes, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Bounds concurrent argon2 work (and its memory) to one job per core
+_HASH_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 2)
+
+
+@lru_cache(maxsize=1)
+def get_signing_keys() -> tuple[Any, Any]:
+    """Return the (signing, verification) keys for settings.JWT_ALGORITHM.
+
+    HS* algorithms use SECRET_KEY for both. Asymmetric algorithms use the PEM
+    keys from settings, parsed once here so PyJWT doesn't reload them on
+    every encode/decode.
+    """
+    if settings.JWT_ALGORITHM.startswith("HS"):
+        return settings.SECRET_KEY, settings.SECRET_KEY
+
+    if not settings.JWT_PRIVATE_KEY:
+        raise ValueError(f"JWT_PRIVATE_KEY must be set for {settings.JWT_ALGORITHM}")
+
+    private_key = load_pem_private_key(settings.JWT_PRIVATE_KEY.encode(), password=None)
+    if settings.JWT_PUBLIC_KEY:
+        public_key = load_pem_public_key(settings.JWT_PUBLIC_KEY.encode())
+    else:
+        public_key = private_key.public_key()
+    return private_key, public_key
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire, "type": "access"})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt.encode(to_encode, get_signing_keys()[0], algorithm=settings.JWT_ALGORITHM)
 
 
 def create_refresh_token(user_id: str, role: str | None = None, expires_delta: timedelta | None = None) -> str:
@@ -22,12 +75,34 @@ def create_refresh_token(user_id: str, role: str | None = None, expires_delta: t
     payload = {"sub": user_id, "exp": expire, "type": "refresh"}
     if role:
         payload["role"] = role
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt.encode(payload, get_signing_keys()[0], algorithm=settings.JWT_ALGORITHM)
 
 
 def verify_token(token: str) -> Dict[str, Any]:
+    if settings.DEBUG:
+        return _decode_token(token)
+
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        valid_until, payload = cached
+        if now < valid_until:
+            _token_cache.move_to_end(cache_key)
+            return dict(payload)
+        _token_cache.pop(cache_key, None)
+
+    payload = _decode_token(token)
+    valid_until = min(now + _TOKEN_CACHE_TTL, payload.get("exp", now + _TOKEN_CACHE_TTL))
+    _token_cache[cache_key] = (valid_until, payload)
+    while len(_token_cache) > _TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return dict(payload)
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        return jwt.decode(token, get_signing_keys()[1], algorithms=[settings.JWT_ALGORITHM])
     except InvalidTokenError as exc:  # pragma: no cover - quick failure path
         raise ValueError("Invalid token") from exc
 
@@ -40,8 +115,44 @@ def decode_access_token(token: str) -> Dict[str, Any]:
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password and return a replacement hash if the stored one is outdated.
+
+    The replacement is set for bcrypt hashes and for argon2 hashes made with
+    other parameters; it is None when the stored hash is current.
+    """
+    if hashed_password.startswith("$argon2"):
+        try:
+            _password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False, None
+        if _password_hasher.check_needs_rehash(hashed_password):
+            return True, hash_password(plain_password)
+        return True, None
+
+    try:
+        verified = _legacy_context.verify(plain_password, hashed_password)
+    except ValueError:
+        return False, None
+    return verified, hash_password(plain_password) if verified else None
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password off the event loop, bounded by _HASH_SEMAPHORE."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """verify_and_update_password off the event loop, bounded by _HASH_SEMAPHORE."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(verify_and_update_password, plain_password, hashed_password)
@@ -3,6 +3,7 @@ import secrets
 from datetime import timedelta
 
 from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 from redis.exceptions import RedisError
 
 from app.services.email_service import email_service
@@ -13,9 +14,46 @@ OTP_RATE_LIMIT_WINDOW = timedelta(hours=1)
 
 logger = logging.getLogger(__name__)
 
+# Atomically counts the request against the rate limit and stores the OTP.
+# KEYS: rate key, OTP key. ARGV: window seconds, limit, otp, OTP TTL.
+_STORE_OTP_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+if count > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[4])
+return 1
+"""
+
+# Deletes the OTP only if it matches, so a code can't be used twice.
+# KEYS: OTP key. ARGV: submitted otp.
+_CONSUME_OTP_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+return 0
+"""
+
+
+# Script objects by source, registered on first use. Each call passes the
+# caller's client, so one registration (and its precomputed SHA) serves all
+_scripts: dict[str, AsyncScript] = {}
+
+
+def _script(redis_client: Redis, source: str) -> AsyncScript:
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = redis_client.register_script(source)
+    return script
+
 
 def generate_otp(length: int = 6) -> str:
-    return "".join(str(secrets.randbelow(10)) for _ in range(length))
+    # One CSPRNG draw, uniform over [0, 10**length), zero-padded
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
 
 
 def _normalize_identifier(identifier: str) -> str:
@@ -68,15 +106,14 @@ async def store_otp(identifier: str, otp: str, redis_client: Redis | None) -> No
     rate_key = _rate_limit_key(identifier)
 
     try:
-        current_count = await redis_client.get(rate_key)
-        if current_count is None:
-            await redis_client.set(rate_key, 1, ex=int(OTP_RATE_LIMIT_WINDOW.total_seconds()))
-        else:
-            if int(current_count) >= OTP_RATE_LIMIT:
-                raise ValueError("OTP request limit reached. Please try again later.")
-            await redis_client.incr(rate_key)
-
-        await redis_client.set(otp_key, otp, ex=OTP_TTL_SECONDS)
+        store = _script(redis_client, _STORE_OTP_SCRIPT)
+        stored = await store(
+            keys=[rate_key, otp_key],
+            args=[int(OTP_RATE_LIMIT_WINDOW.total_seconds()), OTP_RATE_LIMIT, otp, OTP_TTL_SECONDS],
+            client=redis_client,
+        )
+        if not stored:
+            raise ValueError("OTP request limit reached. Please try again later.")
     except RedisError as exc:
         logger.error(
             "Failed to store OTP in Redis",
@@ -90,9 +127,8 @@ async def verify_otp(identifier: str, otp: str, redis_client: Redis | None) -> b
         return False
     otp_key = _otp_key(identifier)
     try:
-        stored_otp = await redis_client.get(otp_key)
-        if stored_otp and secrets.compare_digest(stored_otp, otp):
-            await redis_client.delete(otp_key)
+        consume = _script(redis_client, _CONSUME_OTP_SCRIPT)
+        if await consume(keys=[otp_key], args=[otp], client=redis_client):
             return True
     except RedisError as exc:
         logger.error(
@@ -0,0 +1,172 @@
+"""Retry and circuit-breaker helpers for calls to external services.
+
+Used around third-party APIs (ZeptoMail, FCM, ...) so that:
+- Transient network errors are retried with exponential backoff + jitter
+- A service that keeps failing is short-circuited for a cool-down period
+  instead of tying up requests until their timeouts expire
+"""
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    States:
+        - closed: calls go through; failures are counted
+        - open: after ``failure_threshold`` consecutive failures, calls are
+          rejected for ``reset_timeout`` seconds
+        - half-open: after the timeout one trial call is let through; success
+          closes the circuit, failure re-opens it
+
+    Usage:
+        breaker = CircuitBreaker("zeptomail")
+        if not breaker.allow():
+            return False
+        ...
+        breaker.record_success()  # or breaker.record_failure()
+
+    A caller that gets past ``allow()`` must end with exactly one of
+    ``record_success()``, ``record_failure()`` or ``release()`` (the last for
+    cancellation), or a half-open circuit never lets another trial through.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 10, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected."""
+        return self._opened_at is not None and not self._cooled_down()
+
+    def _cooled_down(self) -> bool:
+        return self._opened_at is not None and time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial call is allowed (0 if closed)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed right now."""
+        if self._opened_at is None:
+            return True
+        if self._cooled_down() and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        if self._opened_at is not None:
+            logger.info(f"Circuit '{self.name}' closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a call that finished without an outcome (e.g. it was cancelled).
+
+        Frees the half-open trial slot without counting a success or failure.
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit once the threshold is hit."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    f"Circuit '{self.name}' opened after {self._failures} consecutive failures"
+                )
+            self._opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Await ``func`` through the breaker; any exception counts as a failure.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancelled mid-call: no verdict on the service, but the trial
+            # slot must be freed or the circuit stays half-open forever
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for a 0-based retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    attempts: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 5.0,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    **kwargs: Any,
+) -> T:
+    """Await ``func(*args, **kwargs)``, retrying on the given exceptions.
+
+    Args:
+        func: Async callable to invoke
+        attempts: Total attempts including the first
+        base_delay: Initial backoff in seconds (doubled per attempt)
+        max_delay: Backoff ceiling in seconds
+        retry_on: Exception types that trigger a retry; others propagate
+
+    Returns:
+        The first successful result
+
+    Raises:
+        The last exception once attempts are exhausted
+    """
+    for attempt in range(attempts):
+        try:
+            return await func(*args, **kwargs)
+        except retry_on as exc:
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning(
+                f"Retrying {getattr(func, '__name__', func)} in {delay:.2f}s "
+                f"(attempt {attempt + 1}/{attempts}): {exc}"
+            )
+            await asyncio.sleep(delay)
+
+    raise RuntimeError("retry_async called with attempts < 1")
@@ -0,0 +1,75 @@
+"""httpx-backed HTTP client for the Stripe SDK.
+
+stripe-python's default RequestsClient keeps one HTTP/1.1 session per worker
+thread, so every thread that runs a Stripe call pays its own TLS handshake.
+This client shares a single HTTP/2 ``httpx.Client`` (thread-safe) across all
+threads, multiplexing concurrent Stripe requests over one kept-alive
+connection.
+
+The SDK's retry loop (``stripe.max_network_retries``) still applies: transport
+errors are raised as ``APIConnectionError`` with ``should_retry`` set the same
+way RequestsClient does.
+"""
+import ssl
+import textwrap
+from collections.abc import Mapping
+from typing import Any
+
+import httpx
+import stripe
+
+
+class HTTPXClient(stripe.HTTPClient):
+    """Stripe HTTPClient implementation on top of a shared httpx.Client."""
+
+    name = "httpx"
+
+    def __init__(
+        self,
+        timeout: float | httpx.Timeout = 80,
+        http2: bool = True,
+        limits: httpx.Limits | None = None,
+        verify_ssl_certs: bool = True,
+    ):
+        super().__init__(verify_ssl_certs=verify_ssl_certs)
+        self._client = httpx.Client(
+            http2=http2,
+            timeout=timeout,
+            limits=limits or httpx.Limits(),
+            verify=stripe.ca_bundle_path if verify_ssl_certs else False,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str] | None,
+        post_data: Any = None,
+        **kwargs: Any,
+    ) -> tuple[bytes, int, Mapping[str, str]]:
+        try:
+            response = self._client.request(method, url, headers=headers, content=post_data)
+        except Exception as e:
+            self._handle_request_error(e)
+        return response.content, response.status_code, response.headers
+
+    def _handle_request_error(self, e: Exception):
+        """Raise APIConnectionError, retryable only for timeouts and connect errors."""
+        if isinstance(e, httpx.ConnectError) and isinstance(e.__cause__, ssl.SSLError):
+            msg = "Could not verify Stripe's SSL certificate."
+            should_retry = False
+        elif isinstance(e, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+            msg = "Unexpected error communicating with Stripe."
+            should_retry = True
+        else:
+            msg = "Unexpected error communicating with Stripe."
+            should_retry = False
+
+        err = f"{type(e).__name__}: {e}"
+        raise stripe.error.APIConnectionError(
+            textwrap.fill(msg) + f"\n\n(Network error: {err})",
+            should_retry=should_retry,
+        ) from e
+
+    def close(self) -> None:
+        self._client.close()
@@ -10,11 +10,12 @@ These events trigger cache invalidation across the application
 to ensure real-time consistency between cached and fresh data.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
-from app.core.cache.redis_manager import RedisManager
-from app.core.redis import get_redis
+from app.core.cache.cache_keys import CacheKeys
+from app.core.cache.redis_manager import get_redis_manager
 from app.services.cache.feed_cache_service import FeedCacheService
 from app.services.cache.realtime_cache_service import RealTimeCacheService
 from app.websocket.manager import ConnectionManager
@@ -24,6 +25,16 @@ logger = logging.getLogger(__name__)
 
 manager: Optional[ConnectionManager] = None
 
+# Built on first use and shared by all events (one Redis pool)
+_feed_cache_service: Optional[FeedCacheService] = None
+_realtime_cache_service: Optional[RealTimeCacheService] = None
+
+# Rooms joined by discover/community feed listeners
+FEED_ROOMS = ["discover_feed", "community_feed"]
+
+# Window in which repeat reports of the same change are not re-invalidated
+INVALIDATION_DEBOUNCE_SECONDS = 2
+
 
 def set_manager(conn_manager: ConnectionManager):
     """Set the WebSocket connection manager.
@@ -36,25 +47,27 @@ def set_manager(conn_manager: ConnectionManager):
 
 
 async def _get_feed_cache_service() -> FeedCacheService:
-    """Get FeedCacheService instance.
+    """Get the shared FeedCacheService instance.
 
     Returns:
         FeedCacheService instance
     """
-    redis = await get_redis()
-    redis_manager = RedisManager(redis)
-    return FeedCacheService(redis_manager)
+    global _feed_cache_service
+    if _feed_cache_service is None:
+        _feed_cache_service = FeedCacheService(get_redis_manager())
+    return _feed_cache_service
 
 
 async def _get_realtime_cache_service() -> RealTimeCacheService:
-    """Get RealTimeCacheService instance.
+    """Get the shared RealTimeCacheService instance.
 
     Returns:
         RealTimeCacheService instance
     """
-    redis = await get_redis()
-    redis_manager = RedisManager(redis)
-    return RealTimeCacheService(redis_manager)
+    global _realtime_cache_service
+    if _realtime_cache_service is None:
+        _realtime_cache_service = RealTimeCacheService(get_redis_manager())
+    return _realtime_cache_service
 
 
 # ============================================================================
@@ -91,48 +104,45 @@ async def stream_status_changed(sid, data: dict):
         f"Stream {stream_id} status changed: {old_status} → {new_status}"
     )
 
+    confirmation = {
+        "type": "stream_status",
+        "stream_id": stream_id,
+        "cache_keys_cleared": 0,
+        "timestamp": data.get("timestamp"),
+    }
+
     try:
         # Get feed cache service
         feed_cache = await _get_feed_cache_service()
 
+        # Many clients report the same change at once; only the first one
+        # in the debounce window invalidates and broadcasts
+        lock_key = CacheKeys.invalidation_lock("stream", f"{stream_id}:{new_status}")
+        if not await feed_cache.redis.set_if_absent(lock_key, "1", ttl=INVALIDATION_DEBOUNCE_SECONDS):
+            await sio.emit("cache_invalidated", confirmation, room=sid)
+            return
+
         # Invalidate all feed caches
         deleted_count = await feed_cache.invalidate_all_feeds()
+        confirmation["cache_keys_cleared"] = deleted_count
 
         logger.info(
             f"Invalidated {deleted_count} feed cache keys for stream {stream_id}"
         )
 
-        # Emit confirmation to sender
-        await sio.emit(
-            "cache_invalidated",
-            {
-                "type": "stream_status",
-                "stream_id": stream_id,
-                "cache_keys_cleared": deleted_count,
-                "timestamp": data.get("timestamp"),
-            },
-            room=sid,
-        )
-
-        # Broadcast to all clients that feeds need refresh
-        await sio.emit(
-            "feed_refresh_required",
-            {
-                "reason": "stream_status_changed",
-                "stream_id": stream_id,
-                "new_status": new_status,
-            },
-            room="discover_feed",  # Room for discover feed listeners
-        )
-
-        await sio.emit(
-            "feed_refresh_required",
-            {
-                "reason": "stream_status_changed",
-                "stream_id": stream_id,
-                "new_status": new_status,
-            },
-            room="community_feed",  # Room for community feed listeners
+        # Confirm to sender and tell all feed listeners to refresh; a list
+        # of rooms is a single emit (one publish, clients deduplicated)
+        await asyncio.gather(
+            sio.emit("cache_invalidated", confirmation, room=sid),
+            sio.emit(
+                "feed_refresh_required",
+                {
+                    "reason": "stream_status_changed",
+                    "stream_id": stream_id,
+                    "new_status": new_status,
+                },
+                room=FEED_ROOMS,
+            ),
         )
 
     except Exception as e:
@@ -171,54 +181,47 @@ async def product_updated(sid, data: dict):
 
     logger.info(f"Product {product_id} {action}")
 
+    confirmation = {
+        "type": "product",
+        "product_id": product_id,
+        "action": action,
+        "cache_keys_cleared": 0,
+    }
+
     try:
         feed_cache = await _get_feed_cache_service()
 
+        # Skip repeats of the same change within the debounce window
+        lock_key = CacheKeys.invalidation_lock("product", f"{product_id}:{action}")
+        if not await feed_cache.redis.set_if_absent(lock_key, "1", ttl=INVALIDATION_DEBOUNCE_SECONDS):
+            await sio.emit("cache_invalidated", confirmation, room=sid)
+            return
+
         # Invalidate relevant feed caches
         deleted_count = 0
         if feed_type == "discover" or feed_type == "both":
             deleted_count += await feed_cache.invalidate_discover_feed()
         if feed_type == "community" or feed_type == "both":
             deleted_count += await feed_cache.invalidate_community_feed()
+        confirmation["cache_keys_cleared"] = deleted_count
 
         logger.info(
             f"Invalidated {deleted_count} feed cache keys for product {product_id}"
         )
 
-        # Emit confirmation
-        await sio.emit(
-            "cache_invalidated",
-            {
-                "type": "product",
-                "product_id": product_id,
-                "action": action,
-                "cache_keys_cleared": deleted_count,
-            },
-            room=sid,
-        )
-
-        # Broadcast feed refresh
-        room = (
-            f"{feed_type}_feed" if feed_type != "both" else "discover_feed"
-        )
-        await sio.emit(
-            "feed_refresh_required",
-            {
-                "reason": f"product_{action}",
-                "product_id": product_id,
-            },
-            room=room,
-        )
-
-        if feed_type == "both":
-            await sio.emit(
+        # Confirm to sender and broadcast feed refresh
+        rooms = FEED_ROOMS if feed_type == "both" else f"{feed_type}_feed"
+        await asyncio.gather(
+            sio.emit("cache_invalidated", confirmation, room=sid),
+            sio.emit(
                 "feed_refresh_required",
                 {
                     "reason": f"product_{action}",
                     "product_id": product_id,
                 },
-                room="community_feed",
-            )
+                room=rooms,
+            ),
+        )
 
     except Exception as e:
         logger.error(f"Error invalidating product cache: {e}", exc_info=True)
@@ -273,26 +276,22 @@ async def clear_feed_cache(sid, data: dict):
 
         logger.info(f"Manually cleared {deleted_count} cache keys")
 
-        await sio.emit(
-            "cache_cleared",
-            {
-                "feed_type": feed_type,
-                "cache_keys_cleared": deleted_count,
-                "reason": reason,
-            },
-            room=sid,
-        )
-
-        # Broadcast to all feed listeners
-        await sio.emit(
-            "feed_refresh_required",
-            {"reason": "manual_cache_clear"},
-            room="discover_feed",
-        )
-        await sio.emit(
-            "feed_refresh_required",
-            {"reason": "manual_cache_clear"},
-            room="community_feed",
+        # Confirm to sender and broadcast to all feed listeners
+        await asyncio.gather(
+            sio.emit(
+                "cache_cleared",
+                {
+                    "feed_type": feed_type,
+                    "cache_keys_cleared": deleted_count,
+                    "reason": reason,
+                },
+                room=sid,
+            ),
+            sio.emit(
+                "feed_refresh_required",
+                {"reason": "manual_cache_clear"},
+                room=FEED_ROOMS,
+            ),
         )
 
     except Exception as e:
@@ -704,37 +703,36 @@ async def new_message(sid, data: dict):
     try:
         realtime_cache = await _get_realtime_cache_service()
 
-        # Increment unread counters
-        conversation_count = await realtime_cache.increment_unread_count(
+        # Increment unread counters (one pipelined round trip)
+        conversation_count, total_count = await realtime_cache.record_new_message(
             recipient_id, conversation_id
         )
-        total_count = await realtime_cache.increment_unread_count(recipient_id)
 
         logger.info(
             f"New message in conversation {conversation_id}. "
             f"Recipient {recipient_id} unread: {total_count}"
         )
 
-        # Send unread count update to recipient
-        await sio.emit(
-            "unread_count_updated",
-            {
-                "conversation_id": conversation_id,
-                "conversation_unread": conversation_count,
-                "total_unread": total_count,
-            },
-            room=f"user:{recipient_id}",
-        )
-
-        # Send new message notification
-        await sio.emit(
-            "new_message_notification",
-            {
-                "conversation_id": conversation_id,
-                "sender_id": sender_id,
-                "message_id": message_id,
-            },
-            room=f"user:{recipient_id}",
+        # Send unread count update and new message notification to recipient
+        await asyncio.gather(
+            sio.emit(
+                "unread_count_updated",
+                {
+                    "conversation_id": conversation_id,
+                    "conversation_unread": conversation_count,
+                    "total_unread": total_count,
+                },
+                room=f"user:{recipient_id}",
+            ),
+            sio.emit(
+                "new_message_notification",
+                {
+                    "conversation_id": conversation_id,
+                    "sender_id": sender_id,
+                    "message_id": message_id,
+                },
+                room=f"user:{recipient_id}",
+            ),
         )
 
     except Exception as e:
@@ -769,18 +767,9 @@ async def messages_read(sid, data: dict):
     try:
         realtime_cache = await _get_realtime_cache_service()
 
-        # Get current conversation unread count
-        old_count = await realtime_cache.get_unread_count(user_id, conversation_id)
-
-        # Reset conversation unread count
-        await realtime_cache.reset_unread_count(user_id, conversation_id)
-
-        # Decrement total unread count by the conversation count
-        if old_count > 0:
-            await realtime_cache.decrement_unread_count(user_id, amount=old_count)
-
-        # Get updated total
-        total_count = await realtime_cache.get_unread_count(user_id)
+        # Reset the conversation count and subtract it from the total
+        # (single atomic script)
+        total_count = await realtime_cache.mark_conversation_read(user_id, conversation_id)
 
         logger.info(f"User {user_id} read messages in conversation {conversation_id}")
 
@@ -20,12 +20,11 @@ from typing import Dict, List, Optional, Set
 from uuid import UUID
 
 import socketio
-from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
 from app.core.redis import get_redis
 from app.database import async_session_maker
+from app.utils.jwt import verify_token
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +50,7 @@ class ConnectionManager:
 
     async def _get_redis(self):
         """Get Redis client"""
-        return get_redis()
+        return await get_redis()
 
     async def _get_db(self) -> AsyncSession:
         """Get database session"""
@@ -65,12 +64,7 @@ class ConnectionManager:
             if token.startswith("Bearer "):
                 token = token[7:]
 
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM],
-            )
-            return payload
+            return verify_token(token)
         except Exception as e:
             logger.error(f"Failed to parse JWT token: {e}")
             return None
@@ -138,17 +132,21 @@ class ConnectionManager:
             self.user_connections[user_id] = set()
         self.user_connections[user_id].add(sid)
 
-        # Store in Redis
+        # Store in Redis and set the heartbeat (one round trip)
         redis = await self._get_redis()
-        await redis.sadd(self.ONLINE_USERS_KEY, user_id)
-        await redis.sadd(f"{self.USER_SIDS_KEY_PREFIX}{user_id}", sid)
-        await redis.set(f"{self.SID_USER_KEY_PREFIX}{sid}", user_id, ex=86400)  # 24h TTL
-
-        # Set heartbeat
-        await self._update_heartbeat(sid)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(self.ONLINE_USERS_KEY, user_id)
+            pipe.sadd(f"{self.USER_SIDS_KEY_PREFIX}{user_id}", sid)
+            pipe.set(f"{self.SID_USER_KEY_PREFIX}{sid}", user_id, ex=86400)  # 24h TTL
+            pipe.set(
+                f"{self.HEARTBEAT_KEY_PREFIX}{sid}",
+                datetime.utcnow().isoformat(),
+                ex=120,  # 2 minute TTL
+            )
+            await pipe.execute()
 
         # Join user's personal room
-        await self.sio.enter_room(sid, f"user:{user_id}")
+        await self.join_rooms(sid, [f"user:{user_id}"])
 
         logger.info(f"User {user_id} connected via {sid}")
 
@@ -168,16 +166,14 @@ class ConnectionManager:
         if sid in self.connections:
             del self.connections[sid]
 
+        went_offline = False
         if user_id in self.user_connections:
             self.user_connections[user_id].discard(sid)
 
             # If no more connections for this user, mark offline
             if not self.user_connections[user_id]:
                 del self.user_connections[user_id]
-
-                # Remove from Redis
-                redis = await self._get_redis()
-                await redis.srem(self.ONLINE_USERS_KEY, user_id)
+                went_offline = True
 
                 # Emit user:offline to contacts
                 await self.sio.emit(
@@ -186,25 +182,29 @@ class ConnectionManager:
                     room=f"user:{user_id}",
                 )
 
-        # Clean up Redis
+        # Clean up Redis (one round trip)
         redis = await self._get_redis()
-        await redis.srem(f"{self.USER_SIDS_KEY_PREFIX}{user_id}", sid)
-        await redis.delete(f"{self.SID_USER_KEY_PREFIX}{sid}")
-        await redis.delete(f"{self.HEARTBEAT_KEY_PREFIX}{sid}")
+        async with redis.pipeline(transaction=False) as pipe:
+            if went_offline:
+                pipe.srem(self.ONLINE_USERS_KEY, user_id)
+            pipe.srem(f"{self.USER_SIDS_KEY_PREFIX}{user_id}", sid)
+            pipe.delete(f"{self.SID_USER_KEY_PREFIX}{sid}", f"{self.HEARTBEAT_KEY_PREFIX}{sid}")
+            await pipe.execute()
 
         # Leave user's personal room
         await self.sio.leave_room(sid, f"user:{user_id}")
 
         logger.info(f"User {user_id} disconnected via {sid}")
 
-    async def _update_heartbeat(self, sid: str):
-        """Update connection heartbeat timestamp"""
-        redis = await self._get_redis()
-        await redis.set(
-            f"{self.HEARTBEAT_KEY_PREFIX}{sid}",
-            datetime.utcnow().isoformat(),
-            ex=120,  # 2 minute TTL
-        )
+    async def join_rooms(self, sid: str, rooms: List[str]):
+        """Add a connection to several rooms at once.
+
+        Room membership is tracked in this process's memory (the Redis
+        message queue only carries emits), so entering a room does no I/O
+        and the rooms are simply entered in turn.
+        """
+        for room in rooms:
+            await self.sio.enter_room(sid, room)
 
     async def join_conversation(self, sid: str, conversation_id: str):
         """Join a conversation room"""
@@ -216,8 +216,7 @@ class ConnectionManager:
 
         # TODO: Validate user has access to this conversation
 
-        room_name = f"conversation:{conversation_id}"
-        await self.sio.enter_room(sid, room_name)
+        await self.join_rooms(sid, [f"conversation:{conversation_id}"])
 
         logger.info(f"User {user_id} joined conversation {conversation_id}")
         return True
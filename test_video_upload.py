@@ -32,7 +32,7 @@ from app.database import async_session_maker
 from app.models.product import Product, ProductCategory, FeedType
 from app.models.user import User
 from app.storage.b2_config import B2Config
-from app.services.thumbnail_service import thumbnail_service
+from app.services.thumbnail_service import get_thumbnail_service
 
 
 async def download_sample_video(url: str, output_path: str) -> bool:
@@ -243,7 +243,7 @@ async def main():
     print("Step 4: Generate and Upload Thumbnail")
     print("-" * 70)
     try:
-        thumbnail_url, thumbnail_key = thumbnail_service.generate_and_upload_thumbnail(
+        thumbnail_url, thumbnail_key = await get_thumbnail_service().generate_and_upload_thumbnail(
             video_path=temp_video_path,
             user_id=user_id,
             video_filename='test_video.mp4'
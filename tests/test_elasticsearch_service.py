@@ -0,0 +1,111 @@
+"""
+Tests for Elasticsearch request body construction.
+
+Tests:
+- Query shape for browse (no text, no filters) vs filtered searches
+- Sort and facet table lookups
+- Capped hit totals are flagged as lower bounds
+"""
+
+import pytest
+
+from app.services.elasticsearch_service import (
+    ElasticsearchService,
+    _FACET_AGGS,
+)
+
+
+class TestBuildSearchBody:
+    """Test search body construction without an Elasticsearch cluster"""
+
+    def test_browse_query_skips_bool_wrapper(self):
+        """Only the is_available filter applies: use constant_score directly"""
+        body = ElasticsearchService.build_search_body("")
+
+        assert body["query"] == {
+            "constant_score": {"filter": {"term": {"is_available": True}}}
+        }
+
+    def test_browse_query_matches_bool_form_semantics(self):
+        """The elided form filters the same clause the bool form would"""
+        body = ElasticsearchService.build_search_body("   ")
+        bool_filter = [{"term": {"is_available": True}}]
+
+        assert "bool" not in body["query"]
+        assert [body["query"]["constant_score"]["filter"]] == bool_filter
+
+    def test_text_query_uses_bool(self):
+        """Full-text searches keep must + filter"""
+        body = ElasticsearchService.build_search_body("iphone")
+
+        bool_query = body["query"]["bool"]
+        assert bool_query["must"][0]["multi_match"]["query"] == "iphone"
+        assert bool_query["filter"] == [{"term": {"is_available": True}}]
+
+    def test_extra_filters_use_bool(self):
+        """Additional filters keep the bool wrapper with match_all"""
+        body = ElasticsearchService.build_search_body(
+            "", filters={"category": "electronics"}
+        )
+
+        bool_query = body["query"]["bool"]
+        assert bool_query["must"] == [{"match_all": {}}]
+        assert {"term": {"category": "electronics"}} in bool_query["filter"]
+
+    @pytest.mark.parametrize(
+        "sort_by,expected",
+        [
+            ("recent", [{"created_at": "desc"}]),
+            ("price_low", [{"price": "asc"}]),
+            ("price_high", [{"price": "desc"}]),
+            ("relevance", ["_score"]),
+            ("unknown", ["_score"]),
+            ("nearest", ["_score"]),  # no location given
+        ],
+    )
+    def test_sort_lookup(self, sort_by, expected):
+        """Static sorts come from the module-level table"""
+        body = ElasticsearchService.build_search_body("", sort_by=sort_by)
+        assert body["sort"] == expected
+
+    def test_nearest_sort_uses_location(self):
+        """Geo sort is built from the caller's location"""
+        body = ElasticsearchService.build_search_body(
+            "", location=(25.2, 55.3), sort_by="nearest"
+        )
+        geo = body["sort"][0]["_geo_distance"]
+        assert geo["location"] == {"lat": 25.2, "lon": 55.3}
+
+    def test_facets_are_shared(self):
+        """Every body reuses the same facet aggregation dict"""
+        body = ElasticsearchService.build_search_body("")
+        assert body["aggs"] is _FACET_AGGS
+
+
+class TestFormatSearchResponse:
+    """Test search response formatting"""
+
+    @staticmethod
+    def _response(total):
+        buckets = {"buckets": []}
+        return {
+            "took": 3,
+            "hits": {"total": total, "hits": []},
+            "aggregations": {"categories": buckets, "conditions": buckets, "price_ranges": buckets},
+        }
+
+    def test_exact_total(self):
+        """An exact count is reported as such"""
+        result = ElasticsearchService._format_search_response(
+            self._response({"value": 42, "relation": "eq"}), 1, 20, "relevance"
+        )
+        assert result["total"] == 42
+        assert result["total_is_lower_bound"] is False
+
+    def test_capped_total_is_lower_bound(self):
+        """A total cut off at track_total_hits is flagged"""
+        result = ElasticsearchService._format_search_response(
+            self._response({"value": 1000, "relation": "gte"}), 1, 20, "relevance"
+        )
+        assert result["total"] == 1000
+        assert result["total_is_lower_bound"] is True
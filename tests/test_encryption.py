@@ -0,0 +1,61 @@
+"""
+Tests for sensitive-data encryption helpers.
+
+Tests:
+- Emirates ID encrypt/decrypt round trip
+- Legacy Fernet values still decrypt
+- Cipher is reused across calls
+- Masking single values and batches
+"""
+
+from app.utils.encryption import (
+    decrypt_emirates_id,
+    encrypt_emirates_id,
+    get_aead,
+    get_cipher,
+    mask_emirates_id,
+    mask_emirates_ids,
+    mask_trade_license,
+    mask_trade_licenses,
+)
+
+
+class TestEmiratesIdEncryption:
+    """Test Emirates ID encryption"""
+
+    def test_round_trip(self):
+        """An encrypted ID decrypts back to the original"""
+        id_number = "784-1990-1234567-1"
+
+        encrypted = encrypt_emirates_id(id_number)
+
+        assert encrypted != id_number
+        assert decrypt_emirates_id(encrypted) == id_number
+
+    def test_decrypts_legacy_fernet(self):
+        """Values stored with Fernet are still readable"""
+        legacy = get_cipher().encrypt(b"784-1990-1234567-1").decode()
+
+        assert decrypt_emirates_id(legacy) == "784-1990-1234567-1"
+
+    def test_cipher_cached(self):
+        """The cipher is built once"""
+        assert get_aead() is get_aead()
+        assert get_cipher() is get_cipher()
+
+
+class TestMasking:
+    """Test display masking"""
+
+    def test_mask_single(self):
+        """Only the last 4 characters are kept"""
+        assert mask_emirates_id("784-1990-1234567-1") == "***-****-*****-67-1"
+        assert mask_trade_license("CN-1234567") == "***-****-4567"
+        assert mask_emirates_id("") == "****"
+
+    def test_mask_batch_matches_single(self):
+        """Batch masking gives the same result as masking one at a time"""
+        ids = ["784-1990-1234567-1", "12", "", "CN-1234567"]
+
+        assert mask_emirates_ids(ids) == [mask_emirates_id(n) for n in ids]
+        assert mask_trade_licenses(ids) == [mask_trade_license(n) for n in ids]
@@ -0,0 +1,41 @@
+"""
+Tests for PaymentService fee calculation.
+
+Tests:
+- Percentage fee per feed type
+- Minimum fee applied to small amounts
+- Integer-cent fees round half up
+"""
+
+from decimal import Decimal
+
+from app.models.product import FeedType
+from app.services.payment_service import PaymentService
+
+
+class TestCalculatePlatformFee:
+    """Test platform fee table lookups"""
+
+    def test_discover_percentage(self):
+        """Discover feed charges 15%"""
+        fee = PaymentService.calculate_platform_fee(Decimal("200.00"), FeedType.DISCOVER)
+
+        assert fee == Decimal("30.00")
+
+    def test_community_percentage(self):
+        """Community feed charges 5%"""
+        fee = PaymentService.calculate_platform_fee(Decimal("200.00"), FeedType.COMMUNITY)
+
+        assert fee == Decimal("10.00")
+
+    def test_minimum_fee(self):
+        """Small amounts are charged the feed's minimum fee"""
+        assert PaymentService.calculate_platform_fee(Decimal("10.00"), FeedType.DISCOVER) == Decimal("5.0")
+        assert PaymentService.calculate_platform_fee(Decimal("10.00"), FeedType.COMMUNITY) == Decimal("2.0")
+
+    def test_fee_in_cents(self):
+        """Cent-based fees round half up to the nearest cent"""
+        # 15% of AED 100.03 = 15.0045 -> 15.00; 5% of AED 100.10 = 5.005 -> 5.01
+        assert PaymentService.calculate_platform_fee_cents(10003, FeedType.DISCOVER) == 1500
+        assert PaymentService.calculate_platform_fee_cents(10010, FeedType.COMMUNITY) == 501
+        assert PaymentService.calculate_platform_fee(Decimal("100.10"), FeedType.COMMUNITY) == Decimal("5.01")
@@ -0,0 +1,133 @@
+"""
+Tests for retry and circuit-breaker helpers.
+
+Tests:
+- Retries on listed exceptions, gives up after the attempt limit
+- Non-retryable exceptions propagate immediately
+- Circuit opens after consecutive failures and half-opens after the timeout
+- A cancelled trial call frees the half-open slot
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, retry_async
+
+
+class TestRetryAsync:
+    """Test retry_async backoff behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Transient failures are retried"""
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        result = await retry_async(flaky, attempts=3, base_delay=0, retry_on=(ConnectionError,))
+
+        assert result == "ok"
+        assert calls == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self):
+        """The last exception is raised once attempts run out"""
+        calls = 0
+
+        async def always_fails():
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            await retry_async(always_fails, attempts=2, base_delay=0, retry_on=(ConnectionError,))
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_propagates(self):
+        """Exceptions outside retry_on are not retried"""
+        calls = 0
+
+        async def bad_request():
+            nonlocal calls
+            calls += 1
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            await retry_async(bad_request, attempts=3, base_delay=0, retry_on=(ConnectionError,))
+
+        assert calls == 1
+
+
+class TestCircuitBreaker:
+    """Test circuit state transitions"""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+
+    def test_success_resets_count(self):
+        """A success between failures keeps the circuit closed"""
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.allow()
+
+    def test_half_open_allows_single_trial(self):
+        """After the timeout exactly one trial call is let through"""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+
+        breaker.record_failure()
+
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_call_rejects_when_open(self):
+        """call() raises CircuitOpenError without invoking the function"""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        called = False
+
+        async def func():
+            nonlocal called
+            called = True
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(func)
+
+        assert not called
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_releases_slot(self):
+        """Cancelling the half-open trial lets the next call through"""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        async def func():
+            raise asyncio.CancelledError
+
+        with pytest.raises(asyncio.CancelledError):
+            await breaker.call(func)
+
+        assert breaker.allow()